@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the text-processing scripts.
+Generates synthetic Markdown/Quarto/HTML/CSS corpora and measures the
+spelling converter and list fixer on them, saving results as JSON so runs
+can be compared between commits.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from fix_markdown_lists import fix_markdown_lists
+from spelling_converter import SpellingConverter, apply_edits
+
+MODES = ['safe', 'regex', 'hybrid']
+
+FORMATS = ['.md', '.qmd', '.html', '.css']
+
+# Words the converter rewrites, plus look-alikes it must leave alone
+AMERICAN_WORDS = [
+    'color', 'colors', 'colored', 'behavior', 'behaviors', 'favor', 'favored', 'honor',
+    'humor', 'labor', 'harbor', 'neighbors', 'center', 'centers', 'centered', 'organize',
+    'organized', 'organization', 'organizational', 'analyze', 'analyzed', 'realize',
+    'realization', 'utilize', 'utilization', 'categorize', 'minimize', 'finalized',
+    'Color', 'Center', 'Organization', 'Realize', 'Analyzing',
+]
+
+PLAIN_WORDS = [
+    'the', 'and', 'of', 'to', 'a', 'in', 'is', 'that', 'for', 'it', 'with', 'as', 'on',
+    'human', 'loop', 'model', 'operator', 'mine', 'truck', 'review', 'decision', 'system',
+    'data', 'safety', 'process', 'team', 'risk', 'signal', 'control', 'pipeline', 'error',
+    'actor', 'doctor', 'factor', 'size', 'seize', 'prize', 'water', 'paper', 'number',
+    'computer', 'member', 'analysis', 'after', 'major', 'visitor',
+]
+
+
+class CorpusGenerator:
+    """Builds synthetic documents with tunable spelling and markup density."""
+
+    def __init__(self, seed: int = 0, spelling_density: float = 0.05,
+                 code_density: float = 0.2, custom_words: Optional[List[str]] = None):
+        self.random = random.Random(seed)
+        self.spelling_density = spelling_density
+        self.code_density = code_density
+        self.custom_words = custom_words or []
+
+    def word(self) -> str:
+        if self.random.random() < self.spelling_density:
+            if self.custom_words and self.random.random() < 0.5:
+                return self.random.choice(self.custom_words)
+            return self.random.choice(AMERICAN_WORDS)
+        return self.random.choice(PLAIN_WORDS)
+
+    def sentence(self) -> str:
+        words = [self.word() for _ in range(self.random.randint(6, 18))]
+        return ' '.join(words).capitalize() + '.'
+
+    def paragraph(self) -> str:
+        return ' '.join(self.sentence() for _ in range(self.random.randint(2, 5)))
+
+    def markdown_block(self) -> str:
+        if self.random.random() >= self.code_density:
+            choice = self.random.random()
+            if choice < 0.2:
+                return '\n'.join(f'- {self.sentence()}' for _ in range(self.random.randint(2, 5)))
+            if choice < 0.3:
+                return f'## {self.sentence()}'
+            # Lists glued to the preceding paragraph give the list fixer work to do
+            if choice < 0.4:
+                return self.paragraph() + '\n- ' + self.sentence()
+            return self.paragraph()
+
+        choice = self.random.random()
+        if choice < 0.4:
+            body = '\n'.join(f'    color = "{self.word()}"  # {self.word()}' for _ in range(4))
+            return f'```python\n{body}\n```'
+        if choice < 0.7:
+            return f'Use `set_color({self.word()})` or see https://example.org/{self.word()}/center.'
+        if choice < 0.9:
+            return f'<div class="text-center {self.word()}" id="color-{self.word()}">{self.sentence()}</div>'
+        return f'{{{{< include _{self.word()}.qmd >}}}} [{self.sentence()}]({self.word()}.html)'
+
+    def html_block(self) -> str:
+        if self.random.random() < self.code_density:
+            return (f'<script>const colorMap = {{primary: "{self.word()}", center: true}};'
+                    f' // {self.word()}</script>')
+        return (f'<p class="lead color-{self.word()}">{self.paragraph()}'
+                f' <a href="https://example.org/{self.word()}">{self.word()}</a></p>')
+
+    def css_block(self) -> str:
+        selector = f'.{self.word()}-{self.random.randint(0, 99)}'
+        if self.random.random() < self.code_density:
+            return f'{selector} {{\n  color: #333;\n  text-align: center;\n  --main-color: red;\n}}'
+        return f'/* {self.sentence()} */\n{selector} {{ margin: 0; }}'
+
+    def document(self, suffix: str, size: int) -> str:
+        """Generate a document of roughly ``size`` characters."""
+        if suffix == '.html':
+            parts = ['<!DOCTYPE html>\n<html>\n<head><style>body { color: black; }</style></head>\n<body>']
+            block = self.html_block
+            tail = '</body>\n</html>\n'
+        elif suffix == '.css':
+            parts = []
+            block = self.css_block
+            tail = ''
+        else:
+            parts = [f'---\ntitle: "{self.sentence()}"\nformat: html\n---']
+            block = self.markdown_block
+            tail = ''
+
+        length = sum(len(part) for part in parts)
+        while length < size:
+            part = block()
+            parts.append(part)
+            length += len(part) + 2
+        parts.append(tail)
+        return '\n\n'.join(parts)
+
+    def corpus(self, files: int, file_size: int) -> List[Tuple[str, str]]:
+        """Generate (name, text) pairs cycling through the supported formats."""
+        return [(f'doc{index:05d}{FORMATS[index % len(FORMATS)]}',
+                 self.document(FORMATS[index % len(FORMATS)], file_size))
+                for index in range(files)]
+
+
+def make_wordlist(size: int, seed: int = 0) -> Dict[str, str]:
+    """Generate a synthetic American-to-British word list of the given size."""
+    rng = random.Random(seed)
+    letters = 'bcdfghklmnprstvz'
+    vowels = 'aeiou'
+    words = {}
+    while len(words) < size:
+        stem = ''.join(rng.choice(letters) + rng.choice(vowels) for _ in range(rng.randint(2, 4)))
+        suffix = rng.choice([('ize', 'ise'), ('izes', 'ises'), ('or', 'our'), ('er', 're')])
+        words[stem + suffix[0]] = stem + suffix[1]
+    return words
+
+
+def timed(function, *args):
+    """Run a function, returning (result, seconds)."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def peak_memory(function, *args) -> float:
+    """Peak traced allocation in MB while running a function."""
+    tracemalloc.start()
+    try:
+        function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def run_mode(mode: str, corpus: List[Tuple[str, str]], wordlist_path: Optional[Path],
+             repeat: int) -> Dict[str, object]:
+    """Benchmark one converter mode over the in-memory corpus."""
+    phases = {}
+    converter, phases['setup'] = timed(SpellingConverter, mode)
+    if wordlist_path:
+        _, phases['wordlist_load'] = timed(converter.load_word_list, wordlist_path)
+    _, phases['matcher_build'] = timed(converter.get_matcher)
+
+    total_bytes = sum(len(text.encode('utf-8')) for _, text in corpus)
+    best = None
+    changes = 0
+
+    for _ in range(repeat):
+        run = {'index': 0.0, 'match': 0.0, 'build': 0.0, 'fix_lists': 0.0}
+        changes = 0
+        for name, text in corpus:
+            spans, seconds = timed(converter.protected_spans, text)
+            run['index'] += seconds
+            (edits, records), seconds = timed(converter.find_edits, text, spans)
+            run['match'] += seconds
+            _, seconds = timed(apply_edits, text, edits)
+            run['build'] += seconds
+            changes += len(records)
+            if name.endswith(('.md', '.qmd')):
+                _, seconds = timed(fix_markdown_lists, text)
+                run['fix_lists'] += seconds
+        if best is None or sum(run.values()) < sum(best.values()):
+            best = run
+
+    phases.update(best)
+    convert_seconds = best['index'] + best['match'] + best['build']
+    megabytes = total_bytes / (1024 * 1024)
+
+    def convert_all():
+        for _, text in corpus:
+            converter.convert_text(text)
+
+    return {
+        'mode': mode,
+        'files': len(corpus),
+        'bytes': total_bytes,
+        'changes': changes,
+        'phases': {name: round(seconds, 6) for name, seconds in phases.items()},
+        'convert_mb_per_s': round(megabytes / convert_seconds, 3) if convert_seconds else None,
+        'convert_files_per_s': round(len(corpus) / convert_seconds, 2) if convert_seconds else None,
+        'fix_lists_mb_per_s': round(megabytes / best['fix_lists'], 3) if best['fix_lists'] else None,
+        'peak_memory_mb': round(peak_memory(convert_all), 3),
+    }
+
+
+def run_directory(mode: str, corpus: List[Tuple[str, str]], wordlist_path: Optional[Path],
+                  jobs: int) -> Dict[str, object]:
+    """Benchmark a dry-run directory pass, including file discovery and reads."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        for name, text in corpus:
+            (root / name).write_text(text, encoding='utf-8')
+
+        converter = SpellingConverter(mode)
+        if wordlist_path:
+            converter.load_word_list(wordlist_path)
+        # Per-file progress lines would swamp the benchmark output
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            converter.process_directory(root, dry_run=True, jobs=jobs)
+            seconds = time.perf_counter() - start
+
+    return {'seconds': round(seconds, 6), 'files_per_s': round(len(corpus) / seconds, 2)}
+
+
+def git_revision() -> Optional[str]:
+    """Return the current commit hash, if the scripts live in a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=Path(__file__).parent,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def format_table(results: List[Dict[str, object]], baseline: Optional[Dict[str, object]] = None) -> str:
+    """Format benchmark results, with speedups against a previous run if given."""
+    previous = {result['mode']: result for result in (baseline or {}).get('results', [])}
+    lines = [f"{'mode':<8} {'MB/s':>9} {'files/s':>9} {'lists MB/s':>11} {'peak MB':>9} "
+             f"{'index':>8} {'match':>8} {'build':>8} {'vs base':>8}"]
+    for result in results:
+        phases = result['phases']
+        speedup = ''
+        old = previous.get(result['mode'])
+        if old and old.get('convert_mb_per_s') and result['convert_mb_per_s']:
+            speedup = f"{result['convert_mb_per_s'] / old['convert_mb_per_s']:.2f}x"
+        lines.append(f"{result['mode']:<8} {result['convert_mb_per_s'] or 0:>9.2f} "
+                     f"{result['convert_files_per_s'] or 0:>9.1f} {result['fix_lists_mb_per_s'] or 0:>11.2f} "
+                     f"{result['peak_memory_mb']:>9.2f} {phases['index']:>8.3f} {phases['match']:>8.3f} "
+                     f"{phases['build']:>8.3f} {speedup:>8}")
+    return '\n'.join(lines)
+
+
+def main():
+    """Main function to run the benchmarks."""
+    parser = argparse.ArgumentParser(description='Benchmark the spelling converter and list fixer')
+    parser.add_argument('--files', type=int, default=40, help='Number of synthetic documents')
+    parser.add_argument('--file-size', type=int, default=50_000, help='Approximate characters per document')
+    parser.add_argument('--spelling-density', type=float, default=0.05,
+                       help='Fraction of words using American spelling')
+    parser.add_argument('--code-density', type=float, default=0.2,
+                       help='Fraction of blocks that are code, tags or CSS rules')
+    parser.add_argument('--wordlist-size', type=int, default=0, help='Entries in a synthetic custom word list')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES, help='Modes to benchmark')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed passes per mode; the fastest is kept')
+    parser.add_argument('--directory', action='store_true',
+                       help='Also time a dry-run directory pass over the corpus written to disk')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Workers for the directory pass')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the corpus')
+    parser.add_argument('--output', '-o', type=str, help='Save results as JSON')
+    parser.add_argument('--compare', type=str, help='Previous JSON results to compare against')
+
+    args = parser.parse_args()
+
+    wordlist = make_wordlist(args.wordlist_size, args.seed) if args.wordlist_size else {}
+    generator = CorpusGenerator(args.seed, args.spelling_density, args.code_density,
+                                list(wordlist)[:200])
+    corpus, generate_seconds = timed(generator.corpus, args.files, args.file_size)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        wordlist_path = None
+        if wordlist:
+            wordlist_path = Path(temp_dir) / 'wordlist.json'
+            wordlist_path.write_text(json.dumps(wordlist), encoding='utf-8')
+
+        results = []
+        for mode in args.modes:
+            result = run_mode(mode, corpus, wordlist_path, max(1, args.repeat))
+            if args.directory:
+                result['directory'] = run_directory(mode, corpus, wordlist_path, max(1, args.jobs))
+            results.append(result)
+
+    report = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'generate_seconds': round(generate_seconds, 6),
+        'results': results,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    total_mb = results[0]['bytes'] / (1024 * 1024) if results else 0
+    print(f"Corpus: {args.files} files, {total_mb:.2f} MB, wordlist {args.wordlist_size} entries")
+    print(format_table(results, baseline))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
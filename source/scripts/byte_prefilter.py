@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Byte-level prefilter for the spelling converter.
+Searches a memory-mapped file for the words the rules can match before
+anything is decoded, so clean files are skipped outright and only the
+regions around a hit need to be decoded and scanned.
+"""
+
+import io
+import mmap
+import os
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Bytes translated and searched at a time
+BLOCK_SIZE = 1024 * 1024
+
+# Non-ASCII characters that case-insensitive str patterns match for an ASCII letter
+FOLDED_VARIANTS = {'i': ('İ', 'ı'), 's': ('ſ',), 'k': ('K',)}
+
+_WORD_BYTES = frozenset(b'0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz')
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+@contextmanager
+def map_file(file_path: Path) -> Iterator[Buffer]:
+    """Map a file read-only; an empty file gives empty bytes, which mmap cannot map."""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
+
+
+def decode_text(data: Buffer, start: int = 0, end: Optional[int] = None) -> str:
+    """Decode UTF-8 bytes, translating newlines as ``open(file_path, 'r')`` does."""
+    return io.StringIO(data[start:end].decode('utf-8'), newline=None).read()
+
+
+def decode_regions(data: Buffer, regions: List[Tuple[int, int]]) -> Tuple[str, List[Tuple[int, int]]]:
+    """Decode the whole buffer, returning the text and the regions as text offsets.
+
+    Region boundaries always follow an ASCII separator other than a carriage
+    return, so decoding piece by piece gives the same text as decoding at once.
+    """
+    pieces = []
+    text_regions = []
+    length = 0
+    last = 0
+    for start, end in regions:
+        gap = decode_text(data, last, start)
+        region = decode_text(data, start, end)
+        pieces += [gap, region]
+        length += len(gap)
+        text_regions.append((length, length + len(region)))
+        length += len(region)
+        last = end
+    pieces.append(decode_text(data, last))
+    return ''.join(pieces), text_regions
+
+
+def _needle_pattern(needles: Iterable[str]) -> bytes:
+    """Build a bytes alternation matching any needle, sharing common prefixes."""
+    trie: Dict[str, dict] = {}
+    for needle in needles:
+        node = trie
+        for char in needle:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def literal(char: str) -> bytes:
+        variants = [re.escape(char.encode('ascii'))]
+        variants += [re.escape(variant.encode('utf-8')) for variant in FOLDED_VARIANTS.get(char, ())]
+        return variants[0] if len(variants) == 1 else b'(?:' + b'|'.join(variants) + b')'
+
+    def build(node: dict) -> bytes:
+        # A hit only needs the shortest needle on a path, so stop at the first
+        if '' in node:
+            return b''
+        branches = [literal(char) + build(child) for char, child in sorted(node.items())]
+        if len(branches) == 1:
+            return branches[0]
+        return b'(?:' + b'|'.join(branches) + b')'
+
+    return build(trie)
+
+
+class BytePrefilter:
+    """Find the parts of a UTF-8 file where any of a set of words could match.
+
+    Words are searched case-insensitively, as ``re.IGNORECASE`` str patterns
+    compare them. Regions are cut at separators: ASCII bytes that are not
+    word characters, not carriage returns and not part of any word. No
+    match can cross a separator, and word boundaries next to one do not
+    depend on the other side, so scanning only the regions finds exactly
+    the matches a scan of the whole text would.
+    """
+
+    def __init__(self, words: Iterable[str], block_size: int = BLOCK_SIZE):
+        self.block_size = block_size
+        needles = set()
+        used = set()
+        for word in words:
+            if '\r' in word or '\n' in word:
+                raise ValueError(f"word {word!r} spans lines")
+            # Non-ASCII letters can fold to other byte sequences, so search the longest ASCII run
+            runs = re.findall(r'[\x00-\x7f]+', word)
+            if not runs:
+                raise ValueError(f"word {word!r} has no ASCII characters to search for")
+            needles.add(max(runs, key=len).lower())
+            used.update(ord(char) for run in runs for char in run.lower())
+
+        separators = [byte for byte in range(128)
+                      if byte not in _WORD_BYTES and byte not in used and byte != ord('\r')]
+        table = bytearray(range(256))
+        for byte in separators:
+            table[byte] = ord('\n')
+        for byte in range(ord('A'), ord('Z') + 1):
+            table[byte] = byte + 32
+        self.table = bytes(table)
+        self.pattern = re.compile(_needle_pattern(needles)) if needles else None
+
+    def regions(self, data: Buffer) -> Iterator[Tuple[int, int]]:
+        """Yield ascending, disjoint (start, end) byte ranges that hold every possible match."""
+        if self.pattern is None:
+            return
+        size = len(data)
+        pos = 0
+        pending = None
+        while pos < size:
+            # Translate a block ending just after a separator, growing it if it has none
+            length = self.block_size
+            while True:
+                end = min(pos + length, size)
+                low = data[pos:end].translate(self.table)
+                if end == size:
+                    break
+                cut = low.rfind(b'\n') + 1
+                if cut:
+                    low = low[:cut]
+                    end = pos + cut
+                    break
+                length *= 2
+
+            floor = 0
+            for hit in self.pattern.finditer(low):
+                if hit.start() < floor:
+                    continue
+                start = low.rfind(b'\n', floor, hit.start()) + 1 or floor
+                stop = low.find(b'\n', hit.end())
+                stop = len(low) if stop == -1 else stop + 1
+                floor = stop
+                if pending and pending[1] == pos + start:
+                    pending = (pending[0], pos + stop)
+                    continue
+                if pending:
+                    yield pending
+                pending = (pos + start, pos + stop)
+            pos = end
+        if pending:
+            yield pending
+
+    def text_regions(self, text: str) -> List[Tuple[int, int]]:
+        """Return the regions of an in-memory text as text offsets."""
+        data = text.encode('utf-8', 'surrogatepass')
+        result = []
+        position = 0
+        last = 0
+        for start, end in self.regions(data):
+            position += len(data[last:start].decode('utf-8', 'surrogatepass'))
+            length = len(data[start:end].decode('utf-8', 'surrogatepass'))
+            result.append((position, position + length))
+            position += length
+            last = end
+        return result
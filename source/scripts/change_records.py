@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Compact change records for the spelling converter.
+Stores the changes made to a document in parallel integer arrays with
+interned word tables, and aggregates them per rule and per word pair so a
+run's report needs memory bounded by its distinct changes, not their count.
+"""
+
+import json
+from array import array
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+# Example changes listed per file in reports
+REPORT_EXAMPLES = 10
+
+
+class StringTable:
+    """Interned strings addressed by small integer ids."""
+
+    __slots__ = ('strings', 'ids')
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self.ids: Dict[str, int] = {}
+
+    def intern(self, string: str) -> int:
+        string_id = self.ids.get(string)
+        if string_id is None:
+            string_id = self.ids[string] = len(self.strings)
+            self.strings.append(string)
+        return string_id
+
+    def __getitem__(self, string_id: int) -> str:
+        return self.strings[string_id]
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+class ChangeRecord:
+    """One replacement: where it happened, which rule made it and what it changed."""
+
+    __slots__ = ('offset', 'line', 'rule', 'original', 'replacement')
+
+    def __init__(self, offset: int, line: int, rule: int, original: str, replacement: str):
+        self.offset = offset
+        self.line = line
+        self.rule = rule
+        self.original = original
+        self.replacement = replacement
+
+    def __str__(self) -> str:
+        return f"{self.original} → {self.replacement}"
+
+    def __repr__(self) -> str:
+        return (f"ChangeRecord(offset={self.offset}, line={self.line}, rule={self.rule}, "
+                f"original={self.original!r}, replacement={self.replacement!r})")
+
+    def to_dict(self) -> Dict[str, object]:
+        return {'offset': self.offset, 'line': self.line, 'rule': self.rule,
+                'original': self.original, 'replacement': self.replacement}
+
+
+class ChangeList:
+    """Array-backed, ordered list of the changes made to one document.
+
+    Behaves like a list of ChangeRecord objects, which are created on access;
+    ``str(record)`` gives the familiar ``"color → colour"`` form.
+    """
+
+    def __init__(self):
+        self.offsets = array('q')
+        self.lines = array('q')
+        self.rules = array('l')
+        self.originals = array('l')
+        self.replacements = array('l')
+        self.words = StringTable()
+
+    def append(self, offset: int, line: int, rule: int, original: str, replacement: str) -> None:
+        self.offsets.append(offset)
+        self.lines.append(line)
+        self.rules.append(rule)
+        self.originals.append(self.words.intern(original))
+        self.replacements.append(self.words.intern(replacement))
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def _record(self, i: int) -> ChangeRecord:
+        return ChangeRecord(self.offsets[i], self.lines[i], self.rules[i],
+                            self.words[self.originals[i]], self.words[self.replacements[i]])
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[ChangeRecord, List[ChangeRecord]]:
+        if isinstance(i, slice):
+            return [self._record(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('change index out of range')
+        return self._record(i)
+
+    def __iter__(self) -> Iterator[ChangeRecord]:
+        for i in range(len(self)):
+            yield self._record(i)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+
+class ChangeSummary:
+    """Per-rule and per-word-pair counters for a conversion run.
+
+    Each file keeps only its change count and first few examples, so the
+    summary stays small however many changes the run makes.
+    """
+
+    def __init__(self, rules: List[str], examples: int = REPORT_EXAMPLES):
+        self.rules = rules
+        self.examples = examples
+        self.words = StringTable()
+        self.rule_counts: Dict[int, int] = {}
+        self.pair_counts: Dict[Tuple[int, int, int], int] = {}
+        self.files: Dict[str, Tuple[int, List[ChangeRecord]]] = {}
+        self.total = 0
+
+    def add(self, path: str, changes: ChangeList) -> None:
+        """Fold one file's changes into the counters."""
+        if not changes:
+            return
+        words = [self.words.intern(word) for word in changes.words.strings]
+        for rule, original, replacement in zip(changes.rules, changes.originals, changes.replacements):
+            self.rule_counts[rule] = self.rule_counts.get(rule, 0) + 1
+            key = (rule, words[original], words[replacement])
+            self.pair_counts[key] = self.pair_counts.get(key, 0) + 1
+        self.files[path] = (len(changes), changes[:self.examples])
+        self.total += len(changes)
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __bool__(self) -> bool:
+        return bool(self.files)
+
+    def iter_rules(self) -> Iterator[Tuple[str, int, List[Tuple[str, str, int]]]]:
+        """Yield (pattern, count, [(original, replacement, count)]) by descending count."""
+        pairs: Dict[int, List[Tuple[str, str, int]]] = {}
+        for (rule, original, replacement), count in self.pair_counts.items():
+            pairs.setdefault(rule, []).append((self.words[original], self.words[replacement], count))
+        for rule, count in sorted(self.rule_counts.items(), key=lambda item: (-item[1], item[0])):
+            yield self.rules[rule], count, sorted(pairs[rule], key=lambda pair: (-pair[2], pair[0]))
+
+    def iter_text(self, title: str = "Spelling Conversion Report") -> Iterator[str]:
+        """Yield the text report line by line."""
+        yield title
+        yield '=' * 50
+        yield ''
+        yield f"Files processed: {len(self.files)}"
+        yield f"Total changes: {self.total}"
+        yield ''
+
+        for path, (count, examples) in self.files.items():
+            yield f"{path}:"
+            for change in examples:
+                yield f"  • {change}"
+            if count > len(examples):
+                yield f"  ... and {count - len(examples)} more changes"
+            yield ''
+
+        yield "Changes by rule:"
+        for pattern, count, pairs in self.iter_rules():
+            yield f"  {count:>6}  {pattern}"
+            for original, replacement, pair_count in pairs:
+                yield f"          {pair_count:>6}  {original} → {replacement}"
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'files_processed': len(self.files),
+            'total_changes': self.total,
+            'files': {path: {'changes': count, 'examples': [change.to_dict() for change in examples]}
+                      for path, (count, examples) in self.files.items()},
+            'rules': [{'pattern': pattern, 'changes': count,
+                       'words': [{'original': original, 'replacement': replacement, 'changes': pair_count}
+                                 for original, replacement, pair_count in pairs]}
+                      for pattern, count, pairs in self.iter_rules()],
+        }
+
+    def write(self, stream: TextIO, report_format: str = 'text', title: Optional[str] = None) -> None:
+        """Write the report as 'text' or 'json'."""
+        if report_format == 'json':
+            json.dump(self.to_dict(), stream, indent=2, ensure_ascii=False)
+            stream.write('\n')
+            return
+        for line in self.iter_text(*([title] if title else [])):
+            stream.write(line + '\n')
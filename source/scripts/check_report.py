@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Spelling check results for CI.
+Holds the violations found by ``spelling_converter.py --check`` and formats
+them as text, JSON or SARIF for code scanning tools.
+"""
+
+import json
+from typing import Dict, List, NamedTuple
+
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+
+# Rule id reported for every violation in SARIF output
+SARIF_RULE_ID = 'house-spelling'
+
+
+class Violation(NamedTuple):
+    path: str
+    line: int
+    column: int
+    original: str
+    suggested: str
+
+    def to_dict(self) -> Dict[str, object]:
+        return self._asdict()
+
+
+def format_text(violations: List[Violation]) -> str:
+    """One ``path:line:column: original → suggested`` line per violation."""
+    lines = [f"{v.path}:{v.line}:{v.column}: {v.original} → {v.suggested}" for v in violations]
+    files = len({v.path for v in violations})
+    lines.append(f"{len(violations)} spelling violation(s) in {files} file(s)" if violations
+                 else "No spelling violations found.")
+    return '\n'.join(lines)
+
+
+def format_json(violations: List[Violation]) -> str:
+    return json.dumps({'violations': [v.to_dict() for v in violations]}, indent=2, ensure_ascii=False)
+
+
+def format_sarif(violations: List[Violation]) -> str:
+    """SARIF 2.1.0 log with one result per violation."""
+    results = [{
+        'ruleId': SARIF_RULE_ID,
+        'level': 'error',
+        'message': {'text': f"Use '{v.suggested}' instead of '{v.original}'"},
+        'locations': [{'physicalLocation': {
+            'artifactLocation': {'uri': v.path},
+            'region': {'startLine': v.line, 'startColumn': v.column,
+                       'endColumn': v.column + len(v.original)},
+        }}],
+        'fixes': [{
+            'description': {'text': f"Replace with '{v.suggested}'"},
+            'artifactChanges': [{
+                'artifactLocation': {'uri': v.path},
+                'replacements': [{
+                    'deletedRegion': {'startLine': v.line, 'startColumn': v.column,
+                                      'endColumn': v.column + len(v.original)},
+                    'insertedContent': {'text': v.suggested},
+                }],
+            }],
+        }],
+    } for v in violations]
+
+    log = {
+        '$schema': SARIF_SCHEMA,
+        'version': '2.1.0',
+        'runs': [{
+            'tool': {'driver': {
+                'name': 'spelling_converter',
+                'rules': [{'id': SARIF_RULE_ID,
+                           'shortDescription': {'text': 'Australian-British house spelling'}}],
+            }},
+            # Columns count characters, not the UTF-16 code units SARIF assumes by default
+            'columnKind': 'unicodeCodePoints',
+            'results': results,
+        }],
+    }
+    return json.dumps(log, indent=2, ensure_ascii=False)
+
+
+FORMATTERS = {'text': format_text, 'json': format_json, 'sarif': format_sarif}
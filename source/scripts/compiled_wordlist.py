@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Compiled word list format for the spelling converter.
+Stores custom mappings as ready-to-use rule patterns and replacements in a
+small versioned binary file, so large word lists load without re-parsing.
+
+Layout (little endian):
+    magic      4 bytes   b'SPWL'
+    version    uint16
+    count      uint32    number of entries
+    digest     32 bytes  sha256 of the source word list
+    name_len   uint16    followed by the UTF-8 source path
+    blob_len   uint32    followed by the UTF-8 entries, each pattern and
+                         replacement terminated by a NUL, in rule order
+"""
+
+import hashlib
+import os
+import shutil
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+MAGIC = b'SPWL'
+
+# Bump when the layout or the meaning of stored patterns changes
+WORDLIST_FORMAT = 1
+
+# Suffix of compiled word list files
+COMPILED_SUFFIX = '.spwl'
+
+_HEADER = struct.Struct('<4sHI32sH')
+_BLOB_LENGTH = struct.Struct('<I')
+
+
+class WordListFormatError(ValueError):
+    """Raised when a compiled word list is corrupt or from another format version."""
+
+
+class CompiledWordList:
+    """Contents of a compiled word list file."""
+
+    def __init__(self, mappings: Dict[str, str], source: Optional[Path], source_digest: str):
+        self.mappings = mappings
+        self.source = source
+        self.source_digest = source_digest
+
+    def is_current(self) -> bool:
+        """True if the recorded source is missing or still has the compiled content."""
+        if self.source is None or not self.source.exists():
+            return True
+        return source_digest(self.source) == self.source_digest
+
+
+def source_digest(file_path: Path) -> str:
+    """Return the hash recorded for a source word list."""
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def compile_word_list(mappings: Dict[str, str], source: Path, output: Path) -> int:
+    """Write mappings loaded from source to a compiled word list.
+
+    Returns the number of entries written.
+    """
+    parts = []
+    for pattern, replacement in mappings.items():
+        if '\0' in pattern or '\0' in replacement:
+            raise ValueError(f"Word list entries cannot contain NUL characters: {pattern!r}")
+        parts.append(pattern)
+        parts.append(replacement)
+    blob = ''.join(part + '\0' for part in parts).encode('utf-8')
+
+    try:
+        name = os.path.relpath(source.resolve(), output.resolve().parent)
+    except ValueError:
+        name = str(source.resolve())
+    name_bytes = name.encode('utf-8')
+
+    header = _HEADER.pack(MAGIC, WORDLIST_FORMAT, len(mappings),
+                          bytes.fromhex(source_digest(source)), len(name_bytes))
+    handle, temp_path = tempfile.mkstemp(prefix=f'.{output.name}.', suffix='.tmp', dir=output.parent)
+    try:
+        with open(handle, 'wb') as f:
+            f.write(header)
+            f.write(name_bytes)
+            f.write(_BLOB_LENGTH.pack(len(blob)))
+            f.write(blob)
+        shutil.copymode(source, temp_path)
+        os.replace(temp_path, output)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return len(mappings)
+
+
+def read_compiled_word_list(file_path: Path) -> CompiledWordList:
+    """Read a compiled word list, raising WordListFormatError if it is unusable."""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+
+    if len(data) < _HEADER.size or data[:4] != MAGIC:
+        raise WordListFormatError(f"{file_path} is not a compiled word list")
+    magic, version, count, digest, name_length = _HEADER.unpack_from(data)
+    if version != WORDLIST_FORMAT:
+        raise WordListFormatError(f"{file_path} has format version {version}, expected {WORDLIST_FORMAT}")
+
+    offset = _HEADER.size + name_length
+    if len(data) < offset + _BLOB_LENGTH.size:
+        raise WordListFormatError(f"{file_path} is truncated")
+    (blob_length,) = _BLOB_LENGTH.unpack_from(data, offset)
+    offset += _BLOB_LENGTH.size
+    if len(data) != offset + blob_length:
+        raise WordListFormatError(f"{file_path} is truncated")
+
+    try:
+        name = data[_HEADER.size:_HEADER.size + name_length].decode('utf-8')
+        parts = data[offset:].decode('utf-8').split('\0')
+    except UnicodeDecodeError as e:
+        raise WordListFormatError(f"{file_path} is corrupt: {e}")
+    if parts.pop() != '' or len(parts) != 2 * count:
+        raise WordListFormatError(f"{file_path} is corrupt: expected {count} entries")
+
+    entries = iter(parts)
+    source = Path(name) if os.path.isabs(name) else file_path.parent / name
+    return CompiledWordList(dict(zip(entries, entries)), source if name else None, digest.hex())
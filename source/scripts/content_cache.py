@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Content-hash cache shared by the text-processing scripts.
+Remembers which files were already clean under a given ruleset so that
+re-runs can skip them without converting them again.
+"""
+
+import hashlib
+import io
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from stream_io import write_text
+
+# Directory created next to the processed tree to hold the cache files
+CACHE_DIR_NAME = '.spelling_cache'
+
+# Bump when the cache file layout changes
+CACHE_FORMAT = 1
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return the content hash used as a cache key."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(file_path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Return the content hash of a file without holding it in memory."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_text_with_digest(file_path: Path) -> Tuple[str, str]:
+    """Read a UTF-8 file once, returning its text and the hash of its bytes.
+
+    Newlines are translated the same way as ``open(file_path, 'r')``.
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    text = io.StringIO(data.decode('utf-8'), newline=None).read()
+    return text, hash_bytes(data)
+
+
+class ContentCache:
+    """Persistent map of relative paths to the hashes of known-clean content."""
+
+    def __init__(self, root: Path, name: str, fingerprint: str):
+        self.path = root / CACHE_DIR_NAME / f'{name}.json'
+        self.fingerprint = fingerprint
+        self.entries: Dict[str, str] = {}
+        self.load()
+
+    def load(self) -> None:
+        """Load cached entries, dropping them all if the ruleset has changed."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get('format') == CACHE_FORMAT and data.get('fingerprint') == self.fingerprint:
+            self.entries = dict(data.get('files', {}))
+
+    def clean_digest(self, relative_path: str) -> Optional[str]:
+        """Return the hash of the content last seen clean at this path."""
+        return self.entries.get(relative_path)
+
+    def update(self, relative_path: str, digest: Optional[str]) -> None:
+        """Record the path as clean with the given hash, or forget it if None."""
+        if digest is None:
+            self.entries.pop(relative_path, None)
+        else:
+            self.entries[relative_path] = digest
+
+    def save(self, present: Optional[Iterable[str]] = None) -> None:
+        """Write the cache, evicting entries for files no longer in the tree.
+
+        Runs that only saw part of the tree pass None to keep every entry.
+        """
+        if present is not None:
+            present = set(present)
+            self.entries = {path: digest for path, digest in self.entries.items() if path in present}
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # An unchanged cache is not rewritten, so a no-op run writes nothing
+            write_text(self.path, json.dumps({'format': CACHE_FORMAT, 'fingerprint': self.fingerprint,
+                                              'files': dict(sorted(self.entries.items()))}, indent=2))
+        except OSError as e:
+            print(f"Warning: could not write cache {self.path}: {e}")
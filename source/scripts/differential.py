@@ -0,0 +1,737 @@
+#!/usr/bin/env python3
+"""
+Differential test harness for the text-processing engines.
+Generates random and adversarial documents, runs a frozen reference
+implementation and every candidate engine over them side by side, shrinks
+each mismatch to a minimal document and checks every engine's throughput
+against a per-mode budget, so faster paths cannot quietly change output.
+Differences from the reference that were made on purpose are declared in
+INTENDED_CHANGES and reported apart from real mismatches.
+"""
+
+import argparse
+import io
+import json
+import random
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+from collections import Counter
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from benchmark import AMERICAN_WORDS, PLAIN_WORDS, CorpusGenerator, git_revision
+from fix_markdown_lists import (FENCE, FRONT_MATTER, LineClassifier, fix_file, fix_file_streaming,
+                                fix_markdown_lists, read_front_matter)
+from pipeline import Document, ListFixStage, SpellingStage
+from spelling_converter import SpellingConverter
+
+MODES = ['safe', 'regex', 'hybrid']
+
+# Revision whose engines are the reference by default: the scripts as they
+# were before any optimisation, so a regression shared by every current
+# engine still shows up as a mismatch
+REFERENCE_REVISION = '715166d9c95b9b11846e7a7fb68b89e0ac519e29'
+
+# Result of running an engine: (text, changes), or (None, [exception name]) if it raised
+Output = Tuple[Optional[str], List[str]]
+
+# Characters read per chunk by the streaming engines when hunting for mismatches,
+# small enough that code fences, tags and front matter straddle chunk boundaries
+STRESS_CHUNK_SIZE = 64
+
+# Minimum throughput in MB/s on the benchmark corpus, by engine and mode. Set
+# at roughly a quarter of what each engine and mode reached on a development
+# machine, so only real regressions fail; raise them when an engine gets
+# faster. List fixing ignores the mode and is timed once, under '*'.
+BUDGETS: Dict[str, Dict[str, float]] = {
+    'convert_text': {'safe': 1.3, 'regex': 1.0, 'hybrid': 1.3},
+    'lookup': {'safe': 1.0, 'regex': 1.0, 'hybrid': 0.9},
+    'prefiltered': {'safe': 1.1, 'regex': 0.9, 'hybrid': 1.0},
+    'stream': {'safe': 0.9, 'regex': 0.7, 'hybrid': 0.85},
+    'pipeline': {'safe': 1.25, 'regex': 0.9, 'hybrid': 1.1},
+    'lists-stage': {'*': 9.0},
+}
+# Child process that runs the reference engines of an extracted source tree.
+# It only uses convert_text and fix_markdown_lists, which every revision has.
+_REFERENCE_SERVER = r'''
+import json, sys
+from fix_markdown_lists import fix_markdown_lists
+from spelling_converter import SpellingConverter
+
+with open(sys.argv[1], 'r', encoding='utf-8') as f:
+    custom_mappings = json.load(f)
+converters = {}
+for line in sys.stdin:
+    request = json.loads(line)
+    try:
+        text, changes = request['text'], []
+        if request['kind'] in ('lists', 'both'):
+            text = fix_markdown_lists(text)
+        if request['kind'] in ('spelling', 'both'):
+            converter = converters.get(request['mode'])
+            if converter is None:
+                converter = converters[request['mode']] = SpellingConverter(mode=request['mode'])
+                converter.custom_mappings.update(custom_mappings)
+            text, changes = converter.convert_text(text)
+        reply = {'text': text, 'changes': changes}
+    except Exception as e:
+        reply = {'error': type(e).__name__}
+    sys.stdout.write(json.dumps(reply) + '\n')
+    sys.stdout.flush()
+'''
+
+
+def _guarded(run: Callable[[str], Output]) -> Callable[[str], Output]:
+    """Wrap an engine so an exception becomes an output that must match too."""
+    def guarded(text: str) -> Output:
+        try:
+            return run(text)
+        except Exception as e:
+            return None, [type(e).__name__]
+    return guarded
+
+
+def universal_newlines(text: str) -> str:
+    """Translate newlines as reading a file in text mode does."""
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def expected_on_disk(text: str, reference) -> Output:
+    """What a file holding text should hold after an engine that rewrites it in place.
+
+    The engine reads the file in text mode, so it converts the text with
+    its newlines translated, and leaves the file untouched (original
+    newlines included) when nothing changed.
+    """
+    translated = universal_newlines(text)
+    result, changes = reference(translated)
+    if result == translated and not changes:
+        return text, changes
+    return result, changes
+
+
+# Declared intended changes
+
+class IntendedChange(NamedTuple):
+    """A difference from the reference made on purpose.
+
+    ``normalise`` rewrites an output so that the reference's and the
+    current engines' outputs compare equal where only this change sets
+    them apart.
+    """
+
+    name: str
+    # Request that made the change
+    request: str
+    # Engine kinds whose output it affects
+    kinds: Tuple[str, ...]
+    normalise: Callable[[Output], Output]
+
+
+def _without_identity_changes(output: Output) -> Output:
+    """Drop the changes that rewrite a word to itself."""
+    text, changes = output
+    return text, [change for change in changes if len(set(change.split(' → '))) != 1]
+
+
+def _without_blank_lines_by_fences(output: Output) -> Output:
+    """Drop the blank lines inside, before or after fenced code and front matter lines."""
+    text, changes = output
+    if text is None:
+        return output
+    lines = io.StringIO(text, newline='\n').readlines()
+    head, front_matter = read_front_matter(iter(lines))
+    classifier = LineClassifier(front_matter)
+    kinds = [classifier.classify(line[:-1] if line.endswith('\n') else line) for line in lines]
+    kept = [line for i, line in enumerate(lines)
+            if line.strip() or not {FENCE, FRONT_MATTER} & set(kinds[max(0, i - 1):i + 2])]
+    return ''.join(kept), changes
+
+
+# Changes since REFERENCE_REVISION. A document whose reference and current
+# outputs differ only by these is reported as intended, provided every
+# candidate matches the current engines exactly.
+INTENDED_CHANGES = [
+    IntendedChange('rules that rewrite a word to itself are dropped', 'user-020', ('spelling', 'both'),
+                   _without_identity_changes),
+    IntendedChange('lists in fenced code and front matter are left alone', 'user-011', ('lists', 'both'),
+                   _without_blank_lines_by_fences),
+]
+
+
+def explain(kind: str, expected: Output, current: Output,
+            changes: List[IntendedChange] = INTENDED_CHANGES) -> Optional[List[str]]:
+    """Name the declared changes that account for every difference between two outputs.
+
+    Returns None if the differences are not all declared.
+    """
+    changes = [change for change in changes if kind in change.kinds]
+
+    def equal(changes: List[IntendedChange]) -> bool:
+        outputs = expected, current
+        for change in changes:
+            outputs = tuple(map(change.normalise, outputs))
+        return outputs[0] == outputs[1]
+
+    if not equal(changes):
+        return None
+    # Only name the changes the difference cannot be explained without
+    return [change.name for change in changes if not equal([other for other in changes if other is not change])]
+
+
+# Reference engines
+
+class CurrentReference:
+    """The reference engines of the working tree, with every fast path turned off."""
+
+    name = 'current'
+
+    def __init__(self, custom_mappings: Dict[str, str]):
+        self.custom_mappings = custom_mappings
+        self.converters: Dict[str, SpellingConverter] = {}
+
+    def run(self, kind: str, mode: str, text: str) -> Output:
+        def reference(text: str) -> Output:
+            changes = []
+            if kind in ('lists', 'both'):
+                text = fix_markdown_lists(text)
+            if kind in ('spelling', 'both'):
+                converter = self.converters.get(mode)
+                if converter is None:
+                    converter = self.converters[mode] = _converter(mode, self.custom_mappings, prefilter=False,
+                                                                   anchor_min_regex_rules=sys.maxsize)
+                text, changes = converter.convert_text(text)
+            return text, changes
+        return _guarded(reference)(text)
+
+    def close(self) -> None:
+        pass
+
+
+class FrozenReference:
+    """The reference engines as committed at a git revision, run in a child interpreter.
+
+    Candidates in the working tree are compared with the committed code,
+    so an optimisation cannot change the reference it is checked against.
+    """
+
+    def __init__(self, revision: str, custom_mappings: Dict[str, str]):
+        self.name = revision
+        scripts = Path(__file__).resolve().parent
+        top, prefix = subprocess.run(['git', 'rev-parse', '--show-toplevel', '--show-prefix'], cwd=scripts,
+                                     capture_output=True, text=True, check=True).stdout.split('\n')[:2]
+        # Archiving the scripts' own tree puts them at the root of the archive
+        archive = subprocess.run(['git', 'archive', '--format=tar', f'{revision}:{prefix}'],
+                                 cwd=top, capture_output=True, check=True).stdout
+
+        self.directory = tempfile.TemporaryDirectory(prefix='differential-')
+        root = Path(self.directory.name)
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(root)
+        mappings_path = root / 'custom_mappings.json'
+        mappings_path.write_text(json.dumps(custom_mappings), encoding='utf-8')
+
+        self.process = subprocess.Popen([sys.executable, '-c', _REFERENCE_SERVER, str(mappings_path)],
+                                        cwd=root, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        text=True, encoding='utf-8')
+
+    def run(self, kind: str, mode: str, text: str) -> Output:
+        self.process.stdin.write(json.dumps({'kind': kind, 'mode': mode, 'text': text}) + '\n')
+        self.process.stdin.flush()
+        line = self.process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"reference process for {self.name} exited with status {self.process.wait()}")
+        reply = json.loads(line)
+        if 'error' in reply:
+            return None, [reply['error']]
+        return reply['text'], reply['changes']
+
+    def close(self) -> None:
+        self.process.stdin.close()
+        self.process.wait()
+        self.directory.cleanup()
+
+
+# Candidate engines
+
+class Engine(NamedTuple):
+    """A candidate implementation of one kind, built once per mode."""
+
+    name: str
+    # What it computes: 'lists' (list fixing), 'spelling' (conversion) or 'both' (lists, then spelling)
+    kind: str
+    # (mode, custom mappings, stress) -> run; stress picks settings that exercise edge cases
+    build: Callable[[str, Dict[str, str], bool], Callable[[str], Output]]
+    # Engines that rewrite a file in place; they are checked (see expected_on_disk) but not timed
+    on_disk: bool = False
+
+
+def _converter(mode: str, custom_mappings: Dict[str, str], **settings) -> SpellingConverter:
+    converter = SpellingConverter(mode=mode)
+    converter.custom_mappings.update(custom_mappings)
+    for name, value in settings.items():
+        setattr(converter, name, value)
+    converter.get_matcher()
+    return converter
+
+
+def _convert_text(mode, custom_mappings, stress):
+    return _converter(mode, custom_mappings).convert_text
+
+
+def _lookup(mode, custom_mappings, stress):
+    return _converter(mode, custom_mappings, engine='lookup').convert_text
+
+
+def _prefiltered(mode, custom_mappings, stress):
+    # Few regex rules would never reach the per-document rule subsets, so stress them with any number
+    converter = _converter(mode, custom_mappings, anchor_min_regex_rules=0 if stress else 40)
+    prefilter = converter.get_prefilter()
+
+    def run(text: str) -> Output:
+        regions = prefilter.text_regions(text) if prefilter is not None else None
+        result, changes = converter.convert_records(text, regions)
+        return result, [str(change) for change in changes]
+    return run
+
+
+def _stream(mode, custom_mappings, stress):
+    converter = _converter(mode, custom_mappings)
+    if stress:
+        converter.chunk_size = STRESS_CHUNK_SIZE
+
+    def run(text: str) -> Output:
+        sink = io.StringIO()
+        changes, _ = converter.convert_stream(io.StringIO(text), sink)
+        return sink.getvalue(), [str(change) for change in changes]
+    return run
+
+
+def _on_disk(process: Callable[[Path], List[str]]) -> Callable[[str], Output]:
+    """Run a file-processing function on a temporary copy of the document."""
+    directory = tempfile.TemporaryDirectory(prefix='differential-')
+
+    def run(text: str) -> Output:
+        file_path = Path(directory.name) / 'document.md'
+        with open(file_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        changes = process(file_path)
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
+            return f.read(), changes
+    return run
+
+
+def _file(mode, custom_mappings, stress):
+    converter = _converter(mode, custom_mappings)
+    return _on_disk(lambda file_path: [str(change) for change in converter.process_file(file_path)[1]])
+
+
+def _file_stream(mode, custom_mappings, stress):
+    converter = _converter(mode, custom_mappings, stream_threshold=0)
+    if stress:
+        converter.chunk_size = STRESS_CHUNK_SIZE
+    return _on_disk(lambda file_path: [str(change) for change in converter.process_file(file_path)[1]])
+
+
+def _pipeline(mode, custom_mappings, stress):
+    stages = [ListFixStage(), SpellingStage(_converter(mode, custom_mappings))]
+
+    def run(text: str) -> Output:
+        document = Document(Path('document.md'), text)
+        for stage in stages:
+            stage.run(document)
+        return document.text, document.changes.get('spelling', [])
+    return run
+
+
+def _lists_stage(mode, custom_mappings, stress):
+    stage = ListFixStage()
+
+    def run(text: str) -> Output:
+        document = Document(Path('document.md'), text)
+        stage.run(document)
+        return document.text, []
+    return run
+
+
+def _lists_file(mode, custom_mappings, stress):
+    def process(file_path: Path) -> List[str]:
+        _, message, _ = fix_file(file_path, stream=stress)
+        if message.startswith('Error'):
+            raise RuntimeError(message)
+        return []
+    return _on_disk(process)
+
+
+def _lists_file_stream(mode, custom_mappings, stress):
+    def process(file_path: Path) -> List[str]:
+        fix_file_streaming(file_path)
+        return []
+    return _on_disk(process)
+
+
+ENGINES = [
+    Engine('convert_text', 'spelling', _convert_text),
+    Engine('lookup', 'spelling', _lookup),
+    Engine('prefiltered', 'spelling', _prefiltered),
+    Engine('stream', 'spelling', _stream),
+    Engine('file', 'spelling', _file, on_disk=True),
+    Engine('file-stream', 'spelling', _file_stream, on_disk=True),
+    Engine('pipeline', 'both', _pipeline),
+    Engine('lists-stage', 'lists', _lists_stage),
+    Engine('lists-file', 'lists', _lists_file, on_disk=True),
+    Engine('lists-file-stream', 'lists', _lists_file_stream, on_disk=True),
+]
+
+
+# Document generation
+
+class DocumentGenerator:
+    """Builds random documents from fragments chosen to hit the converters' edge cases."""
+
+    # Letters that re.IGNORECASE matches against ASCII ones, and what they stand in for
+    FOLDS = {'s': 'ſ', 'i': 'ı', 'I': 'İ', 'k': 'K', 'K': 'K'}
+
+    def __init__(self, seed: int = 0):
+        self.random = random.Random(seed)
+        self.fragments = [self.prose, self.prose, self.prose, self.list_block, self.fence, self.nested_fence,
+                          self.inline_code, self.tag, self.camel_case, self.front_matter, self.css,
+                          self.url, self.brackets, self.punctuation]
+
+    def cased(self, word: str) -> str:
+        """Return the word in lower, title, upper or random case, sometimes with folding letters."""
+        choice = self.random.random()
+        if choice < 0.5:
+            pass
+        elif choice < 0.7:
+            word = word.capitalize()
+        elif choice < 0.8:
+            word = word.upper()
+        else:
+            word = ''.join(char.upper() if self.random.random() < 0.5 else char.lower() for char in word)
+        if self.random.random() < 0.05:
+            word = ''.join(self.FOLDS.get(char, char) if self.random.random() < 0.5 else char for char in word)
+        return word
+
+    def word(self) -> str:
+        if self.random.random() < 0.3:
+            return self.cased(self.random.choice(AMERICAN_WORDS))
+        return self.random.choice(PLAIN_WORDS)
+
+    def words(self, low: int = 1, high: int = 8) -> str:
+        return ' '.join(self.word() for _ in range(self.random.randint(low, high)))
+
+    def prose(self) -> str:
+        return self.words(3, 14) + self.random.choice(['.', ',', '', ':', '!'])
+
+    def list_block(self) -> str:
+        markers = ['- ', '* ', '+ ', '1. ', '  - ', '    * ', '-', '1.']
+        return '\n'.join(self.random.choice(markers) + self.words() for _ in range(self.random.randint(1, 4)))
+
+    def fence(self) -> str:
+        marker = self.random.choice(['```', '~~~', '````', '   ```', '    ```'])
+        info = self.random.choice(['', 'python', '{python}', ' css', 'md `x`'])
+        closing = self.random.choice([marker.strip(), marker.strip() + '`', '', '```', '~~~'])
+        return f'{marker}{info}\n{self.words()}\n- {self.words()}\n{closing}'
+
+    def nested_fence(self) -> str:
+        inner = self.fence()
+        outer = self.random.choice(['````', '~~~~', '`````'])
+        return f'{outer}markdown\n{inner}\n{self.words()}\n{outer}'
+
+    def inline_code(self) -> str:
+        code = self.random.choice([f'`{self.words(1, 3)}`', f'``{self.words(1, 2)}``',
+                                   f'`{self.words(1, 3)}', f'{self.words(1, 2)}`'])
+        return f'{self.words()} {code} {self.words()}'
+
+    def tag(self) -> str:
+        body = self.words(1, 4)
+        return self.random.choice([
+            f'<span class="{body}">{body}</span>', f'<div id="{self.word()}" style="color: red;">{body}',
+            f'<{self.word()} {body}', f'<!-- {body} -->', f'<!-- {body}', f'<a href="{body}">{body}</a>',
+            f'<img src="{self.word()}.png">', f'{body} > {body} < {body}', '<>',
+        ])
+
+    def camel_case(self) -> str:
+        first, second = self.cased(self.random.choice(AMERICAN_WORDS)), self.random.choice(AMERICAN_WORDS)
+        return self.random.choice([
+            f'{first.capitalize()}{second.capitalize()}', f'{first.lower()}{second.capitalize()}',
+            f'XML{first.capitalize()}', f'get{first.capitalize()}()', f'{first}_{second}', f'{first}2',
+        ])
+
+    def front_matter(self) -> str:
+        end = self.random.choice(['---', '...', '--- ', ''])
+        return f'---\ntitle: {self.words(1, 4)}\ntags: [{self.words(1, 3)}]\n{end}'
+
+    def css(self) -> str:
+        value = self.words(1, 2)
+        return self.random.choice([
+            f'color: {value};', f'background-color:{value};', f'--main-{self.word()}-color: red;',
+            'text-align: center;', f'.{self.word()} {{ color: {value} }}', f'color: {value}',
+        ])
+
+    def url(self) -> str:
+        return self.random.choice([f'https://example.com/{self.word()}/{self.word()}',
+                                   f'http://{self.word()}.org', f'see {self.word()}.html'])
+
+    def brackets(self) -> str:
+        body = self.words(1, 4)
+        return self.random.choice([f'{{{body}}}', f'[{body}]', f'[{body}]({self.word()}.md)',
+                                   f'{{{body}', f'[{body}', f'{body}]', '{}', '[]'])
+
+    def punctuation(self) -> str:
+        word = self.cased(self.random.choice(AMERICAN_WORDS))
+        return self.random.choice([f"{word}'s", f'{word}-based', f'"{word}"', f'({word})', f'{word}é',
+                                   f'naïve {word}', f'{word}\t{word}', f'{word}.{word}', f'$${word}$$'])
+
+    def document(self, blocks: int) -> str:
+        parts = [self.front_matter()] if self.random.random() < 0.2 else []
+        parts += [self.random.choice(self.fragments)() for _ in range(blocks)]
+        separators = ['\n', '\n', '\n\n', ' ', '\r\n', '\n\n\n']
+        text = parts[0] if parts else ''
+        for part in parts[1:]:
+            text += self.random.choice(separators) + part
+        return text + self.random.choice(['', '\n', '\n\n'])
+
+
+# Comparison and shrinking
+
+def shrink(text: str, fails: Callable[[str], bool], max_tries: int = 2000) -> str:
+    """Reduce text to a minimal document for which ``fails`` still holds.
+
+    Removes ever smaller runs of whole lines, then of characters, keeping
+    each removal that leaves the failure in place (delta debugging).
+    """
+    tries = 0
+    for split in (lambda value: value.splitlines(keepends=True), list):
+        units = split(text)
+        chunk = max(1, len(units) // 2)
+        while True:
+            i = 0
+            while i < len(units) and tries < max_tries:
+                candidate = units[:i] + units[i + chunk:]
+                tries += 1
+                if candidate and fails(''.join(candidate)):
+                    units = candidate
+                else:
+                    i += chunk
+            if chunk == 1 or tries >= max_tries:
+                break
+            chunk //= 2
+        text = ''.join(units)
+    return text
+
+
+class Mismatch(NamedTuple):
+    engine: str
+    mode: str
+    seed: int
+    document: str
+    shrunk: str
+    expected: Output
+    actual: Output
+
+    def to_dict(self) -> Dict[str, object]:
+        return {'engine': self.engine, 'mode': self.mode, 'seed': self.seed, 'document': self.document,
+                'shrunk': self.shrunk, 'expected': list(self.expected), 'actual': list(self.actual)}
+
+    def __str__(self) -> str:
+        return (f"{self.engine} ({self.mode}, document seed {self.seed}) differs on {self.shrunk!r}\n"
+                f"  reference: {self.expected!r}\n"
+                f"  candidate: {self.actual!r}")
+
+
+def compare(reference, engines: List[Engine], modes: List[str], custom_mappings: Dict[str, str],
+            documents: int, blocks: int, seed: int, shrink_mismatches: bool = True,
+            max_mismatches: int = 1, current: Optional[CurrentReference] = None
+            ) -> Tuple[List[Mismatch], Counter]:
+    """Run every engine and the reference over generated documents and collect the mismatches.
+
+    Each document is generated from its own seed, so a mismatch can be
+    regenerated from the seed alone. At most ``max_mismatches`` are
+    collected per engine and mode. With ``current`` (the working tree's
+    reference engines) a candidate that differs from the reference is
+    only a mismatch if it also differs from ``current``, or if the
+    reference and ``current`` differ by more than INTENDED_CHANGES
+    declare. Returns the mismatches and how many outputs each declared
+    change accounted for.
+    """
+    mismatches = []
+    intended: Counter = Counter()
+    for mode in modes:
+        # Modes only matter to spelling, so list engines are checked once
+        active = [engine for engine in engines if engine.kind != 'lists' or mode == modes[0]]
+        runs = {engine.name: _guarded(engine.build(mode, custom_mappings, True)) for engine in active}
+        found = {engine.name: 0 for engine in active}
+
+        for index in range(documents):
+            document_seed = seed * 1_000_003 + index
+            text = DocumentGenerator(document_seed).document(blocks)
+            for engine in active:
+                if found[engine.name] >= max_mismatches:
+                    continue
+                run = runs[engine.name]
+
+                def check(text: str, engine=engine, run=run) -> Tuple[Output, Output, Optional[List[str]]]:
+                    """Return (expected, actual, declared changes that explain their difference or None)."""
+                    def expected(source: str) -> Output:
+                        return reference.run(engine.kind, mode, source)
+
+                    def present(source: str) -> Output:
+                        return current.run(engine.kind, mode, source)
+
+                    wanted = expected_on_disk(text, expected) if engine.on_disk else expected(text)
+                    actual = run(text)
+                    if wanted == actual or current is None:
+                        return wanted, actual, None if wanted != actual else []
+                    if actual != (expected_on_disk(text, present) if engine.on_disk else present(text)):
+                        return wanted, actual, None
+                    # Engines that rewrite files see the text with its newlines translated
+                    source = universal_newlines(text) if engine.on_disk else text
+                    return wanted, actual, explain(engine.kind, expected(source), present(source))
+
+                expected, actual, explained = check(text)
+                if expected == actual:
+                    continue
+                if explained is not None:
+                    intended.update(explained)
+                    continue
+                shrunk = text
+                if shrink_mismatches:
+                    shrunk = shrink(text, lambda candidate: check(candidate)[2] is None)
+                    expected, actual, _ = check(shrunk)
+                found[engine.name] += 1
+                mismatches.append(Mismatch(engine.name, mode, document_seed, text, shrunk, expected, actual))
+    return mismatches, intended
+
+
+# Throughput budgets
+
+def measure(engines: List[Engine], modes: List[str], custom_mappings: Dict[str, str],
+            corpus: List[str], repeat: int) -> List[Dict[str, object]]:
+    """Time each engine over the corpus, keeping its fastest pass, and return MB/s per engine and mode."""
+    size = sum(len(text.encode('utf-8')) for text in corpus) / (1024 * 1024)
+    results = []
+    for engine in engines:
+        if engine.on_disk:
+            continue
+        for mode in modes if engine.kind != 'lists' else ['*']:
+            run = engine.build(modes[0] if mode == '*' else mode, custom_mappings, False)
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for text in corpus:
+                    run(text)
+                best = min(best, time.perf_counter() - start)
+            results.append({'engine': engine.name, 'mode': mode, 'mb_per_second': round(size / best, 3)})
+    return results
+
+
+def check_budgets(results: List[Dict[str, object]], budgets: Dict[str, Dict[str, float]]) -> List[str]:
+    """Return a message for every engine and mode slower than its budget."""
+    failures = []
+    for result in results:
+        limits = budgets.get(result['engine'], {})
+        budget = limits.get(result['mode'], limits.get('*'))
+        result['budget'] = budget
+        if budget is not None and result['mb_per_second'] < budget:
+            failures.append(f"{result['engine']} ({result['mode']}): {result['mb_per_second']:.2f} MB/s "
+                            f"is below its budget of {budget:.2f} MB/s")
+    return failures
+
+
+def format_budgets(results: List[Dict[str, object]]) -> str:
+    lines = [f"{'engine':<14} {'mode':<7} {'MB/s':>8} {'budget':>8}"]
+    for result in results:
+        budget = result.get('budget')
+        lines.append(f"{result['engine']:<14} {result['mode']:<7} {result['mb_per_second']:>8.2f} "
+                     f"{'-' if budget is None else f'{budget:.2f}':>8}")
+    return '\n'.join(lines)
+
+
+def main() -> int:
+    """Main function to run the differential checks and budgets."""
+    parser = argparse.ArgumentParser(description='Check the optimised engines against a frozen reference')
+    parser.add_argument('--reference', default=REFERENCE_REVISION, metavar='REV',
+                        help="Git revision whose convert_text and fix_markdown_lists are the reference, or "
+                             "'current' for the working tree with its fast paths off (default: the "
+                             "pre-optimisation revision REFERENCE_REVISION)")
+    parser.add_argument('--engines', nargs='+', choices=[engine.name for engine in ENGINES],
+                        default=[engine.name for engine in ENGINES], help='Candidate engines to check')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES, help='Converter modes to check')
+    parser.add_argument('--wordlist', '-w', type=str, help='Custom word list used by every engine')
+    parser.add_argument('--documents', type=int, default=200, help='Random documents per mode')
+    parser.add_argument('--blocks', type=int, default=12, help='Fragments per document')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the documents')
+    parser.add_argument('--max-mismatches', type=int, default=1,
+                        help='Mismatches to collect per engine and mode before moving on')
+    parser.add_argument('--no-shrink', action='store_true', help='Report mismatching documents unshrunk')
+    parser.add_argument('--no-budgets', action='store_true', help='Skip the throughput budgets')
+    parser.add_argument('--budgets', type=str, metavar='FILE',
+                        help='JSON budgets ({engine: {mode: MB/s}}) replacing the built-in ones')
+    parser.add_argument('--corpus-files', type=int, default=8, help='Benchmark documents timed per engine')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed passes per engine; the fastest is kept')
+    parser.add_argument('--output', '-o', type=str, help='Save mismatches and throughput as JSON')
+    args = parser.parse_args()
+
+    custom_mappings = {}
+    if args.wordlist:
+        loader = SpellingConverter()
+        loader.load_word_list(Path(args.wordlist))
+        custom_mappings = loader.custom_mappings
+
+    try:
+        reference = (CurrentReference(custom_mappings) if args.reference == 'current'
+                     else FrozenReference(args.reference, custom_mappings))
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Error: could not extract the reference at {args.reference}: {e}")
+        return 1
+
+    # Against a frozen revision, the working tree's reference engines tell intended changes from regressions
+    current = None if isinstance(reference, CurrentReference) else CurrentReference(custom_mappings)
+
+    engines = [engine for engine in ENGINES if engine.name in args.engines]
+    print(f"Reference: {reference.name}; {args.documents} documents per mode, seed {args.seed}")
+    try:
+        mismatches, intended = compare(reference, engines, args.modes, custom_mappings, args.documents,
+                                       args.blocks, args.seed, not args.no_shrink, args.max_mismatches, current)
+    finally:
+        reference.close()
+
+    for mismatch in mismatches:
+        print(mismatch)
+    for name, count in intended.most_common():
+        print(f"Intended change: {name} ({count} output(s))")
+    print(f"{len(mismatches)} mismatch(es)")
+
+    results, failures = [], []
+    if not args.no_budgets:
+        budgets = BUDGETS
+        if args.budgets:
+            with open(args.budgets, 'r', encoding='utf-8') as f:
+                budgets = json.load(f)
+        generator = CorpusGenerator(seed=args.seed)
+        corpus = [text for _, text in generator.corpus(args.corpus_files, 50_000)]
+        results = measure(engines, args.modes, custom_mappings, corpus, args.repeat)
+        failures = check_budgets(results, budgets)
+        print(format_budgets(results))
+        for failure in failures:
+            print(f"Over budget: {failure}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'revision': git_revision(), 'reference': reference.name,
+                       'parameters': {key: value for key, value in vars(args).items() if key != 'output'},
+                       'mismatches': [mismatch.to_dict() for mismatch in mismatches],
+                       'intended': dict(intended),
+                       'throughput': results}, f, indent=2)
+        print(f"Results saved to: {args.output}")
+
+    return 1 if mismatches or failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+File discovery shared by the text-processing scripts.
+Walks a tree with os.scandir, pruning version control, build output and
+ignored directories before descending into them, filters names by suffix
+before anything is stat'ed, and yields paths lazily in sorted order.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Directories never descended into (version control, build output, caches)
+PRUNED_DIRS = frozenset({'.git', '.quarto', '_site', '_freeze', 'node_modules', '__pycache__',
+                         '.spelling_cache'})
+
+# Ignore files read in every directory, in gitignore syntax
+IGNORE_FILES = ('.gitignore', '.quartoignore')
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob (without its anchoring slash) into a regex body."""
+    parts = []
+    segments = pattern.split('/')
+    for position, segment in enumerate(segments):
+        last = position == len(segments) - 1
+        if segment == '**':
+            # Leading or middle '**/' matches any number of directories, a final '/**' everything inside
+            parts.append('.*' if last else '(?:.*/)?')
+            continue
+        i = 0
+        while i < len(segment):
+            char = segment[i]
+            if char == '*':
+                while i + 1 < len(segment) and segment[i + 1] == '*':
+                    i += 1
+                parts.append('[^/]*')
+            elif char == '?':
+                parts.append('[^/]')
+            elif char == '[':
+                end = segment.find(']', i + 2)
+                if end == -1:
+                    parts.append(re.escape(char))
+                else:
+                    body = segment[i + 1:end]
+                    if body[0] in '!^':
+                        body = '^' + body[1:]
+                    parts.append('[' + body.replace('\\', '\\\\') + ']')
+                    i = end
+            elif char == '\\' and i + 1 < len(segment):
+                i += 1
+                parts.append(re.escape(segment[i]))
+            else:
+                parts.append(re.escape(char))
+            i += 1
+        if not last:
+            parts.append('/')
+    return ''.join(parts)
+
+
+class IgnoreRules:
+    """Patterns in gitignore syntax that apply below one directory.
+
+    The last pattern matching a path decides: a plain pattern ignores it
+    and a ``!`` pattern includes it again. A pattern with a slash before
+    its end is anchored to the directory; one without matches names at
+    any depth; a trailing slash matches directories only.
+    """
+
+    def __init__(self, patterns: Iterable[str], base: str = ''):
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []
+        prefix = re.escape(base + '/') if base else ''
+        for line in patterns:
+            line = line.rstrip('\n').rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negated = line.startswith('!')
+            if negated:
+                line = line[1:]
+            elif line.startswith('\\'):
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if not line:
+                continue
+            anchored = '/' in line
+            body = _translate(line.lstrip('/'))
+            regex = re.compile(prefix + ('' if anchored else '(?:.*/)?') + body + r'\Z')
+            self.rules.append((regex, negated, dir_only))
+
+    @classmethod
+    def from_file(cls, file_path: Path, base: str = '') -> 'IgnoreRules':
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                return cls(f, base)
+        except OSError:
+            return cls((), base)
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """True if the path is ignored, False if included again, None if no pattern matches it."""
+        for regex, negated, dir_only in reversed(self.rules):
+            if (is_dir or not dir_only) and regex.match(path):
+                return not negated
+        return None
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+
+def _git_top(root: Path) -> Optional[Path]:
+    """Return the nearest directory at or above root that holds a .git entry."""
+    for directory in (root, *root.parents):
+        if (directory / '.git').exists():
+            return directory
+    return None
+
+
+def _inherited_rules(top: Path, prefix: str, ignore_files: Tuple[str, ...]) -> List[IgnoreRules]:
+    """Load the ignore files of every directory from top down to, but not including, top / prefix."""
+    rules = []
+    parts = prefix.split('/')
+    for depth in range(len(parts)):
+        for name in ignore_files:
+            ruleset = IgnoreRules.from_file(top.joinpath(*parts[:depth], name), '/'.join(parts[:depth]))
+            if ruleset:
+                rules.append(ruleset)
+    return rules
+
+
+def _suffix(name: str) -> str:
+    """The suffix Path(name).suffix would give, without building a Path."""
+    i = name.rfind('.')
+    return name[i:] if 0 < i < len(name) - 1 else ''
+
+
+def _suffix_filter(suffixes: Optional[Iterable[str]], ignore_case: bool) -> Callable[[str], bool]:
+    """Return a test for whether a file name has one of the suffixes (any name if None)."""
+    if suffixes is None:
+        return lambda name: True
+    if ignore_case:
+        folded = {suffix.lower() for suffix in suffixes}
+        return lambda name: _suffix(name).lower() in folded
+    exact = set(suffixes)
+    return lambda name: _suffix(name) in exact
+
+
+class _IgnoreContext:
+    """The ignore rules in force below root: ancestor ignore files, then ``exclude``."""
+
+    def __init__(self, root: Path, exclude: Iterable[str], ignore_files: Tuple[str, ...]):
+        # Paths are matched relative to the git top, so parent ignore files apply unchanged
+        top = _git_top(root.resolve()) if ignore_files else None
+        prefix = root.resolve().relative_to(top).as_posix() if top is not None else ''
+        self.prefix = '' if prefix == '.' else prefix
+        self.inherited = _inherited_rules(top, self.prefix, ignore_files) if self.prefix else []
+        self.ignore_files = ignore_files
+        self.extra = IgnoreRules(exclude, self.prefix)
+
+    def local(self, directory: Path, relative: str, names: Iterable[str]) -> List[IgnoreRules]:
+        """Load the ignore files among a directory's entry names."""
+        rules = [IgnoreRules.from_file(directory / name, relative) for name in names
+                 if name in self.ignore_files]
+        return [ruleset for ruleset in rules if ruleset]
+
+    def ignored(self, rules: List[IgnoreRules], path: str, is_dir: bool) -> bool:
+        decision = self.extra.match(path, is_dir)
+        if decision is not None:
+            return decision
+        for ruleset in reversed(rules):
+            decision = ruleset.match(path, is_dir)
+            if decision is not None:
+                return decision
+        return False
+
+
+def iter_files(root: Path, suffixes: Optional[Iterable[str]] = None, ignore_case: bool = False,
+               exclude: Iterable[str] = (), pruned: Iterable[str] = PRUNED_DIRS,
+               ignore_files: Iterable[str] = IGNORE_FILES) -> Iterator[Path]:
+    """Yield the files under root in sorted path order.
+
+    Only names with one of ``suffixes`` are yielded (compared
+    case-insensitively with ``ignore_case``). Directories named in
+    ``pruned`` are skipped, as is anything the ignore files exclude,
+    including those in root's parents up to the top of its git work tree.
+    ``exclude`` adds gitignore-style patterns relative to root that are
+    applied after every ignore file, so ``!pattern`` can include paths
+    again. Symlinked directories are not followed.
+    """
+    root = Path(root)
+    wanted = _suffix_filter(suffixes, ignore_case)
+    pruned = frozenset(pruned)
+    context = _IgnoreContext(root, exclude, tuple(ignore_files))
+    ignored = context.ignored
+
+    def walk(directory: Path, relative: str, rules: List[IgnoreRules]) -> Iterator[Path]:
+        try:
+            with os.scandir(directory) as scan:
+                entries = sorted(scan, key=lambda entry: entry.name)
+        except OSError:
+            return
+        rules = rules + context.local(directory, relative, (entry.name for entry in entries))
+
+        for entry in entries:
+            name = entry.name
+            path = f'{relative}/{name}' if relative else name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if name not in pruned and not ignored(rules, path, True):
+                        yield from walk(Path(entry.path), path, rules)
+                    continue
+                if wanted(name) and entry.is_file() and not ignored(rules, path, False):
+                    yield Path(entry.path)
+            except OSError:
+                continue
+
+    yield from walk(root, context.prefix, context.inherited)
+
+
+def filter_files(root: Path, paths: Iterable[Path], suffixes: Optional[Iterable[str]] = None,
+                 ignore_case: bool = False, exclude: Iterable[str] = (), pruned: Iterable[str] = PRUNED_DIRS,
+                 ignore_files: Iterable[str] = IGNORE_FILES) -> List[Path]:
+    """Return those of paths that iter_files would yield for root, in the same order.
+
+    Only the ignore files in the directories leading to each path are
+    read, so the cost follows the number of paths rather than the size of
+    the tree. Paths outside root are dropped.
+    """
+    root = Path(root)
+    resolved_root = root.resolve()
+    wanted = _suffix_filter(suffixes, ignore_case)
+    pruned = frozenset(pruned)
+    context = _IgnoreContext(root, exclude, tuple(ignore_files))
+    ignored = context.ignored
+    # Rules in force inside each directory, keyed by its path parts below root
+    directory_rules: Dict[Tuple[str, ...], Optional[List[IgnoreRules]]] = {
+        (): context.inherited + context.local(root, context.prefix, context.ignore_files)}
+
+    def rules_in(parts: Tuple[str, ...]) -> Optional[List[IgnoreRules]]:
+        """The rules inside a directory, or None if the directory itself is skipped."""
+        if parts in directory_rules:
+            return directory_rules[parts]
+        parent = rules_in(parts[:-1])
+        relative = '/'.join((context.prefix, *parts) if context.prefix else parts)
+        rules = None
+        if parent is not None and parts[-1] not in pruned and not ignored(parent, relative, True):
+            directory = root.joinpath(*parts)
+            if not directory.is_symlink():
+                rules = parent + context.local(directory, relative, context.ignore_files)
+        directory_rules[parts] = rules
+        return rules
+
+    selected = []
+    for file_path in paths:
+        # Symlinks are left unresolved, as the walk would see them
+        file_path = Path(os.path.abspath(file_path))
+        try:
+            parts = file_path.relative_to(resolved_root).parts
+        except ValueError:
+            try:
+                parts = file_path.relative_to(os.path.abspath(root)).parts
+            except ValueError:
+                continue
+        if not parts or not wanted(parts[-1]):
+            continue
+        rules = rules_in(parts[:-1])
+        relative = '/'.join((context.prefix, *parts) if context.prefix else parts)
+        candidate = root.joinpath(*parts)
+        if rules is not None and not ignored(rules, relative, False) and candidate.is_file():
+            selected.append(candidate)
+    return sorted(selected)
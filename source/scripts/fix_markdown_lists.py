@@ -4,11 +4,156 @@ Script to fix markdown list formatting by ensuring all lists are preceded by a b
 Supports both .md and .qmd files and processes directories recursively.
 """
 
+import io
+import itertools
 import os
 import re
 import argparse
+import hashlib
 from pathlib import Path
 
+from content_cache import ContentCache, hash_file, read_text_with_digest
+from file_discovery import filter_files, iter_files
+from git_changes import GitError, changed_lines
+from runner import run_files
+from stream_io import STREAM_THRESHOLD, AtomicTextFile, open_hashed_text, write_text
+
+
+# Line kinds assigned by LineClassifier
+LIST_ITEM = 'list item'
+BLANK = 'blank'
+FENCE = 'fence'
+FRONT_MATTER = 'front matter'
+OTHER = 'other'
+
+LIST_ITEM_PATTERN = re.compile(r'\s*(?:[-*+]|\d+\.)\s')
+FENCE_PATTERN = re.compile(r' {0,3}(`{3,}|~{3,})(.*)')
+
+
+class LineClassifier:
+    """
+    One-pass state machine that assigns each line a kind.
+
+    Lines inside fenced code blocks (including the fences) are FENCE and lines
+    of a leading YAML front matter block (including its delimiters) are
+    FRONT_MATTER, so list-like text in code or metadata is never treated as a
+    list item.
+
+    Args:
+        front_matter (bool): Whether the document starts with a closed front
+            matter block (see read_front_matter); otherwise a leading ``---``
+            is an ordinary line
+    """
+
+    def __init__(self, front_matter=False):
+        self.fence = None
+        self.front_matter = False
+        self.first_line = True
+        self.leading_front_matter = front_matter
+
+    def classify(self, text):
+        """
+        Classify the next line of the document.
+
+        Args:
+            text (str): The line without its trailing newline
+
+        Returns:
+            str: One of LIST_ITEM, BLANK, FENCE, FRONT_MATTER or OTHER
+        """
+        if self.first_line:
+            self.first_line = False
+            if self.leading_front_matter and text.rstrip() == '---':
+                self.front_matter = True
+                return FRONT_MATTER
+
+        if self.front_matter:
+            if text.rstrip() in ('---', '...'):
+                self.front_matter = False
+            return FRONT_MATTER
+
+        if self.fence is not None:
+            fence = FENCE_PATTERN.match(text)
+            if (fence and fence.group(1)[0] == self.fence[0] and len(fence.group(1)) >= len(self.fence)
+                    and not fence.group(2).strip()):
+                self.fence = None
+            return FENCE
+
+        if not text.strip():
+            return BLANK
+        if LIST_ITEM_PATTERN.match(text):
+            return LIST_ITEM
+
+        if '```' in text or '~~~' in text:
+            fence = FENCE_PATTERN.match(text)
+            # A backtick fence's info string cannot contain backticks (that is inline code)
+            if fence and not (fence.group(1)[0] == '`' and '`' in fence.group(2)):
+                self.fence = fence.group(1)
+                return FENCE
+        return OTHER
+
+
+def read_front_matter(lines):
+    """
+    Read a leading front matter block, up to and including its closing delimiter.
+
+    Args:
+        lines (iterator): Lines of the document; only the lines returned are
+            consumed
+
+    Returns:
+        tuple: (lines read, closed) where closed is True if the first line
+        opens a front matter block and a ``---`` or ``...`` line closes it.
+        An unclosed block is read to the end of the document.
+    """
+    first = next(lines, None)
+    if first is None:
+        return [], False
+    read = [first]
+    if first.rstrip() != '---':
+        return read, False
+    for line in lines:
+        read.append(line)
+        if line.rstrip() in ('---', '...'):
+            return read, True
+    return read, False
+
+
+def iter_fixed_lines(lines):
+    """
+    Fix markdown list formatting line by line, classifying each line once.
+
+    A blank line is inserted before a list item whose previous line is
+    neither blank nor a list item, unless the line before that is blank.
+    Fenced code blocks and front matter are passed through untouched. A
+    leading ``---`` that is never closed is not front matter, so the lines
+    after it are fixed as usual.
+
+    Args:
+        lines (iterable): Lines of the document, each ending with a newline
+            except possibly the last
+
+    Yields:
+        str: Output lines, with a blank line inserted before each list that
+        needs one
+    """
+    lines = iter(lines)
+    head, front_matter = read_front_matter(lines)
+    classifier = LineClassifier(front_matter)
+    prev_kind = None
+    two_back_kind = None
+
+    for line in itertools.chain(head, lines):
+        kind = classifier.classify(line[:-1] if line.endswith('\n') else line)
+
+        if (kind == LIST_ITEM and prev_kind is not None and prev_kind != BLANK
+                and prev_kind != LIST_ITEM and two_back_kind != BLANK):
+            yield '\n'
+
+        yield line
+        two_back_kind = prev_kind
+        prev_kind = kind
+
 
 def fix_markdown_lists(content):
     """
@@ -20,84 +165,143 @@ def fix_markdown_lists(content):
     Returns:
         str: The fixed content
     """
-    lines = content.split('\n')
-    fixed_lines = []
+    return ''.join(iter_fixed_lines(io.StringIO(content, newline='\n')))
 
-    for i, line in enumerate(lines):
-        # Check if current line is a list item (starts with -, *, +, or number.)
-        is_list_item = re.match(r'^(\s*)[-*+]\s', line) or re.match(r'^(\s*)\d+\.\s', line)
 
-        if is_list_item:
-            # Check if this is not a nested list (no preceding list item)
-            prev_line_idx = i - 1
-            is_nested = False
+def fix_file_streaming(file_path, dry_run=False, batch=None):
+    """
+    Fix a large markdown file line by line through an atomically renamed temp file.
 
-            if prev_line_idx >= 0:
-                prev_line = lines[prev_line_idx]
-                # Check if previous line is also a list item or empty
-                prev_is_list = re.match(r'^(\s*)[-*+]\s', prev_line) or re.match(r'^(\s*)\d+\.\s', prev_line)
-                prev_is_empty = prev_line.strip() == ''
+    Args:
+        file_path (Path): Path to the file to process
+        dry_run (bool): Check the file without writing it
+        batch (WriteBatch): Batch to defer the write's fsync to
 
-                if prev_is_list:
-                    is_nested = True
-                elif not prev_is_empty and prev_line_idx > 0:
-                    # Check if there's already a blank line before
-                    two_lines_back = lines[prev_line_idx - 1] if prev_line_idx > 0 else ''
-                    if two_lines_back.strip() == '':
-                        is_nested = True
+    Returns:
+        tuple: (modified, digest) where digest is the content hash of the file
+    """
+    source, reader = open_hashed_text(file_path)
+    output = None if dry_run else AtomicTextFile(file_path, batch)
+    line_count = 0
+    output_count = 0
 
-            # If it's not nested and previous line is not empty, add blank line
-            if not is_nested and i > 0 and lines[i-1].strip() != '':
-                fixed_lines.append('')
+    def counted(lines):
+        nonlocal line_count
+        for line in lines:
+            line_count += 1
+            yield line
 
-        fixed_lines.append(line)
+    try:
+        with source:
+            for line in iter_fixed_lines(counted(source)):
+                output_count += 1
+                if output is not None:
+                    output.write(line)
+    except BaseException:
+        if output is not None:
+            output.discard()
+        raise
+
+    # Every inserted blank line adds one output line
+    modified = output_count != line_count
+    if output is not None:
+        if modified:
+            output.commit()
+        else:
+            output.discard()
 
-    return '\n'.join(fixed_lines)
+    return modified, reader.hexdigest()
 
 
-def process_file(file_path):
+def fix_file(file_path, dry_run=False, clean_digest=None, stream=False, batch=None):
     """
-    Process a single markdown file.
+    Fix a single markdown file and describe the outcome.
 
     Args:
         file_path (Path): Path to the file to process
+        dry_run (bool): Report the fix without writing the file
+        clean_digest (str): Content hash of a known-clean version of the file;
+            matching files are skipped without being fixed again
+        stream (bool): Stream the file line by line even if it is small
+        batch (WriteBatch): Batch to defer the write's fsync to; without one
+            the write is synced at once
 
     Returns:
-        bool: True if file was modified, False otherwise
+        tuple: (modified, message, digest) where modified is True if the file
+        was (or would be) modified and digest is the content hash if the file
+        needs no fixes, or None otherwise
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            original_content = f.read()
+        if file_path.stat().st_size > STREAM_THRESHOLD or stream:
+            if clean_digest is not None and hash_file(file_path) == clean_digest:
+                return False, f"No changes needed: {file_path}", clean_digest
+            modified, digest = fix_file_streaming(file_path, dry_run, batch)
+            if modified:
+                return True, f"{'Would fix' if dry_run else 'Fixed'}: {file_path}", None
+            return False, f"No changes needed: {file_path}", digest
+
+        original_content, digest = read_text_with_digest(file_path)
+        if digest == clean_digest:
+            return False, f"No changes needed: {file_path}", digest
 
         fixed_content = fix_markdown_lists(original_content)
 
         if original_content != fixed_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(fixed_content)
-            print(f"Fixed: {file_path}")
-            return True
+            if dry_run:
+                return True, f"Would fix: {file_path}", None
+            write_text(file_path, fixed_content, digest, batch)
+            return True, f"Fixed: {file_path}", None
         else:
-            print(f"No changes needed: {file_path}")
-            return False
+            return False, f"No changes needed: {file_path}", digest
 
     except Exception as e:
-        print(f"Error processing {file_path}: {e}")
-        return False
+        return False, f"Error processing {file_path}: {e}", None
 
 
-def find_markdown_files(directory):
+def process_file(file_path):
     """
-    Recursively find all markdown files in a directory.
+    Process a single markdown file.
+
+    Args:
+        file_path (Path): Path to the file to process
+
+    Returns:
+        bool: True if file was modified, False otherwise
+    """
+    modified, message, _ = fix_file(file_path)
+    print(message)
+    return modified
+
+
+def ruleset_fingerprint():
+    """
+    Fingerprint the fixer for cache invalidation.
+
+    Returns:
+        str: Hash of this script, so any change to the rules invalidates the cache
+    """
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def find_markdown_files(directory, exclude=(), changed=None):
+    """
+    Recursively find all markdown files in a directory, in sorted path order.
+
+    Build output, version control and ignored paths are skipped
+    (see file_discovery.py).
 
     Args:
         directory (Path): Directory to search
+        exclude (list): Extra gitignore-style patterns for paths to skip
+        changed (iterable): If given, only these paths are considered and the
+            tree is not walked
 
     Yields:
         Path: Markdown file paths
     """
-    for file_path in directory.rglob('*'):
-        if file_path.is_file() and file_path.suffix.lower() in ['.md', '.qmd']:
-            yield file_path
+    if changed is not None:
+        return iter(filter_files(directory, changed, ['.md', '.qmd'], ignore_case=True, exclude=exclude))
+    return iter_files(directory, ['.md', '.qmd'], ignore_case=True, exclude=exclude)
 
 
 def main():
@@ -115,6 +319,36 @@ def main():
         action='store_true',
         help='Show what would be changed without making modifications'
     )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Number of files to process in parallel (default: CPU count)'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Process files line by line regardless of size to keep memory use flat'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Re-check every file instead of skipping files known to be clean'
+    )
+    parser.add_argument(
+        '--exclude',
+        action='append',
+        default=[],
+        metavar='PATTERN',
+        help='Skip paths matching this gitignore-style pattern (repeatable; prefix with ! to include a path again)'
+    )
+    parser.add_argument(
+        '--changed',
+        nargs='?',
+        const='',
+        metavar='REF',
+        help='Only process files git reports as modified, staged or untracked, or that differ from the merge base with REF'
+    )
 
     args = parser.parse_args()
 
@@ -124,16 +358,24 @@ def main():
         print(f"Error: Path '{path}' does not exist")
         return 1
 
+    changed = None
+    if args.changed is not None:
+        try:
+            changed = changed_lines(path if path.is_dir() else path.parent, args.changed or None)
+        except GitError as e:
+            print(f"Error: {e}")
+            return 1
+
     files_to_process = []
 
     if path.is_file():
-        if path.suffix.lower() in ['.md', '.qmd']:
-            files_to_process = [path]
-        else:
+        if path.suffix.lower() not in ['.md', '.qmd']:
             print(f"Error: '{path}' is not a markdown file (.md or .qmd)")
             return 1
+        if changed is None or path in changed:
+            files_to_process = [path]
     else:
-        files_to_process = list(find_markdown_files(path))
+        files_to_process = list(find_markdown_files(path, args.exclude, changed))
 
     if not files_to_process:
         print("No markdown files found")
@@ -146,22 +388,26 @@ def main():
 
     modified_count = 0
 
+    # Cache clean files per directory tree; single files are always checked
+    cache = None
+    if path.is_dir() and not args.no_cache:
+        cache = ContentCache(path, 'fix_markdown_lists', ruleset_fingerprint())
+    entries = []
     for file_path in files_to_process:
-        if args.dry_run:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    original_content = f.read()
-                fixed_content = fix_markdown_lists(original_content)
-                if original_content != fixed_content:
-                    print(f"Would fix: {file_path}")
-                    modified_count += 1
-                else:
-                    print(f"No changes needed: {file_path}")
-            except Exception as e:
-                print(f"Error reading {file_path}: {e}")
-        else:
-            if process_file(file_path):
-                modified_count += 1
+        relative_path = str(file_path.relative_to(path)) if cache else str(file_path)
+        clean_digest = cache.clean_digest(relative_path) if cache else None
+        entries.append((relative_path, file_path, args.dry_run, clean_digest, args.stream))
+
+    def report(relative_path, result):
+        nonlocal modified_count
+        modified, message, _ = result
+        print(message)
+        if modified:
+            modified_count += 1
+        return False
+
+    run_files(entries, fix_file, report, max(1, args.jobs), (fix_file, None, ()), cache,
+              partial=changed is not None, save=not args.dry_run)
 
     if args.dry_run:
         print(f"\nDry run complete. {modified_count} file(s) would be modified")
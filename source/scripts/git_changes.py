@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Changed-file detection for pre-commit and CI runs.
+Asks git which files under a directory differ from a reference commit
+(staged, unstaged and untracked changes included) and which lines of each
+were added or modified, so checks can skip everything a change left alone.
+"""
+
+import re
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 1-based, inclusive (first, last) line numbers in the working tree file
+LineRanges = List[Tuple[int, int]]
+
+# Hash of the empty tree, which a repository without commits is compared against
+EMPTY_TREE = '4b825dc642cb6eb9a060e54bf8d69288fbee4904'
+
+HUNK_HEADER = re.compile(rb'@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+_QUOTED_ESCAPES = {b'a': b'\a', b'b': b'\b', b'f': b'\f', b'n': b'\n', b'r': b'\r', b't': b'\t',
+                   b'v': b'\v', b'"': b'"', b'\\': b'\\'}
+
+
+class GitError(RuntimeError):
+    """Raised when git is missing, the path is not in a work tree or a reference is unknown."""
+
+
+def _git(cwd: Path, *args: str) -> bytes:
+    try:
+        result = subprocess.run(['git', '-c', 'core.quotePath=false', *args], cwd=cwd,
+                                capture_output=True, check=False)
+    except OSError as e:
+        raise GitError(f"could not run git: {e}") from e
+    if result.returncode != 0:
+        message = result.stderr.decode('utf-8', 'replace').strip()
+        raise GitError(message or f"git {args[0]} failed with status {result.returncode}")
+    return result.stdout
+
+
+def _unquote(name: bytes) -> bytes:
+    """Undo the C-style quoting git applies to names with unusual characters."""
+    if not (name.startswith(b'"') and name.endswith(b'"')):
+        return name
+    body = name[1:-1]
+    out = bytearray()
+    i = 0
+    while i < len(body):
+        if body[i:i + 1] == b'\\' and i + 1 < len(body):
+            if body[i + 1:i + 4].isdigit():
+                out.append(int(body[i + 1:i + 4], 8))
+                i += 4
+                continue
+            out += _QUOTED_ESCAPES.get(body[i + 1:i + 2], body[i + 1:i + 2])
+            i += 2
+            continue
+        out += body[i:i + 1]
+        i += 1
+    return bytes(out)
+
+
+def _decode(name: bytes) -> str:
+    return name.decode('utf-8', 'surrogateescape')
+
+
+def _base(root: Path, ref: Optional[str]) -> str:
+    """The commit to diff against: ref's merge base with HEAD, or HEAD itself."""
+    _git(root, 'rev-parse', '--show-toplevel')
+    try:
+        head = _git(root, 'rev-parse', '--verify', '--quiet', 'HEAD').strip()
+    except GitError:
+        head = b''
+    if ref is None:
+        return _decode(head) if head else EMPTY_TREE
+    try:
+        commit = _decode(_git(root, 'rev-parse', '--verify', '--quiet', f'{ref}^{{commit}}').strip())
+    except GitError:
+        raise GitError(f"unknown revision {ref!r}") from None
+    if not head:
+        return commit
+    try:
+        # Compare with where the branch left ref, like `git diff ref...`
+        return _decode(_git(root, 'merge-base', commit, 'HEAD').strip())
+    except GitError:
+        return commit
+
+
+def _parse_diff(diff: bytes) -> Iterator[Tuple[str, LineRanges]]:
+    """Yield (path, added line ranges) for each file in a zero-context diff."""
+    lines = iter(diff.split(b'\n'))
+    path = None
+    ranges: LineRanges = []
+    for line in lines:
+        if line.startswith(b'+++ '):
+            if path is not None:
+                yield path, ranges
+            name = line[4:]
+            # git ends a header name that contains a space with a tab
+            if name.endswith(b'\t'):
+                name = name[:-1]
+            path = _decode(_unquote(name))
+            ranges = []
+        elif line.startswith(b'@@ ') and path is not None:
+            header = HUNK_HEADER.match(line)
+            if header is None:
+                continue
+            removed = int(header.group(1) or 1)
+            start, added = int(header.group(2)), int(header.group(3) or 1)
+            if added:
+                ranges.append((start, start + added - 1))
+            # Skip the hunk body so content lines are never taken for headers
+            remaining = removed + added
+            while remaining:
+                body = next(lines, None)
+                if body is None:
+                    break
+                if not body.startswith(b'\\'):
+                    remaining -= 1
+    if path is not None:
+        yield path, ranges
+
+
+def changed_lines(root: Path, ref: Optional[str] = None) -> Dict[Path, Optional[LineRanges]]:
+    """Map each file under root that differs from ref to its changed line ranges.
+
+    Without ``ref`` files are compared with HEAD, so staged and unstaged
+    edits both count; with one they are compared with the merge base of
+    ref and HEAD. Untracked files that are not ignored map to None, since
+    every line is new. Deleted files and files whose changes only removed
+    lines are left out. Keys are root joined with each file's path.
+
+    Raises:
+        GitError: If git cannot be run, root is not in a work tree or ref is unknown
+    """
+    root = Path(root)
+    diff = _git(root, 'diff', '--no-ext-diff', '--no-textconv', '--no-color', '--unified=0',
+                '--no-prefix', '--relative', '--diff-filter=d', _base(root, ref), '--', '.')
+    changed: Dict[Path, Optional[LineRanges]] = {}
+    for name, ranges in _parse_diff(diff):
+        if ranges:
+            changed[root / name] = ranges
+
+    untracked = _git(root, 'ls-files', '-z', '--others', '--exclude-standard', '--', '.')
+    for name in filter(None, untracked.split(b'\0')):
+        changed[root / _decode(name)] = None
+    return changed
+
+
+def line_regions(text: str, ranges: LineRanges) -> List[Tuple[int, int]]:
+    """Convert line ranges to ascending (start, end) text offsets, each ending before its newline."""
+    regions = []
+    line = 1
+    offset = 0
+    for first, last in sorted(ranges):
+        first = max(first, line)
+        if first > last:
+            continue
+        while line < first and offset != -1:
+            offset = text.find('\n', offset) + 1 or -1
+            line += 1
+        if offset == -1:
+            break
+        start = offset
+        while line <= last and offset != -1:
+            end = text.find('\n', offset)
+            offset = end + 1 if end != -1 else -1
+            line += 1
+        end = len(text) if offset == -1 else offset - 1
+        if regions and regions[-1][1] >= start - 1:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+    return regions
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Document pipeline for the pre-render text fixes.
+Discovers files once, reads each file once, runs a chain of stages (list
+fixing, spelling conversion) over a shared in-memory document and writes
+each file at most once, only if its content changed.
+"""
+
+import hashlib
+import io
+import os
+import sys
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from content_cache import ContentCache, read_text_with_digest
+from file_discovery import iter_files
+import fix_markdown_lists
+from runner import run_files
+from spelling_converter import ProtectedSpans, SpellingConverter, apply_edits
+from stream_io import WriteBatch, write_text
+
+
+class Document:
+    """A file's text as it moves through the pipeline.
+
+    Protected spans are indexed by the first stage that needs them and are
+    shifted along with every edit, so later stages reuse the same index.
+    """
+
+    def __init__(self, path: Path, text: str, digest: Optional[str] = None):
+        self.path = path
+        self.original = text
+        self.text = text
+        self.digest = digest
+        self.spans: Optional[ProtectedSpans] = None
+        self.changes: Dict[str, List[str]] = {}
+
+    @property
+    def changed(self) -> bool:
+        return self.text != self.original
+
+    def protected_spans(self, converter: SpellingConverter) -> ProtectedSpans:
+        """Return the protected regions of the current text, indexing them on first use."""
+        if self.spans is None:
+            self.spans = converter.protected_spans(self.text)
+        return self.spans
+
+    def apply(self, edits: List[Tuple[int, int, str]]) -> None:
+        """Apply ascending, non-overlapping (start, end, replacement) edits to the text."""
+        if not edits:
+            return
+        self.text = apply_edits(self.text, edits)
+        if self.spans is not None:
+            self.spans.shift([(start, end, len(replacement)) for start, end, replacement in edits])
+
+
+class Stage(ABC):
+    """One transformation in the pipeline."""
+
+    name = 'stage'
+    extensions: Set[str] = set()
+
+    def applies_to(self, path: Path) -> bool:
+        return path.suffix.lower() in self.extensions
+
+    @abstractmethod
+    def fingerprint(self) -> str:
+        """Identify the stage's rules for cache invalidation."""
+
+    @abstractmethod
+    def run(self, document: Document) -> None:
+        """Transform the document, recording any changes under the stage name."""
+
+
+class ListFixStage(Stage):
+    """Insert the blank lines markdown lists need (see fix_markdown_lists.py)."""
+
+    name = 'lists'
+    extensions = {'.md', '.qmd'}
+
+    def fingerprint(self) -> str:
+        return fix_markdown_lists.ruleset_fingerprint()
+
+    def run(self, document: Document) -> None:
+        edits = []
+        changes = []
+        offset = 0
+        lines = fix_markdown_lists.iter_fixed_lines(io.StringIO(document.text, newline='\n'))
+        for line_number, line in enumerate(lines, 1):
+            # Inserted blank lines come before a list item, never before a blank line
+            if line == '\n' and document.text[offset:offset + 1] != '\n':
+                edits.append((offset, offset, '\n'))
+                changes.append(f"blank line before line {line_number - len(edits) + 1}")
+            else:
+                offset += len(line)
+        document.apply(edits)
+        if changes:
+            document.changes[self.name] = changes
+
+
+class SpellingStage(Stage):
+    """Convert American spelling with a configured SpellingConverter."""
+
+    name = 'spelling'
+
+    def __init__(self, converter: SpellingConverter):
+        self.converter = converter
+        self.extensions = converter.target_extensions
+
+    def applies_to(self, path: Path) -> bool:
+        # Match the converter's own case-sensitive extension check
+        return path.suffix in self.extensions
+
+    def fingerprint(self) -> str:
+        return self.converter.ruleset_fingerprint()
+
+    def run(self, document: Document) -> None:
+        edits, records = self.converter.find_edits(document.text,
+                                                   document.protected_spans(self.converter))
+        document.apply(edits)
+        if records:
+            records.sort(key=lambda record: record[:2])
+            document.changes[self.name] = [f"{original} → {replacement}"
+                                           for _, _, original, replacement in records]
+
+
+# Stage names accepted by --stages, in their default order
+STAGE_NAMES = ['lists', 'spelling']
+
+
+def build_stages(names: List[str], mode: str = 'hybrid', custom_mappings: Optional[Dict[str, str]] = None,
+                 engine: str = 'regex') -> List[Stage]:
+    """Create the named stages in the given order."""
+    stages = []
+    for name in names:
+        if name == 'lists':
+            stages.append(ListFixStage())
+        elif name == 'spelling':
+            converter = SpellingConverter(mode=mode)
+            converter.custom_mappings.update(custom_mappings or {})
+            converter.engine = engine
+            stages.append(SpellingStage(converter))
+        else:
+            raise ValueError(f"Unknown stage: {name} (choose from {', '.join(STAGE_NAMES)})")
+    return stages
+
+
+def load_custom_mappings(wordlist_path: Path, mode: str = 'hybrid') -> Dict[str, str]:
+    """Load a word list for the spelling stage, warning about rules that conflict."""
+    loader = SpellingConverter(mode=mode)
+    loader.load_word_list(wordlist_path)
+    print(f"Loaded {len(loader.custom_mappings)} custom word mappings")
+    for conflict in loader.get_rule_table().conflicts:
+        print(f"Warning: {conflict}")
+    return loader.custom_mappings
+
+
+class Pipeline:
+    """Ordered chain of stages applied to each file in a single read and write."""
+
+    def __init__(self, stages: List[Stage], exclude_patterns: Optional[List[str]] = None):
+        self.stages = stages
+        self.exclude_patterns = exclude_patterns or []
+
+    def accepts(self, path: Path) -> bool:
+        return any(stage.applies_to(path) for stage in self.stages)
+
+    def find_files(self, directory: Path) -> Iterator[Path]:
+        """Yield the files some stage applies to under directory, lazily and in sorted path order."""
+        suffixes = set().union(*(stage.extensions for stage in self.stages))
+        return (file_path for file_path in iter_files(directory, suffixes, ignore_case=True,
+                                                      exclude=self.exclude_patterns)
+                if self.accepts(file_path))
+
+    def _discover(self, directory: Path, cache: Optional[ContentCache], files: Optional[Iterable[Path]] = None
+                  ) -> Iterator[Tuple[Path, str, Optional[str]]]:
+        """Yield (path, relative path, clean digest) for each file to process under directory.
+
+        With ``files`` only those that some stage applies to are considered,
+        in the given order, instead of walking the tree.
+        """
+        if files is None:
+            files = self.find_files(directory)
+        else:
+            files = (file_path for file_path in files if self.accepts(file_path))
+        for file_path in files:
+            relative_path = str(file_path.relative_to(directory))
+            yield file_path, relative_path, cache.clean_digest(relative_path) if cache else None
+
+    def fingerprint(self) -> str:
+        """Combined fingerprint of every stage, in order."""
+        digest = hashlib.sha256()
+        for stage in self.stages:
+            digest.update(f'{stage.name}:{stage.fingerprint()}\n'.encode('utf-8'))
+        return digest.hexdigest()
+
+    def run(self, document: Document) -> Document:
+        """Run every applicable stage over the document."""
+        for stage in self.stages:
+            if stage.applies_to(document.path):
+                stage.run(document)
+        return document
+
+    def process_file(self, file_path: Path, dry_run: bool = False, clean_digest: Optional[str] = None,
+                     batch: Optional[WriteBatch] = None) -> Tuple[bool, Dict[str, List[str]], Optional[str]]:
+        """Read, transform and (unless dry_run) write one file.
+
+        A written file joins ``batch``, if given, and is synced when it flushes.
+        Returns (changed, changes by stage, digest) where digest is the content
+        hash if the file needs no changes, or None otherwise.
+        """
+        try:
+            text, digest = read_text_with_digest(file_path)
+            if digest == clean_digest:
+                return False, {}, digest
+
+            document = self.run(Document(file_path, text, digest))
+            if not document.changed:
+                return False, {}, digest
+
+            if not dry_run:
+                write_text(file_path, document.text, digest, batch)
+            return True, document.changes, None
+
+        except Exception as e:
+            print(f"Error processing {file_path}: {e}")
+            return False, {}, None
+
+    def process_directory(self, directory: Path, dry_run: bool = False, jobs: int = 1,
+                          use_cache: bool = False, worker_args: Optional[tuple] = None,
+                          files: Optional[Iterable[Path]] = None) -> Dict[str, Dict[str, List[str]]]:
+        """Process every file under directory that some stage applies to.
+
+        ``worker_args`` are the build_stages arguments used to rebuild the
+        pipeline in each worker process when ``jobs`` is above 1. With
+        ``files`` only those files under directory are processed.
+        """
+        cache = ContentCache(directory, 'pipeline', self.fingerprint()) if use_cache else None
+        entries = ((relative_path, file_path, dry_run, clean_digest)
+                   for file_path, relative_path, clean_digest in self._discover(directory, cache, files))
+        worker = (_process_in_worker, _init_worker, worker_args) if worker_args is not None else None
+        all_changes = {}
+
+        def report(relative_path, result):
+            changed, changes, _ = result
+            if changed:
+                all_changes[relative_path] = changes
+                summary = ', '.join(f"{name}: {len(stage_changes)}" for name, stage_changes in changes.items())
+                print(f"{'Would update' if dry_run else '✓ Updated'}: {relative_path} ({summary})")
+            return False
+
+        run_files(entries, self.process_file, report, jobs, worker, cache,
+                  partial=files is not None, save=not dry_run)
+        return all_changes
+
+# Pipeline owned by each process pool worker, built once from the parent's configuration
+_worker_pipeline = None
+
+def _init_worker(names: List[str], mode: str, custom_mappings: Dict[str, str], engine: str) -> None:
+    """Build the worker's pipeline once when the pool starts."""
+    global _worker_pipeline
+    _worker_pipeline = Pipeline(build_stages(names, mode, custom_mappings, engine))
+
+def _process_in_worker(file_path: Path, dry_run: bool,
+                       clean_digest: Optional[str]) -> Tuple[bool, Dict[str, List[str]], Optional[str]]:
+    """Process one file with the worker's pipeline."""
+    return _worker_pipeline.process_file(file_path, dry_run, clean_digest)
+
+def main():
+    """Run the configured stages over a file or directory."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run the pre-render text fixes over each file in one pass')
+    parser.add_argument('path', help='Directory or file path to process')
+    parser.add_argument('--stages', default=','.join(STAGE_NAMES),
+                       help=f"Comma-separated stages to run, in order (default: {','.join(STAGE_NAMES)})")
+    parser.add_argument('--mode', choices=['safe', 'regex', 'hybrid'], default='hybrid',
+                       help='Spelling conversion mode (see spelling_converter.py)')
+    parser.add_argument('--wordlist', '-w', type=str,
+                       help='Custom word list file for the spelling stage')
+    parser.add_argument('--engine', choices=['regex', 'lookup'], default='regex',
+                       help='Spelling rule engine (see spelling_converter.py)')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='Show what would be changed without making modifications')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                       help='Number of files to process in parallel (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Re-check every file instead of skipping files known to be clean')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                       help='Skip paths matching this gitignore-style pattern (repeatable; '
+                            'prefix with ! to include a path again)')
+
+    args = parser.parse_args()
+    path = Path(args.path)
+
+    if not path.exists():
+        print(f"Error: {path} does not exist")
+        sys.exit(1)
+
+    names = [name.strip() for name in args.stages.split(',') if name.strip()]
+    custom_mappings = load_custom_mappings(Path(args.wordlist), args.mode) if args.wordlist else {}
+
+    try:
+        stages = build_stages(names, args.mode, custom_mappings, args.engine)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    pipeline = Pipeline(stages, args.exclude)
+
+    print(f"{'DRY RUN - ' if args.dry_run else ''}Running stages: {', '.join(names)} on {path}")
+    print("=" * 60)
+
+    if path.is_file():
+        changed, changes, _ = pipeline.process_file(path, args.dry_run)
+        if not changed:
+            print("No changes needed.")
+        for name, stage_changes in changes.items():
+            print(f"{name}: {len(stage_changes)} changes")
+            for change in stage_changes:
+                print(f"  • {change}")
+    else:
+        all_changes = pipeline.process_directory(path, args.dry_run, jobs=max(1, args.jobs),
+                                                 use_cache=not args.no_cache,
+                                                 worker_args=(names, args.mode, custom_mappings, args.engine))
+        print("=" * 60)
+        verb = 'would be modified' if args.dry_run else 'modified'
+        print(f"{len(all_changes)} file(s) {verb}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Quarto pre-render hook for the text fixes.
+Reads the documents Quarto is about to render from QUARTO_PROJECT_INPUT_FILES
+and runs the pipeline stages (list fixing, spelling conversion) over just
+those files in this one interpreter, so rendering a single document only
+pays for that document.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import List, Mapping, Optional
+
+from pipeline import STAGE_NAMES, Pipeline, build_stages, load_custom_mappings
+
+
+def project_inputs(project_dir: Path, environ: Mapping[str, str] = os.environ) -> Optional[List[Path]]:
+    """Return the files Quarto is rendering, or None if Quarto did not list any.
+
+    QUARTO_PROJECT_INPUT_FILES holds one path per line, relative to the
+    project directory. Paths are normalised first, and those that end up
+    outside project_dir are dropped.
+    """
+    listed = environ.get('QUARTO_PROJECT_INPUT_FILES')
+    if listed is None:
+        return None
+
+    project_dir = project_dir.resolve()
+    inputs = []
+    for line in listed.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        file_path = Path(os.path.normpath(project_dir / line))
+        try:
+            file_path.relative_to(project_dir)
+        except ValueError:
+            continue
+        inputs.append(file_path)
+    return inputs
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Quarto pre-render hook: run the text fixes over the files being rendered')
+    parser.add_argument('--project-dir', default=os.environ.get('QUARTO_PROJECT_DIR', '.'),
+                        help='Quarto project directory (default: $QUARTO_PROJECT_DIR or the current directory)')
+    parser.add_argument('--stages', default=','.join(STAGE_NAMES),
+                        help=f"Comma-separated stages to run, in order (default: {','.join(STAGE_NAMES)})")
+    parser.add_argument('--mode', choices=['safe', 'regex', 'hybrid'], default='hybrid',
+                        help='Spelling conversion mode (see spelling_converter.py)')
+    parser.add_argument('--wordlist', '-w', type=str,
+                        help='Custom word list file for the spelling stage (a compiled .spwl loads fastest)')
+    parser.add_argument('--engine', choices=['regex', 'lookup'], default='regex',
+                        help='Spelling rule engine (see spelling_converter.py)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Show what would be changed without making modifications')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Number of files to process in parallel (default: 1, in this process)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Re-check every file instead of skipping files known to be clean')
+
+    args = parser.parse_args(argv)
+    project_dir = Path(args.project_dir).resolve()
+    if not project_dir.is_dir():
+        print(f"Error: {project_dir} is not a directory")
+        return 1
+
+    # Run by hand, there is no input list, so the whole project is processed
+    inputs = project_inputs(project_dir)
+
+    names = [name.strip() for name in args.stages.split(',') if name.strip()]
+    try:
+        custom_mappings = load_custom_mappings(Path(args.wordlist), args.mode) if args.wordlist else {}
+        stages = build_stages(names, args.mode, custom_mappings, args.engine)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    pipeline = Pipeline(stages)
+
+    all_changes = pipeline.process_directory(project_dir, args.dry_run, jobs=max(1, args.jobs),
+                                             use_cache=not args.no_cache,
+                                             worker_args=(names, args.mode, custom_mappings, args.engine),
+                                             files=inputs)
+    if all_changes:
+        verb = 'would be modified' if args.dry_run else 'modified'
+        print(f"Pre-render: {len(all_changes)} file(s) {verb}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Linear-time scanners for the spelling converter's protected contexts.
+Finds every built-in preserve context with a scanner that cannot backtrack
+quadratically, yielding the same spans as the context's regex.
+"""
+
+import re
+from typing import Callable, Dict, Iterable, Iterator, Tuple
+
+# Flags the preserve contexts are compiled with
+FLAGS = re.MULTILINE | re.DOTALL
+
+Scanner = Callable[[str], Iterable[Tuple[int, int]]]
+
+
+def regex_scanner(pattern: str) -> Scanner:
+    """Scan with the regex itself, for patterns whose failed attempts stay local."""
+    regex = re.compile(pattern, FLAGS)
+    return lambda text: (match.span() for match in regex.finditer(text))
+
+
+def closed_scanner(pattern: str, closer: str) -> Scanner:
+    """Scan for a pattern that must end with ``closer``, stopping at the last one.
+
+    An opener with no closer after it makes the regex rescan to the end of
+    the text, once per opener; no match can end after the last closer, so
+    searching only up to it leaves every failed attempt local.
+    """
+    regex = re.compile(pattern, FLAGS)
+
+    def scan(text: str) -> Iterator[Tuple[int, int]]:
+        end = text.rfind(closer) + 1
+        if end:
+            for match in regex.finditer(text, 0, end):
+                yield match.span()
+
+    return scan
+
+
+def css_variable_scanner(word: str) -> Scanner:
+    """Scan for ``--[a-zA-Z-]*word[a-zA-Z-]*`` (a CSS custom property naming ``word``).
+
+    Every ``--`` inside a long run of dashes or letters would otherwise
+    rescan the rest of the run, so a failed run is skipped as a whole.
+    """
+    run = re.compile(r'[a-zA-Z-]*')
+
+    def scan(text: str) -> Iterator[Tuple[int, int]]:
+        pos = 0
+        while True:
+            start = text.find('--', pos)
+            if start == -1:
+                return
+            end = run.match(text, start + 2).end()
+            if text.find(word, start + 2, end) != -1:
+                yield start, end
+            # Any later start inside the run sees a subset of it, so it fails too
+            pos = end
+
+    return scan
+
+
+_DASH_LINE = re.compile(r'^---', re.MULTILINE)
+_SPACE = re.compile(r'\s*')
+
+
+def front_matter_scanner(text: str) -> Iterator[Tuple[int, int]]:
+    """Scan for ``^---\\s*$.*?^---\\s*$`` by pairing delimiter lines in order.
+
+    A delimiter is ``---`` at a line start followed by whitespace reaching a
+    line end; like the regex, it extends over trailing blank lines.
+    """
+    opener = None
+    for match in _DASH_LINE.finditer(text):
+        after = match.end()
+        space_end = _SPACE.match(text, after).end()
+        if space_end == len(text):
+            line_end = space_end
+        else:
+            line_end = text.rfind('\n', after, space_end)
+            if line_end == -1:
+                continue
+        if opener is None:
+            opener = match.start()
+        else:
+            yield opener, line_end
+            opener = None
+
+
+# Scanner for each built-in preserve context of SpellingConverter
+SCANNERS: Dict[str, Scanner] = {
+    r'color\s*:\s*[^;]+;': closed_scanner(r'color\s*:\s*[^;]+;', ';'),
+    r'background-color\s*:\s*[^;]+;': closed_scanner(r'background-color\s*:\s*[^;]+;', ';'),
+    r'border-color\s*:\s*[^;]+;': closed_scanner(r'border-color\s*:\s*[^;]+;', ';'),
+    r'text-align\s*:\s*center\s*;': regex_scanner(r'text-align\s*:\s*center\s*;'),
+    r'align-items\s*:\s*center\s*;': regex_scanner(r'align-items\s*:\s*center\s*;'),
+    r'justify-content\s*:\s*center\s*;': regex_scanner(r'justify-content\s*:\s*center\s*;'),
+    r'--[a-zA-Z-]*color[a-zA-Z-]*': css_variable_scanner('color'),
+    r'--[a-zA-Z-]*center[a-zA-Z-]*': css_variable_scanner('center'),
+    r'class\s*=\s*["\'][^"\']*["\']': regex_scanner(r'class\s*=\s*["\'][^"\']*["\']'),
+    r'id\s*=\s*["\'][^"\']*["\']': regex_scanner(r'id\s*=\s*["\'][^"\']*["\']'),
+    r'style\s*=\s*["\'][^"\']*["\']': regex_scanner(r'style\s*=\s*["\'][^"\']*["\']'),
+    r'https?://[^\s<>"]+': regex_scanner(r'https?://[^\s<>"]+'),
+    r'href\s*=\s*["\'][^"\']*["\']': regex_scanner(r'href\s*=\s*["\'][^"\']*["\']'),
+    r'src\s*=\s*["\'][^"\']*["\']': regex_scanner(r'src\s*=\s*["\'][^"\']*["\']'),
+    r'```[^`]*```': closed_scanner(r'```[^`]*```', '`'),
+    r'`[^`]+`': closed_scanner(r'`[^`]+`', '`'),
+    r'^---\s*$.*?^---\s*$': front_matter_scanner,
+    r'<[^>]+>': closed_scanner(r'<[^>]+>', '>'),
+    r'\{[^}]*\}': closed_scanner(r'\{[^}]*\}', '}'),
+    r'\[[^\]]*\]': closed_scanner(r'\[[^\]]*\]', ']'),
+    r'\.[a-zA-Z0-9]+$': regex_scanner(r'\.[a-zA-Z0-9]+$'),
+    r'[A-Z][a-zA-Z]*[A-Z][a-zA-Z]*': regex_scanner(r'[A-Z][a-zA-Z]*[A-Z][a-zA-Z]*'),
+}
+
+
+def scanner_for(pattern: str) -> Scanner:
+    """Return the scanner for a preserve pattern, using the regex itself for unknown ones."""
+    return SCANNERS.get(pattern) or regex_scanner(pattern)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Hot-path profiling for the spelling converter.
+Collects per-rule, per-preserve-pattern and per-file statistics and writes
+them as a sorted table or as JSON that also loads in Chrome's trace viewer.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List
+
+
+class RuleStats:
+    """Counters for one rule or preserve pattern."""
+
+    __slots__ = ('kind', 'source', 'pattern', 'matches', 'rejections', 'seconds')
+
+    def __init__(self, kind: str, source: str, pattern: str):
+        self.kind = kind
+        self.source = source
+        self.pattern = pattern
+        self.matches = 0
+        self.rejections = 0
+        self.seconds = 0.0
+
+    def to_dict(self) -> Dict[str, object]:
+        return {'kind': self.kind, 'source': self.source, 'pattern': self.pattern,
+                'matches': self.matches, 'rejections': self.rejections,
+                'seconds': round(self.seconds, 6)}
+
+
+class ConversionProfile:
+    """Accumulates timings for a conversion run.
+
+    Rules are timed by scanning each one on its own over every document, so
+    the cost of a pattern can be judged independently of the combined matcher.
+    """
+
+    def __init__(self):
+        self.stats: Dict[tuple, RuleStats] = {}
+        self.files: List[Dict[str, object]] = []
+        self.events: List[Dict[str, object]] = []
+        self.origin = time.perf_counter()
+
+    def _stats(self, kind: str, source: str, pattern: str) -> RuleStats:
+        key = (kind, source, pattern)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = RuleStats(kind, source, pattern)
+        return stats
+
+    def _event(self, name: str, category: str, start: float, seconds: float) -> None:
+        self.events.append({'name': name, 'cat': category, 'ph': 'X', 'pid': os.getpid(), 'tid': 0,
+                            'ts': round((start - self.origin) * 1e6, 3),
+                            'dur': round(seconds * 1e6, 3)})
+
+    def record_preserve(self, pattern: str, start: float, seconds: float, matches: int) -> None:
+        """Record one scan of a preserve-context pattern."""
+        stats = self._stats('preserve', 'preserve_contexts', pattern)
+        stats.matches += matches
+        stats.seconds += seconds
+        self._event(pattern, 'preserve', start, seconds)
+
+    def record_scan(self, source: str, pattern: str, start: float, seconds: float) -> None:
+        """Record a standalone scan of one rule over a document."""
+        stats = self._stats('rule', source, pattern)
+        stats.seconds += seconds
+        self._event(pattern, f'rule:{source}', start, seconds)
+
+    def record_match(self, source: str, pattern: str, rejected: bool) -> None:
+        """Count a candidate dispatched to a rule by the combined matcher."""
+        stats = self._stats('rule', source, pattern)
+        stats.matches += 1
+        if rejected:
+            stats.rejections += 1
+
+    def record_file(self, file_path: Path, start: float, seconds: float, size: int) -> None:
+        """Record the wall time spent converting one file."""
+        self.files.append({'path': str(file_path), 'bytes': size, 'seconds': round(seconds, 6)})
+        self._event(str(file_path), 'file', start, seconds)
+
+    def format_table(self, limit: int = 25) -> str:
+        """Format the most expensive rules, preserve patterns and files."""
+        rows = sorted(self.stats.values(), key=lambda stats: stats.seconds, reverse=True)
+        lines = ["Conversion Profile", "=" * 50,
+                 f"{'time ms':>9} {'matches':>8} {'rejected':>8}  {'kind':<8} {'source':<17} pattern"]
+        for stats in rows[:limit]:
+            lines.append(f"{stats.seconds * 1000:>9.2f} {stats.matches:>8} {stats.rejections:>8}  "
+                         f"{stats.kind:<8} {stats.source:<17} {stats.pattern}")
+        if len(rows) > limit:
+            lines.append(f"... and {len(rows) - limit} more patterns")
+
+        files = sorted(self.files, key=lambda entry: entry['seconds'], reverse=True)
+        if files:
+            lines += ["", f"{'time ms':>9} {'KB':>9}  file"]
+            for entry in files[:limit]:
+                lines.append(f"{entry['seconds'] * 1000:>9.2f} {entry['bytes'] / 1024:>9.1f}  {entry['path']}")
+            if len(files) > limit:
+                lines.append(f"... and {len(files) - limit} more files")
+        return '\n'.join(lines)
+
+    def to_dict(self) -> Dict[str, object]:
+        """Profile as a Chrome trace object with the aggregated tables alongside."""
+        return {
+            'traceEvents': self.events,
+            'displayTimeUnit': 'ms',
+            'rules': [stats.to_dict() for stats in sorted(self.stats.values(),
+                                                         key=lambda stats: stats.seconds, reverse=True)],
+            'files': self.files,
+        }
+
+    def save(self, file_path: Path) -> None:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=1)
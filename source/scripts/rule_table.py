@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Canonical rule table for the spelling converter.
+Merges the safe, pattern and custom rule tables into one ordered table in
+a fixed precedence, drops rules that rewrite every word to itself and
+reports words that two rules would rewrite differently.
+"""
+
+import re
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from byte_prefilter import FOLDED_VARIANTS
+
+Replacement = Union[str, Callable[[re.Match], str]]
+
+# Rule tables used by each mode, in precedence order. The first rule that
+# matches a word rewrites it, and later rules only see the rewritten word.
+# A table that repeats an earlier table's pattern replaces that rule's
+# replacement in place, so a word list can override a built-in rule.
+RULE_SOURCES = {
+    'safe': ('safe_mappings', 'custom_mappings'),
+    'regex': ('pattern_mappings', 'custom_mappings'),
+    'hybrid': ('safe_mappings', 'pattern_mappings', 'custom_mappings'),
+}
+
+# Lowercasing compares words as case-insensitive patterns do once these letters are folded too
+_ASCII_FOLDS = str.maketrans({variant: letter for letter, variants in FOLDED_VARIANTS.items()
+                              for variant in variants})
+
+
+def fold_case(word: str) -> str:
+    """Key under which ``re.IGNORECASE`` patterns treat spellings of a word as equal."""
+    return word.lower() if word.isascii() else word.translate(_ASCII_FOLDS).lower()
+
+
+def literal_word(pattern: str) -> Optional[str]:
+    """Return the word matched by a plain ``\\bword\\b`` rule, or None for real regexes."""
+    if not (pattern.startswith(r'\b') and pattern.endswith(r'\b')) or len(pattern) <= 4:
+        return None
+    escaped = pattern[2:-2]
+    word = re.sub(r'\\(.)', r'\1', escaped) if '\\' in escaped else escaped
+    return word if re.escape(word) == escaped else None
+
+
+def expand_pattern(pattern: str, limit: int = 10000) -> Optional[List[str]]:
+    """List the words a ``\\b...\\b`` rule matches, or None if it is not a finite word set.
+
+    Understands literal and escaped characters and unnested ``(a|b|c)``
+    groups, which covers the built-in tables and every word list entry.
+    """
+    if not (pattern.startswith(r'\b') and pattern.endswith(r'\b')):
+        return None
+    body = pattern[2:-2]
+    words = ['']
+    branches: Optional[List[str]] = None
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char == '\\':
+            if i + 1 >= len(body) or body[i + 1].isalnum():
+                return None
+            char = body[i + 1]
+            i += 1
+        elif char == '(' and branches is None:
+            branches = ['']
+            i += 1
+            continue
+        elif char == '|' and branches is not None:
+            branches.append('')
+            i += 1
+            continue
+        elif char == ')' and branches is not None:
+            words = [word + branch for word in words for branch in branches]
+            branches = None
+            if len(words) > limit:
+                return None
+            i += 1
+            continue
+        elif char in '.^$*+?{}[]()|':
+            return None
+
+        if branches is None:
+            words = [word + char for word in words]
+        else:
+            branches[-1] += char
+        i += 1
+
+    if branches is not None:
+        return None
+    return words
+
+
+class Rule:
+    """One rewrite rule and the table it came from."""
+
+    __slots__ = ('source', 'pattern', 'replacement', 'literal', 'words')
+
+    def __init__(self, source: str, pattern: str, replacement: Replacement):
+        self.source = source
+        self.pattern = pattern
+        self.replacement = replacement
+        self.literal = literal_word(pattern)
+        self.words = [self.literal] if self.literal is not None else expand_pattern(pattern)
+
+    def rewrite(self, word: str) -> str:
+        """Return what the rule makes of a lowercase word it matches."""
+        if callable(self.replacement):
+            return self.replacement(re.fullmatch(self.pattern, word, re.IGNORECASE))
+        if '\\1' in self.replacement:
+            return re.sub(self.pattern, self.replacement, word, flags=re.IGNORECASE)
+        return self.replacement
+
+    def is_noop(self) -> bool:
+        """True if the rule is a finite word set that rewrites each word to itself."""
+        return self.words is not None and all(self.rewrite(word) == word
+                                              for word in map(fold_case, self.words))
+
+    def __repr__(self) -> str:
+        return f"Rule({self.source!r}, {self.pattern!r}, {self.replacement!r})"
+
+
+class RuleConflict(NamedTuple):
+    """Two rules that disagree: an override of the same pattern, or one word rewritten two ways."""
+
+    kept: Rule
+    shadowed: Rule
+    word: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self.word is None:
+            return (f"{self.kept.source} rule {self.kept.pattern} overrides "
+                    f"{self.shadowed.source} → {self.shadowed.replacement!r}")
+        return (f"'{self.word}' becomes '{self.kept.rewrite(self.word)}' by {self.kept.source} "
+                f"rule {self.kept.pattern}, so {self.shadowed.source} rule {self.shadowed.pattern} "
+                f"(→ '{self.shadowed.rewrite(self.word)}') never applies to it")
+
+
+class RuleTable:
+    """The ordered rule table for a mode, built from the named tables in precedence order.
+
+    Identical patterns are merged, keeping the first one's position and
+    the last one's replacement. Rules that rewrite every word to itself are
+    dropped, since the scan would only record a change that changes
+    nothing. Words matched by more than one rule are checked, and those
+    the rules rewrite differently are listed in ``conflicts``.
+    """
+
+    def __init__(self, tables: Iterable[Tuple[str, Dict[str, Replacement]]]):
+        merged: Dict[str, Rule] = {}
+        self.conflicts: List[RuleConflict] = []
+        for source, mappings in tables:
+            for pattern, replacement in mappings.items():
+                rule = Rule(source, pattern, replacement)
+                previous = merged.get(pattern)
+                if previous is not None and previous.replacement != replacement:
+                    self.conflicts.append(RuleConflict(rule, previous))
+                merged[pattern] = rule
+
+        self.rules: List[Rule] = []
+        self.dropped: List[Rule] = []
+        for rule in merged.values():
+            (self.dropped if rule.is_noop() else self.rules).append(rule)
+
+        claimed: Dict[str, Rule] = {}
+        for rule in self.rules:
+            for word in map(fold_case, rule.words or ()):
+                first = claimed.setdefault(word, rule)
+                if first is not rule and first.source != rule.source and first.rewrite(word) != rule.rewrite(word):
+                    self.conflicts.append(RuleConflict(first, rule, word))
+
+    @property
+    def mappings(self) -> Dict[str, Replacement]:
+        """The table as an ordered pattern → replacement dict."""
+        return {rule.pattern: rule.replacement for rule in self.rules}
+
+    def __len__(self) -> int:
+        return len(self.rules)
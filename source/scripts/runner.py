@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Per-file run loop shared by the text-processing scripts.
+Runs a function over each discovered file, serially or in a process pool,
+hands the results back in discovery order and keeps the content cache up
+to date as they arrive.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Optional, Tuple
+
+from content_cache import ContentCache
+from stream_io import WriteBatch
+
+
+def run_files(entries: Iterable[tuple], process: Callable[..., tuple], report: Callable[[str, tuple], bool],
+              jobs: int = 1, worker: Optional[Tuple[Callable[..., tuple], Optional[Callable], tuple]] = None,
+              cache: Optional[ContentCache] = None, partial: bool = False, save: bool = True) -> bool:
+    """Process each (relative path, *arguments) entry and report its result.
+
+    Serially each file is processed as ``process(*arguments, batch=batch)``;
+    with ``jobs`` above 1 and a ``worker`` of (function, initializer,
+    initargs) as ``function(*arguments)`` in a process pool. Results end in
+    the file's content hash if it is known clean, or None, and are passed to
+    ``report`` in entry order; ``report`` returns True to stop the run.
+
+    A run that was not stopped saves the cache (unless ``save`` is False),
+    evicting files it did not see unless it was ``partial``.
+    Returns True if ``report`` stopped the run.
+    """
+    if jobs > 1 and worker is not None:
+        # The pool sizes its chunks from the file count, so it takes the whole list
+        entries = list(entries)
+        jobs = min(jobs, len(entries))
+    else:
+        jobs = 1
+
+    if jobs > 1:
+        function, initializer, initargs = worker
+        relative_paths, *arguments = zip(*entries)
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs)
+        batch = None
+        results = zip(relative_paths, pool.map(function, *arguments,
+                                               chunksize=max(1, len(relative_paths) // (jobs * 4))))
+    else:
+        pool = None
+        # Workers sync each file they write; here the syncs wait for the end of the run
+        batch = WriteBatch()
+        results = ((relative_path, process(*arguments, batch=batch)) for relative_path, *arguments in entries)
+
+    seen = []
+    try:
+        for relative_path, result in results:
+            seen.append(relative_path)
+            if cache:
+                cache.update(relative_path, result[-1])
+            if report(relative_path, result):
+                return True
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if batch is not None:
+            batch.flush()
+
+    if cache and save:
+        # Only a full walk knows which files are gone
+        cache.save(None if partial else seen)
+    return False
@@ -10,11 +10,554 @@ import os
 import sys
 import csv
 import json
+import time
+import asyncio
+import copy
+import hashlib
+import contextlib
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Set
+from typing import (AsyncIterable, AsyncIterator, Dict, Hashable, Iterable, Iterator, List, Optional,
+                    Tuple, Set, Union)
+
+import byte_prefilter
+from byte_prefilter import BytePrefilter, decode_regions, decode_text, map_file
+from change_records import ChangeList, ChangeSummary
+from check_report import FORMATTERS, Violation
+from compiled_wordlist import (COMPILED_SUFFIX, CompiledWordList, WordListFormatError,
+                               compile_word_list, read_compiled_word_list)
+from content_cache import ContentCache, hash_bytes, read_text_with_digest
+from file_discovery import filter_files, iter_files
+from git_changes import GitError, LineRanges, changed_lines, line_regions
+import preserve_lexer
+from preserve_lexer import scanner_for
+from profiling import ConversionProfile
+from runner import run_files
+import rule_table
+from rule_table import RULE_SOURCES, RuleTable, expand_pattern, fold_case, literal_word
+from stream_io import CHUNK_SIZE, STREAM_THRESHOLD, AtomicTextFile, WriteBatch, open_hashed_text, write_text
+from watcher import PollingWatcher
+
+# Text word list formats and the SpellingConverter method that parses each
+WORD_LIST_LOADERS = {'.csv': '_load_csv', '.json': '_load_json', '.txt': '_load_text', '.list': '_load_text'}
+
+# Rule subsets kept compiled for documents that fire the same rules
+SUBSET_CACHE_SIZE = 32
+
+# Name of the report saved in a converted directory, without its format suffix
+REPORT_NAME = 'spelling_conversion_report'
+
+class ProtectedSpans:
+    """Sorted, merged index of protected regions with binary-search lookups."""
+
+    def __init__(self, spans: Iterable[Tuple[int, int]] = ()):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+
+        # Merge overlapping and touching spans so each position maps to at most one entry
+        for start, end in sorted(spans):
+            if self.ends and start <= self.ends[-1]:
+                if end > self.ends[-1]:
+                    self.ends[-1] = end
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def covers(self, pos: int) -> bool:
+        """Check if a single text position lies inside a protected span."""
+        i = bisect_right(self.starts, pos) - 1
+        return i >= 0 and pos < self.ends[i]
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Check if a match starts or ends inside a protected span."""
+        return self.covers(start) or self.covers(end - 1)
+
+    def shift(self, edits: List[Tuple[int, int, int]]) -> None:
+        """Move spans to follow replacements made to the text.
+
+        ``edits`` holds non-overlapping (start, end, new_length) tuples in
+        ascending order, using the offsets of the text before the edits.
+        """
+        if not edits:
+            return
+
+        def remap(positions: List[int]) -> List[int]:
+            remapped = []
+            delta = 0
+            i = 0
+            for pos in positions:
+                while i < len(edits) and edits[i][1] <= pos:
+                    start, end, length = edits[i]
+                    delta += length - (end - start)
+                    i += 1
+                if i < len(edits) and edits[i][0] < pos:
+                    # Position falls inside a replaced region; clamp it to the new text
+                    start, end, length = edits[i]
+                    pos = start + min(pos - start, length)
+                remapped.append(pos + delta)
+            return remapped
+
+        starts = remap(self.starts)
+        ends = remap(self.ends)
+        kept = [(start, end) for start, end in zip(starts, ends) if end > start]
+        self.starts = [start for start, _ in kept]
+        self.ends = [end for _, end in kept]
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Build a regex alternation for the words that shares common prefixes."""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if '' in node:
+            # Greedy optional tail prefers the longest word before backtracking
+            if len(branches) == 1 and len(branches[0]) == 1:
+                return branches[0] + '?'
+            return '(?:' + '|'.join(branches) + ')?'
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return build(trie)
+
+def apply_edits(text: str, edits: Iterable[Tuple[int, int, str]]) -> str:
+    """Build the edited text with a single join.
+
+    ``edits`` holds non-overlapping (start, end, replacement) records in
+    ascending order; unchanged text between them is sliced, not copied twice.
+    """
+    pieces = []
+    last = 0
+    for start, end, replacement in edits:
+        pieces.append(text[last:start])
+        pieces.append(replacement)
+        last = end
+    if not pieces:
+        return text
+    pieces.append(text[last:])
+    return ''.join(pieces)
+
+def merge_edit(edits: List[Tuple[int, int, str]], converted: str, start: int, end: int,
+               replacement: str) -> Tuple[int, List[Tuple[int, int, str]], range]:
+    """Replace ``converted[start:end]``, where converted is the text with ``edits`` applied.
+
+    Edits the replaced range overlaps are folded into one edit, so the
+    result is still non-overlapping edits of the original text. Returns
+    the new edit's position, the edits and the positions it replaced.
+    """
+    outputs = []
+    delta = 0
+    for edit_start, edit_end, edit_replacement in edits:
+        outputs.append((edit_start + delta, edit_start + delta + len(edit_replacement)))
+        delta += len(edit_replacement) - (edit_end - edit_start)
+    overlapped = [i for i, (out_start, out_end) in enumerate(outputs)
+                  if out_start < end and start < out_end or start <= out_start and out_end <= end]
+
+    def source_offset(position: int) -> int:
+        shift = 0
+        for (edit_start, edit_end, edit_replacement), (_, out_end) in zip(edits, outputs):
+            if out_end > position:
+                break
+            shift += len(edit_replacement) - (edit_end - edit_start)
+        return position - shift
+
+    if overlapped and outputs[overlapped[0]][0] <= start:
+        text_start, out_start = edits[overlapped[0]][0], outputs[overlapped[0]][0]
+    else:
+        text_start, out_start = source_offset(start), start
+    if overlapped and outputs[overlapped[-1]][1] >= end:
+        text_end, out_end = edits[overlapped[-1]][1], outputs[overlapped[-1]][1]
+    else:
+        text_end, out_end = source_offset(end), end
+
+    merged = (text_start, text_end, converted[out_start:start] + replacement + converted[end:out_end])
+    if overlapped:
+        replaced = range(overlapped[0], overlapped[-1] + 1)
+    else:
+        position = next((i for i, edit in enumerate(edits) if edit[0] >= text_end), len(edits))
+        replaced = range(position, position)
+    return replaced.start, edits[:replaced.start] + [merged] + edits[replaced.stop:], replaced
+
+# Single-token words, which a word list run can match by lookup alone
+_WORD_TOKEN = re.compile(r'\w+')
+
+class RuleMatcher:
+    """Single-scan matcher over an ordered table of spelling rules.
+
+    Runs of plain word rules, and of regex rules that only list single-token
+    words, are folded into trie-backed alternations and resolved by their
+    case-folded text, so a word several rules share is scanned once. The
+    remaining regex rules become named alternatives, and one left-to-right
+    scan finds every candidate.
+    """
+
+    # A final run of at least this many single-token words is matched as any
+    # word plus a lookup, since compiling a huge alternation costs seconds
+    token_run_size = 2000
+
+    def __init__(self, mappings: Dict[str, object], literals: Optional[List[Optional[str]]] = None):
+        self.patterns = list(mappings)
+        self.replacements = list(mappings.values())
+        # ``literals`` may pass in each pattern's literal_word, already worked out by a RuleTable
+        if literals is None:
+            literals = [literal_word(pattern) for pattern in self.patterns]
+        plain = [None if callable(replacement) else word
+                 for word, replacement in zip(literals, self.replacements)]
+        self.plain = [word is not None for word in plain]
+        # Within a run the trie prefers the longest word where the alternation
+        # prefers the earlier rule. Those only differ if some word spans tokens,
+        # so regex rules join the runs only when no plain word rule does
+        merge = all(_WORD_TOKEN.fullmatch(word) for word in plain if word is not None)
+        self.words: List[Optional[List[str]]] = []
+        for word, pattern in zip(plain, self.patterns):
+            words = [word] if word is not None else expand_pattern(pattern) if merge else None
+            if words is not None and not all(_WORD_TOKEN.fullmatch(each) for each in words):
+                words = [word] if word is not None else None
+            self.words.append(words)
+        # Number of regex alternatives before each index, to find where literal runs end
+        self.regex_counts = [0]
+        for words in self.words:
+            self.regex_counts.append(self.regex_counts[-1] + (words is None))
+        # Rules that can match more than one word, and so also text that earlier rules rewrote
+        self.spanning = [index for index, (pattern, words) in enumerate(zip(self.patterns, self.words))
+                         if not all(_WORD_TOKEN.fullmatch(word)
+                                    for word in words or expand_pattern(pattern) or [''])]
+        self._compile(range(len(self.patterns)), {})
+
+    def subset(self, keep: Iterable[int]) -> 'RuleMatcher':
+        """Return a matcher whose scan only tries the given rules.
+
+        Rule indices are unchanged, and a dropped regex rule still ends the
+        literal run before it, so the kept rules match exactly as they do in
+        the full table. Chains still need the full matcher's next_rule.
+        """
+        subset = copy.copy(self)
+        subset._compile(sorted(keep), self.regex_rules)
+        return subset
+
+    def _compile(self, indices: Iterable[int], compiled: Dict[int, re.Pattern]) -> None:
+        self.literals: Dict[str, List[int]] = {}
+        self.regex_rules: Dict[int, re.Pattern] = {}
+        self.alternative_rules: Dict[int, re.Pattern] = {}
+
+        alternatives = []
+        run: List[str] = []
+
+        def close_run(final: bool = False) -> None:
+            tokens = []
+            if final and len(run) >= self.token_run_size:
+                # Nothing follows the last run, so consuming a word that misses
+                # the lookup cannot hide another rule's match
+                tokens = [word for word in run if _WORD_TOKEN.fullmatch(word)]
+                run[:] = [word for word in run if not _WORD_TOKEN.fullmatch(word)]
+            if run:
+                alternatives.append(rf'(?P<w{len(alternatives)}>\b(?:{_trie_pattern(run)})\b)')
+                run.clear()
+            if tokens:
+                alternatives.append(rf'(?P<w{len(alternatives)}>\b\w+\b)')
+
+        previous = None
+        for index in indices:
+            if previous is not None and self.regex_counts[index] > self.regex_counts[previous + 1]:
+                close_run()
+            previous = index
+            pattern = self.patterns[index]
+            if not self.plain[index]:
+                self.regex_rules[index] = compiled.get(index) or re.compile(pattern, re.IGNORECASE)
+            words = self.words[index]
+            if words is not None:
+                for word in words:
+                    key = fold_case(word)
+                    indices = self.literals.setdefault(key, [])
+                    if not indices or indices[-1] != index:
+                        indices.append(index)
+                        run.append(key)
+            else:
+                close_run()
+                self.alternative_rules[index] = self.regex_rules[index]
+                alternatives.append(f'(?P<r{index}>{pattern})')
+        close_run(final=True)
+
+        # Every built-in and word list rule starts at a word boundary; checking it
+        # once up front lets the scan skip non-boundary positions cheaply
+        prefix = r'\b' if all(pattern.startswith(r'\b') for pattern in self.patterns) else ''
+        if prefix:
+            # So does a letter that starts one of the rules' words: testing it
+            # first rejects most positions without trying the alternation
+            initials = self._initials()
+            if initials:
+                prefix += '(?=[' + ''.join(re.escape(char) for char in sorted(initials)) + '])'
+        self.scanner = (re.compile(prefix + '(?:' + '|'.join(alternatives) + ')', re.IGNORECASE)
+                        if alternatives else None)
+
+    def _initials(self) -> Optional[Set[str]]:
+        """First characters of every word the rules match, or None if some rule has no finite word set."""
+        initials = {word[0] for word in self.literals}
+        for regex in self.alternative_rules.values():
+            words = expand_pattern(regex.pattern)
+            if words is None or not all(words):
+                return None
+            initials.update(word[0].lower() for word in words)
+        return initials
+
+    def scan(self, text: str, pos: int = 0, endpos: Optional[int] = None) -> Iterator[Tuple[re.Match, int]]:
+        """Yield each candidate match with the index of the first rule that applies."""
+        if self.scanner is None:
+            return
+        for match in self.scanner.finditer(text, pos, len(text) if endpos is None else endpos):
+            name = match.lastgroup
+            if name.startswith('r'):
+                yield match, int(name[1:])
+            else:
+                indices = self.literals.get(fold_case(match.group(0)))
+                if indices:
+                    yield match, indices[0]
+
+    def next_rule(self, word: str, after: int) -> Optional[int]:
+        """Find the next rule after ``after`` that would match the rewritten word."""
+        best = None
+        for index in self.literals.get(fold_case(word), ()):
+            if index > after:
+                best = index
+                break
+        for index, regex in self.alternative_rules.items():
+            if best is not None and index >= best:
+                break
+            if index > after and regex.fullmatch(word):
+                return index
+        return best
+
+def _rule_words(matcher: RuleMatcher) -> Optional[List[str]]:
+    """List every word the matcher's rules can match, or None if a rule is not a finite word set."""
+    words = list(matcher.literals)
+    for regex in matcher.alternative_rules.values():
+        expanded = expand_pattern(regex.pattern)
+        if expanded is None:
+            return None
+        words.extend(expanded)
+    return words
+
+class LookupTable:
+    """Token lookup for rule tables made only of plain word sets.
+
+    Maps each lowercased word to the first rule that matches it. Tokens are
+    resolved through the rule chain once per spelling and cached, so looking
+    up a token costs the same however many rules there are.
+    """
+
+    def __init__(self, matcher: RuleMatcher, resolve_chain):
+        self.resolve_chain = resolve_chain
+        self.first: Dict[str, int] = {word: indices[0] for word, indices in matcher.literals.items()}
+        for index, regex in matcher.alternative_rules.items():
+            words = expand_pattern(regex.pattern)
+            if words is None:
+                raise ValueError(f"rule {regex.pattern!r} is not a plain word pattern")
+            for word in words:
+                key = fold_case(word)
+                if self.first.get(key, index) >= index:
+                    self.first[key] = index
+        for word in self.first:
+            if not _WORD_TOKEN.fullmatch(word):
+                raise ValueError(f"rule word {word!r} is not a single token")
+        self.resolved: Dict[str, Tuple[int, Optional[str], List[Tuple[int, str, Optional[str]]]]] = {}
+
+    def lookup(self, token: str) -> Optional[Tuple[int, Optional[str], List[Tuple[int, str, Optional[str]]]]]:
+        """Resolve a token to (first rule, replacement or None, chain steps), or None if no rule matches."""
+        resolved = self.resolved.get(token)
+        if resolved is None:
+            index = self.first.get(fold_case(token))
+            if index is None:
+                return None
+            replacement, steps = self.resolve_chain(index, token, None)
+            resolved = self.resolved[token] = (index, replacement, steps)
+        return resolved
+
+_ASCII_WORD_RUN = re.compile(r'[0-9A-Za-z_]+')
+
+class RuleAnchors:
+    """Literal anchors for each rule, all found in a document by one search.
+
+    A rule's anchors are the leading ASCII word-character run of each word
+    it matches, lowercased, so like the rule itself an anchor can only
+    occur at a word boundary. Anchors that start with a shorter anchor are
+    merged into it, and a single pass over the lowercased document finds
+    every rule that can fire. Rules that are not finite word sets, or have
+    a word that does not start with an ASCII word character, are always kept.
+    """
+
+    def __init__(self, matcher: RuleMatcher):
+        self.always: Set[int] = set()
+        anchors: Dict[str, Set[int]] = {}
+        for index, words in enumerate(matcher.words):
+            if words is None:
+                words = expand_pattern(matcher.patterns[index])
+            if words is None:
+                self.always.add(index)
+                continue
+            for word in words:
+                run = _ASCII_WORD_RUN.match(word)
+                if run is None:
+                    self.always.add(index)
+                    break
+                anchors.setdefault(run.group().lower(), set()).add(index)
+
+        # Keep only anchors with no shorter anchor as a prefix, each standing for its extensions
+        self.rules: Dict[str, Set[int]] = {}
+        for anchor in sorted(anchors, key=len):
+            head = next((anchor[:end] for end in range(1, len(anchor)) if anchor[:end] in self.rules), anchor)
+            self.rules.setdefault(head, set()).update(anchors[anchor])
+        initials = ''.join(sorted({re.escape(anchor[0]) for anchor in self.rules}))
+        self.pattern = re.compile(rf'\b(?=[{initials}])(?:{_trie_pattern(self.rules)})') if self.rules else None
+
+    def present(self, text: str, regions: Optional[List[Tuple[int, int]]] = None) -> Set[int]:
+        """Return the indices of the rules whose anchors occur in the text (or its regions)."""
+        found = set(self.always)
+        if self.pattern is None:
+            return found
+        for start, end in regions if regions is not None else [(0, len(text))]:
+            part = fold_case(text[start:end])
+            for head in set(self.pattern.findall(part)):
+                found.update(self.rules[head])
+        return found
+
+class VersionedMappings(dict):
+    """Rule mapping that counts its changes, so rules built from it know when to rebuild."""
+
+    version = 0
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key) -> None:
+        super().__delitem__(key)
+        self.version += 1
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self.version += 1
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self.version += 1
+        return super().pop(*args)
+
+    def popitem(self):
+        self.version += 1
+        return super().popitem()
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+
+
+class VersionedSet(set):
+    """Word set that counts its changes, like VersionedMappings."""
+
+    version = 0
+
+    def _changed(self, result=None):
+        self.version += 1
+        return result
+
+    def add(self, item) -> None:
+        self._changed(super().add(item))
+
+    def discard(self, item) -> None:
+        self._changed(super().discard(item))
+
+    def remove(self, item) -> None:
+        self._changed(super().remove(item))
+
+    def pop(self):
+        return self._changed(super().pop())
+
+    def clear(self) -> None:
+        self._changed(super().clear())
+
+    def update(self, *others) -> None:
+        self._changed(super().update(*others))
+
+    def difference_update(self, *others) -> None:
+        self._changed(super().difference_update(*others))
+
+    def intersection_update(self, *others) -> None:
+        self._changed(super().intersection_update(*others))
+
+    def symmetric_difference_update(self, other) -> None:
+        self._changed(super().symmetric_difference_update(other))
+
+    def __ior__(self, other):
+        return self._changed(super().__ior__(other))
+
+    def __iand__(self, other):
+        return self._changed(super().__iand__(other))
+
+    def __isub__(self, other):
+        return self._changed(super().__isub__(other))
+
+    def __ixor__(self, other):
+        return self._changed(super().__ixor__(other))
+
+
+def _versioned(name: str, kind: type) -> property:
+    """Converter attribute kept as a versioned ``kind``; assigning it bumps the rules version."""
+    attribute = f'_{name}'
+
+    def get(self):
+        return getattr(self, attribute)
+
+    def set(self, value) -> None:
+        setattr(self, attribute, kind(value))
+        self._rules_version += 1
+
+    return property(get, set, doc=f"The converter's {name.replace('_', ' ')}; changes are tracked.")
+
+
+def _same_function(replacement, builtin) -> bool:
+    """Whether a callable replacement is the built-in one, created by another converter."""
+    return callable(replacement) and getattr(replacement, '__code__', None) is getattr(builtin, '__code__', False)
+
+
+# Settings that make up a converter's behaviour (see SpellingConverter.configuration);
+# every other attribute is a cache or per-run state
+CONVERTER_SETTINGS = ('mode', 'safe_mappings', 'pattern_mappings', 'custom_mappings', 'exceptions',
+                      'preserve_contexts', 'preserve_openers', 'target_extensions', 'exclude_patterns',
+                      'stream_threshold', 'chunk_size', 'engine', 'prefilter', 'anchor_min_regex_rules')
+
 
 class SpellingConverter:
+    # Rule inputs count their own changes, so cached rules rebuild after any
+    # edit without comparing the tables on every call (see get_rule_table)
+    safe_mappings = _versioned('safe_mappings', VersionedMappings)
+    pattern_mappings = _versioned('pattern_mappings', VersionedMappings)
+    custom_mappings = _versioned('custom_mappings', VersionedMappings)
+    exceptions = _versioned('exceptions', VersionedSet)
+
     def __init__(self, mode='hybrid'):
+        # Bumped whenever the mode or a rule input is replaced (see get_rule_table)
+        self._rules_version = 0
         self.mode = mode
 
         # Safe explicit mappings (high confidence conversions)
@@ -178,15 +721,129 @@ class SpellingConverter:
             r'[A-Z][a-zA-Z]*[A-Z][a-zA-Z]*',  # CamelCase
         ]
 
+        # Unfinished openers of preserved contexts that can span lines. A streamed
+        # chunk may only end where none of these is left open after the last match
+        self.preserve_openers = {
+            r'color\s*:\s*[^;]+;': r'color\s*(?::|\Z)',
+            r'background-color\s*:\s*[^;]+;': r'background-color\s*(?::|\Z)',
+            r'border-color\s*:\s*[^;]+;': r'border-color\s*(?::|\Z)',
+            r'text-align\s*:\s*center\s*;': r'text-align\s*(?::\s*(?:center\s*)?)?\Z',
+            r'align-items\s*:\s*center\s*;': r'align-items\s*(?::\s*(?:center\s*)?)?\Z',
+            r'justify-content\s*:\s*center\s*;': r'justify-content\s*(?::\s*(?:center\s*)?)?\Z',
+            r'class\s*=\s*["\'][^"\']*["\']': r'class\s*(?:=\s*(?:["\'][^"\']*)?)?\Z',
+            r'id\s*=\s*["\'][^"\']*["\']': r'id\s*(?:=\s*(?:["\'][^"\']*)?)?\Z',
+            r'style\s*=\s*["\'][^"\']*["\']': r'style\s*(?:=\s*(?:["\'][^"\']*)?)?\Z',
+            r'href\s*=\s*["\'][^"\']*["\']': r'href\s*(?:=\s*(?:["\'][^"\']*)?)?\Z',
+            r'src\s*=\s*["\'][^"\']*["\']': r'src\s*(?:=\s*(?:["\'][^"\']*)?)?\Z',
+            r'```[^`]*```': r'```[^`]*`{0,2}\Z',
+            r'`[^`]+`': r'`[^`]+\Z',
+            r'^---\s*$.*?^---\s*$': r'^---\s*$',
+            r'<[^>]+>': r'<[^>]+\Z',
+            r'\{[^}]*\}': r'\{[^}]*\Z',
+            r'\[[^\]]*\]': r'\[[^\]]*\Z',
+        }
+
         # File extensions to process
         self.target_extensions = {'.md', '.qmd', '.html', '.txt', '.css'}
 
-        # Custom word list (loaded from external files)
-        self.custom_mappings = {}
+        # Extra gitignore-style patterns for paths to skip in directories (see file_discovery.py)
+        self.exclude_patterns: List[str] = []
+
+        # Files above this size are converted in chunks of chunk_size characters
+        self.stream_threshold = STREAM_THRESHOLD
+        self.chunk_size = CHUNK_SIZE
 
+        # Custom word list (loaded from external files)
+        self.custom_mappings = VersionedMappings()
+
+        self._compile_preserves()
+
+        # Protected spans of the most recently indexed document
+        self._indexed_text = None
+        self._indexed_spans = None
+
+        # Canonical rule table and combined matcher for the active rules, rebuilt
+        # when the mode or word list changes
+        self._rule_table_key = None
+        self._rule_table = None
+        self._matcher_key = None
+        self._matcher = None
+
+        # Rule engine: 'regex' scans with the combined matcher, 'lookup' splits the
+        # text into word tokens and resolves each through a LookupTable
+        self.engine = 'regex'
+        self._lookup_key = None
+        self._lookup = None
+
+        # Search files as bytes first and skip those no rule can change (see byte_prefilter.py)
+        self.prefilter = True
+        self._prefilter_matcher = None
+        self._prefilter = None
+
+        # Tables with at least this many regex alternatives are cut down per
+        # document to the rules whose literal anchors occur in it. Words share one
+        # trie and cost little however many there are, so only alternatives count
+        self.anchor_min_regex_rules = 40
+        self._anchors_matcher = None
+        self._anchors = None
+        self._subsets: OrderedDict = OrderedDict()
+
+        # Optional per-rule and per-file timing collector (see --profile)
+        self.profile: Optional[ConversionProfile] = None
+
+    def _compile_preserves(self) -> None:
+        """Compile the preserved contexts and their openers."""
         # Compile regex patterns for efficiency
         self.compiled_preserves = [re.compile(pattern, re.MULTILINE | re.DOTALL)
                                   for pattern in self.preserve_contexts]
+        self.compiled_openers = [(preserve_regex, re.compile(self.preserve_openers[preserve_regex.pattern],
+                                                             re.MULTILINE | re.DOTALL))
+                                 for preserve_regex in self.compiled_preserves
+                                 if preserve_regex.pattern in self.preserve_openers]
+
+        # Linear-time scanner for each preserved context (see preserve_lexer.py)
+        self.preserve_scanners = {pattern: scanner_for(pattern) for pattern in self.preserve_contexts}
+
+    def configuration(self) -> Dict[str, object]:
+        """Return the settings a process pool worker needs to convert exactly as this converter does.
+
+        Built-in callable replacements cannot be pickled, so they are sent
+        as None and taken from the worker's own tables (see from_configuration).
+        """
+        defaults = SpellingConverter(self.mode)
+        configuration = {name: getattr(self, name) for name in CONVERTER_SETTINGS}
+        # The contexts as compiled, which is what conversion uses if the lists were changed since
+        configuration['preserve_contexts'] = list(self.preserve_scanners)
+        configuration['preserve_openers'] = {preserve_regex.pattern: opener_regex.pattern
+                                             for preserve_regex, opener_regex in self.compiled_openers}
+        for table in ('safe_mappings', 'pattern_mappings', 'custom_mappings'):
+            builtin = getattr(defaults, table)
+            configuration[table] = {
+                pattern: None if _same_function(replacement, builtin.get(pattern)) else replacement
+                for pattern, replacement in getattr(self, table).items()}
+        return configuration
+
+    @classmethod
+    def from_configuration(cls, configuration: Dict[str, object]) -> 'SpellingConverter':
+        """Build a converter from the settings returned by ``configuration``."""
+        converter = cls(configuration['mode'])
+        for name, value in configuration.items():
+            if name in ('safe_mappings', 'pattern_mappings', 'custom_mappings'):
+                builtin = getattr(converter, name)
+                value = {pattern: builtin[pattern] if replacement is None else replacement
+                         for pattern, replacement in value.items()}
+            setattr(converter, name, value)
+        converter._compile_preserves()
+        return converter
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    @mode.setter
+    def mode(self, mode: str) -> None:
+        self._mode = mode
+        self._rules_version += 1
 
     def load_word_list(self, file_path: Path) -> None:
         """Load custom word mappings from a file (CSV, JSON, or text format)."""
@@ -197,18 +854,55 @@ class SpellingConverter:
         file_ext = file_path.suffix.lower()
 
         try:
-            if file_ext == '.csv':
-                self._load_csv(file_path)
-            elif file_ext == '.json':
-                self._load_json(file_path)
-            elif file_ext in ['.txt', '.list']:
-                self._load_text(file_path)
+            if file_ext == COMPILED_SUFFIX:
+                self._load_compiled(file_path)
+            elif file_ext in WORD_LIST_LOADERS:
+                compiled = self._current_compiled(file_path)
+                if compiled is not None:
+                    self.custom_mappings.update(compiled.mappings)
+                else:
+                    getattr(self, WORD_LIST_LOADERS[file_ext])(file_path)
             else:
                 print(f"Warning: Unsupported word list format: {file_ext}")
-                print("Supported formats: .csv, .json, .txt, .list")
+                print(f"Supported formats: .csv, .json, .txt, .list, {COMPILED_SUFFIX}")
         except Exception as e:
             print(f"Error loading word list {file_path}: {e}")
 
+    def _current_compiled(self, file_path: Path) -> Optional[CompiledWordList]:
+        """Return the compiled twin of a text word list if it is up to date."""
+        compiled_path = file_path.with_suffix(COMPILED_SUFFIX)
+        if not compiled_path.exists():
+            return None
+        try:
+            compiled = read_compiled_word_list(compiled_path)
+        except (OSError, WordListFormatError):
+            return None
+        if compiled.source is None or not compiled.source.exists():
+            return None
+        if not compiled.source.samefile(file_path) or not compiled.is_current():
+            return None
+        return compiled
+
+    def _load_compiled(self, file_path: Path) -> None:
+        """Load a compiled word list, falling back to its text source if unusable."""
+        try:
+            compiled = read_compiled_word_list(file_path)
+        except (OSError, WordListFormatError) as e:
+            print(f"Warning: {e}")
+            source = next((file_path.with_suffix(ext) for ext in WORD_LIST_LOADERS
+                           if file_path.with_suffix(ext).exists()), None)
+        else:
+            if compiled.is_current():
+                self.custom_mappings.update(compiled.mappings)
+                return
+            print(f"Warning: {file_path} is older than {compiled.source}")
+            source = compiled.source
+
+        if source is None:
+            raise ValueError(f"no text word list to fall back to for {file_path}")
+        print(f"Loading word list source instead: {source}")
+        getattr(self, WORD_LIST_LOADERS[source.suffix.lower()])(source)
+
     def _load_csv(self, file_path: Path) -> None:
         """Load CSV format: from,to (with optional header)."""
         with open(file_path, 'r', encoding='utf-8') as f:
@@ -260,113 +954,796 @@ class SpellingConverter:
                     print(f"Warning: Invalid format on line {line_num}: {line}")
                     print("Expected format: american=british")
 
+    def protected_spans(self, text: str) -> ProtectedSpans:
+        """Index every preserved context in the text in a single scan per pattern."""
+        if self.profile is not None:
+            return self._profiled_spans(text)
+        return ProtectedSpans(span for scan in self.preserve_scanners.values() for span in scan(text))
+
+    def _profiled_spans(self, text: str) -> ProtectedSpans:
+        """Index preserved contexts while timing each preserve pattern."""
+        spans = []
+        for pattern, scan in self.preserve_scanners.items():
+            started = time.perf_counter()
+            found = list(scan(text))
+            self.profile.record_preserve(pattern, started, time.perf_counter() - started, len(found))
+            spans.extend(found)
+        return ProtectedSpans(spans)
+
+    def rule_source(self, pattern: str) -> str:
+        """Name the table a rule pattern comes from."""
+        if pattern in self.custom_mappings:
+            return 'custom_mappings'
+        if pattern in self.safe_mappings and self.mode != 'regex':
+            return 'safe_mappings'
+        return 'pattern_mappings'
+
+    def _profile_rule_scans(self, matcher: RuleMatcher, text: str) -> None:
+        """Time each rule scanning the text on its own."""
+        for pattern in matcher.patterns:
+            regex = re.compile(pattern, re.IGNORECASE)
+            started = time.perf_counter()
+            for _ in regex.finditer(text):
+                pass
+            self.profile.record_scan(self.rule_source(pattern), pattern, started,
+                                     time.perf_counter() - started)
+
     def should_preserve_context(self, text: str, start: int, end: int) -> bool:
         """Check if the match is within a context that should be preserved."""
-        for preserve_regex in self.compiled_preserves:
-            for match in preserve_regex.finditer(text):
-                if match.start() <= start < match.end() or match.start() < end <= match.end():
-                    return True
-        return False
+        if text is not self._indexed_text:
+            self._indexed_text = text
+            self._indexed_spans = self.protected_spans(text)
+        return self._indexed_spans.overlaps(start, end)
+
+    def get_rule_table(self) -> RuleTable:
+        """Return the canonical rule table for the current mode and word list (see rule_table.py)."""
+        # Compare change counters rather than the tables, so each call costs
+        # the same however many words are loaded
+        key = (self._rules_version, self._safe_mappings.version, self._pattern_mappings.version,
+               self._custom_mappings.version)
+        if key != self._rule_table_key:
+            self._rule_table = RuleTable((source, getattr(self, source)) for source in RULE_SOURCES[self.mode])
+            self._rule_table_key = key
+        return self._rule_table
+
+    def get_mappings(self) -> Dict[str, object]:
+        """Return the ordered rule table for the current mode."""
+        return self.get_rule_table().mappings
+
+    def get_matcher(self) -> RuleMatcher:
+        """Return the combined matcher for the current mode and word list."""
+        table = self.get_rule_table()
+        if table is not self._matcher_key:
+            self._matcher = RuleMatcher(table.mappings, [rule.literal for rule in table.rules])
+            self._matcher_key = table
+        return self._matcher
+
+    def _replace_word(self, matcher: RuleMatcher, index: int, original: str,
+                      match: Optional[re.Match]) -> str:
+        """Compute the replacement one rule makes for a matched word."""
+        american_pattern = matcher.patterns[index]
+        british_replacement = matcher.replacements[index]
+
+        # Handle callable replacements (for complex patterns)
+        if callable(british_replacement):
+            return british_replacement(match or matcher.regex_rules[index].fullmatch(original))
+
+        # Handle regex substitution patterns
+        if '\\1' in british_replacement:
+            return re.sub(american_pattern, british_replacement, original, flags=re.IGNORECASE)
+
+        # Preserve original case for explicit mappings
+        if original.isupper():
+            return british_replacement.upper()
+        elif original.istitle():
+            return british_replacement.title()
+        return british_replacement
+
+    def _resolve_chain(self, matcher: RuleMatcher, index: int, word: str, rule_match: Optional[re.Match]
+                       ) -> Tuple[Optional[str], List[Tuple[int, str, Optional[str]]]]:
+        """Apply the first matching rule, then any later rule that matches its output.
+
+        Returns the final word, or None if nothing was replaced, and the
+        (rule index, word, replacement) steps taken; a replacement of None
+        marks a rule rejected by the exceptions list.
+        """
+        check_exceptions = self.mode in ['regex', 'hybrid']
+        steps = []
+        replaced = None
+
+        while index is not None:
+            # Skip if word is in exceptions list (for regex patterns)
+            if check_exceptions and word.lower() in self.exceptions:
+                steps.append((index, word, None))
+                break
+
+            replacement = self._replace_word(matcher, index, word, rule_match)
+            steps.append((index, word, replacement))
+            word = replaced = replacement
+            rule_match = None
+            index = matcher.next_rule(word, index)
+
+        return replaced, steps
+
+    def get_lookup_table(self) -> Optional[LookupTable]:
+        """Return the token lookup table for the active rules, or None if they need regexes."""
+        matcher = self.get_matcher()
+        # Resolved tokens record the exceptions check, so edits to the exceptions rebuild it too
+        key = (matcher, self._exceptions.version, self._rules_version)
+        if self._lookup_key != key:
+            self._lookup_key = key
+            try:
+                self._lookup = LookupTable(
+                    matcher, lambda index, word, match: self._resolve_chain(matcher, index, word, match))
+            except ValueError as e:
+                print(f"Warning: lookup engine unavailable, using regex engine: {e}", file=sys.stderr)
+                self._lookup = None
+        return self._lookup
+
+    def get_prefilter(self) -> Optional[BytePrefilter]:
+        """Return the byte prefilter for the active rules, or None if they cannot be searched as bytes."""
+        matcher = self.get_matcher()
+        if self._prefilter_matcher is not matcher:
+            self._prefilter_matcher = matcher
+            words = _rule_words(matcher)
+            try:
+                self._prefilter = BytePrefilter(words) if words is not None else None
+            except ValueError:
+                self._prefilter = None
+        return self._prefilter
+
+    def get_rule_anchors(self) -> RuleAnchors:
+        """Return the literal anchor index for the active rules."""
+        matcher = self.get_matcher()
+        if self._anchors_matcher is not matcher:
+            self._anchors_matcher = matcher
+            self._anchors = RuleAnchors(matcher)
+            self._subsets.clear()
+        return self._anchors
+
+    def _document_matcher(self, matcher: RuleMatcher, text: str,
+                          regions: Optional[List[Tuple[int, int]]] = None) -> RuleMatcher:
+        """Return a matcher that scans only the rules that can fire in this text."""
+        if len(matcher.alternative_rules) < self.anchor_min_regex_rules:
+            return matcher
+        present = self.get_rule_anchors().present(text, regions)
+        if 2 * sum(index in matcher.alternative_rules for index in present) > len(matcher.alternative_rules):
+            return matcher
+        key = frozenset(present)
+        subset = self._subsets.get(key)
+        if subset is None:
+            subset = self._subsets[key] = matcher.subset(present)
+            if len(self._subsets) > SUBSET_CACHE_SIZE:
+                self._subsets.popitem(last=False)
+        else:
+            self._subsets.move_to_end(key)
+        return subset
+
+    def _active_prefilter(self) -> Optional[BytePrefilter]:
+        # A profile times every rule over every file, so it reads files whole
+        if not self.prefilter or self.profile is not None:
+            return None
+        return self.get_prefilter()
+
+    def _candidates(self, matcher: RuleMatcher, text: str, regions: Optional[List[Tuple[int, int]]] = None
+                    ) -> Iterator[Tuple[int, int, int, Optional[str], List[Tuple[int, str, Optional[str]]]]]:
+        """Yield (start, end, first rule, replacement, steps) for each word a rule matches.
+
+        ``regions`` limits the scan to ascending (start, end) ranges of the text.
+        """
+        regions = regions if regions is not None else [(0, len(text))]
+        table = self.get_lookup_table() if self.engine == 'lookup' else None
+        if table is not None:
+            lookup = table.lookup
+            for region_start, region_end in regions:
+                for token in _WORD_TOKEN.finditer(text, region_start, region_end):
+                    resolved = lookup(token.group())
+                    if resolved is not None:
+                        yield (token.start(), token.end()) + resolved
+            return
+
+        scanner = self._document_matcher(matcher, text, regions)
+        for region_start, region_end in regions:
+            for match, index in scanner.scan(text, region_start, region_end):
+                start, end = match.span()
+                rule_match = matcher.regex_rules[index].match(text, start) if index in matcher.regex_rules else None
+                yield (start, end, index) + self._resolve_chain(matcher, index, match.group(0), rule_match)
+
+    def _changing_regions(self, data, prefilter: BytePrefilter,
+                          strict: bool = False) -> Optional[List[Tuple[int, int]]]:
+        """Return the prefilter's byte regions of a file, or None if no rule changes any of them.
+
+        Only the regions are decoded. With ``strict`` a rule whose
+        replacement equals the original word does not count as a change.
+        """
+        matcher = self.get_matcher()
+        regions = list(prefilter.regions(data))
+        for start, end in regions:
+            text = decode_text(data, start, end)
+            for word_start, word_end, _, replacement, _ in self._candidates(matcher, text):
+                if replacement is not None and not (strict and replacement == text[word_start:word_end]):
+                    return regions
+        return None
+
+    def _read_prefiltered(self, file_path: Path, prefilter: BytePrefilter, clean_digest: Optional[str],
+                          strict: bool = False) -> Tuple[Optional[str], str, Optional[List[Tuple[int, int]]]]:
+        """Read a file through the byte prefilter.
+
+        Returns (text, digest, regions) with the regions as text offsets; text
+        is None, and the file was not decoded, if its digest is clean_digest
+        or no rule can change it. With ``strict`` such a file is still checked
+        to be valid UTF-8, so a check never passes a file it could not read.
+        """
+        with map_file(file_path) as data:
+            digest = hash_bytes(data)
+            if digest == clean_digest:
+                return None, digest, None
+            regions = self._changing_regions(data, prefilter, strict)
+            if regions is None:
+                if strict:
+                    # Raises for a file that is not valid UTF-8
+                    str(data, 'utf-8')
+                return None, digest, None
+            text, text_regions = decode_regions(data, regions)
+        return text, digest, text_regions
+
+    def find_edits(self, text: str, spans: Optional[ProtectedSpans] = None,
+                   regions: Optional[List[Tuple[int, int]]] = None
+                   ) -> Tuple[List[Tuple[int, int, str]], List[Tuple[int, int, str, str]]]:
+        """Find the replacements for a text without building the converted output.
+
+        Returns (edits, records): ascending (start, end, replacement) edits and
+        (rule index, -start, original, replacement) records for each rule
+        applied. ``spans`` may pass in an index already built for this text
+        and ``regions`` the only ranges where rules can match.
+        """
+        matcher = self.get_matcher()
+        if spans is None:
+            spans = self.protected_spans(text)
+        profile = self.profile
+        records = []
+        edits = []
+        edit_rules = []
+
+        for start, end, index, replacement, steps in self._candidates(matcher, text, regions):
+            # Skip if within preserved context
+            if spans.overlaps(start, end):
+                if profile is not None:
+                    pattern = matcher.patterns[index]
+                    profile.record_match(self.rule_source(pattern), pattern, rejected=True)
+                continue
+
+            for index, original, changed in steps:
+                if profile is not None:
+                    pattern = matcher.patterns[index]
+                    profile.record_match(self.rule_source(pattern), pattern, rejected=changed is None)
+                if changed is not None:
+                    records.append((index, -start, original, changed))
+
+            if replacement is not None:
+                edits.append((start, end, replacement))
+                edit_rules.append(index)
+
+        if matcher.spanning and edits:
+            edits = self._rescan_spanning(matcher, text, edits, edit_rules, records)
+
+        if profile is not None:
+            self._profile_rule_scans(matcher, text)
+
+        return edits, records
+
+    def _rescan_spanning(self, matcher: RuleMatcher, text: str, edits: List[Tuple[int, int, str]],
+                         edit_rules: List[int], records: List[Tuple[int, int, str, str]]
+                         ) -> List[Tuple[int, int, str]]:
+        """Match multi-word rules against the phrases earlier rules rewrote.
+
+        The scan matches every rule against the original text, and a
+        rewritten word only against the later rules that match it whole.
+        Rules applied in table order also let a later multi-word rule match
+        a phrase an earlier rule made (``color scheme`` becomes ``colour
+        scheme``), so each such rule is matched again where an earlier
+        rule's edit lies inside its match. ``edit_rules`` gives the rule of
+        each edit; records are appended to ``records``.
+        """
+        for index in matcher.spanning:
+            if min(edit_rules) >= index:
+                continue
+            converted = apply_edits(text, edits)
+            regex = matcher.regex_rules.get(index) or re.compile(matcher.patterns[index], re.IGNORECASE)
+            outputs = []
+            delta = 0
+            for (start, end, replacement), rule in zip(edits, edit_rules):
+                if rule < index:
+                    outputs.append((start + delta, start + delta + len(replacement)))
+                delta += len(replacement) - (end - start)
+
+            found = []
+            spans = None
+            for match in regex.finditer(converted):
+                start, end = match.span()
+                if not any(out_start < end and start < out_end for out_start, out_end in outputs):
+                    continue
+                if spans is None:
+                    spans = self.protected_spans(converted)
+                if spans.overlaps(start, end):
+                    continue
+                replacement, steps = self._resolve_chain(matcher, index, match.group(0), match)
+                if replacement is not None:
+                    found.append((start, end, replacement, steps))
+
+            shift = 0
+            for start, end, replacement, steps in found:
+                start, end = start + shift, end + shift
+                shift += len(replacement) - (end - start)
+                position, edits, replaced = merge_edit(edits, apply_edits(text, edits), start, end, replacement)
+                rules = edit_rules[replaced.start:replaced.stop]
+                edit_rules[replaced.start:replaced.stop] = [min(rules + [index])]
+                records.extend((step, -edits[position][0], original, changed)
+                               for step, original, changed in steps if changed is not None)
+        return edits
+
+    def iter_violations(self, text: str, regions: Optional[List[Tuple[int, int]]] = None
+                        ) -> Iterator[Tuple[int, str, str]]:
+        """Yield (offset, original, suggested) for each word that would change, in order.
+
+        Nothing is rewritten, so stopping after the first result skips the
+        rest of the scan.
+        """
+        matcher = self.get_matcher()
+        spans = None
+        for start, end, _, replacement, _ in self._candidates(matcher, text, regions):
+            if replacement is None or replacement == text[start:end]:
+                continue
+            # Clean files usually have no candidates at all, so index protected
+            # contexts only once one needs checking
+            if spans is None:
+                spans = self.protected_spans(text)
+            if not spans.overlaps(start, end):
+                yield start, text[start:end], replacement
+
+    def check_text(self, text: str, path: str = '', fail_fast: bool = False,
+                   regions: Optional[List[Tuple[int, int]]] = None) -> List[Violation]:
+        """List the violations in a text with 1-based line and column numbers."""
+        violations = []
+        line = 1
+        line_start = 0
+        last = 0
+        for start, original, suggested in self.iter_violations(text, regions):
+            newlines = text.count('\n', last, start)
+            if newlines:
+                line += newlines
+                line_start = text.rfind('\n', last, start) + 1
+            last = start
+            violations.append(Violation(path, line, start - line_start + 1, original, suggested))
+            if fail_fast:
+                break
+        return violations
+
+    def check_file(self, file_path: Path, display_path: Optional[str] = None, fail_fast: bool = False,
+                   clean_digest: Optional[str] = None, lines: Optional[LineRanges] = None
+                   ) -> Tuple[List[Violation], bool, Optional[str]]:
+        """Check one file without converting it.
+
+        With ``lines`` only words on those line ranges are reported.
+        Returns (violations, failed, digest) where failed is True if the file
+        could not be read or decoded, and digest is the content hash if the
+        file is clean, or None otherwise.
+        """
+        prefilter = self._active_prefilter()
+        regions = None
+        try:
+            if prefilter is not None:
+                text, digest, regions = self._read_prefiltered(file_path, prefilter, clean_digest, strict=True)
+                if text is None:
+                    return [], False, digest
+            else:
+                text, digest = read_text_with_digest(file_path)
+        except Exception as e:
+            print(f"Error processing {file_path}: {e}", file=sys.stderr)
+            return [], True, None
+        if digest == clean_digest:
+            return [], False, digest
+        if lines is not None:
+            regions = _intersect_regions(regions or [(0, len(text))], line_regions(text, lines))
+            # Lines outside the ranges went unchecked, so the file is not known to be clean
+            return self.check_text(text, display_path or str(file_path), fail_fast, regions), False, None
+        violations = self.check_text(text, display_path or str(file_path), fail_fast, regions)
+        return violations, False, None if violations else digest
+
+    def find_files(self, directory: Path) -> Iterator[Path]:
+        """Yield the files to convert under directory, lazily and in sorted path order.
+
+        Build output, version control and anything the directory's ignore
+        files or ``exclude_patterns`` exclude are skipped (see file_discovery.py),
+        as is the report a previous run saved, which quotes the words it changed.
+        """
+        return iter_files(directory, self.target_extensions, exclude=self._excludes())
+
+    def _excludes(self) -> List[str]:
+        return [f'/{REPORT_NAME}.*', *self.exclude_patterns]
+
+    def _discover(self, directory: Path, cache: Optional[ContentCache],
+                  changed: Optional[Dict[Path, Optional[LineRanges]]] = None
+                  ) -> Iterator[Tuple[Path, str, Optional[str], Optional[LineRanges]]]:
+        """Yield (path, relative path, clean digest, changed lines) for each file to convert under directory.
+
+        With ``changed`` (see git_changes.changed_lines) only its files are
+        considered, without walking the tree; otherwise changed lines are None.
+        """
+        if changed is None:
+            files = self.find_files(directory)
+        else:
+            files = filter_files(directory, changed, self.target_extensions, exclude=self._excludes())
+        for file_path in files:
+            relative_path = str(file_path.relative_to(directory))
+            lines = changed.get(file_path) if changed else None
+            yield file_path, relative_path, cache.clean_digest(relative_path) if cache else None, lines
+
+    def check_directory(self, directory: Path, fail_fast: bool = False, jobs: int = 1,
+                        use_cache: bool = False, changed: Optional[Dict[Path, Optional[LineRanges]]] = None
+                        ) -> Tuple[List[Violation], List[str]]:
+        """Check every eligible file under directory, in sorted path order.
+
+        With ``fail_fast`` checking stops at the first violation found. With
+        ``changed`` only its files are checked, and only on their changed lines.
+        Returns the violations and the relative paths of files that could not
+        be read or decoded.
+        """
+        cache = ContentCache(directory, 'spelling_converter', self.ruleset_fingerprint()) if use_cache else None
+        entries = ((relative_path, file_path, relative_path, fail_fast, clean_digest, lines)
+                   for file_path, relative_path, clean_digest, lines in self._discover(directory, cache, changed))
+        worker = (_check_in_worker, _init_worker, (self.configuration(),)) if jobs > 1 else None
+        violations = []
+        failed = []
+
+        def report(relative_path, result):
+            file_violations, file_failed, _ = result
+            violations.extend(file_violations)
+            if file_failed:
+                failed.append(relative_path)
+            # A fail-fast run has not seen every file, so it stops without evicting entries
+            return fail_fast and bool(violations)
+
+        run_files(entries, lambda *arguments, batch: self.check_file(*arguments), report, jobs, worker,
+                  cache, partial=changed is not None)
+        return violations, failed
 
     def convert_text(self, text: str) -> Tuple[str, List[str]]:
         """Convert American spelling to British spelling in text."""
-        changes = []
-        result = text
-
-        # Choose mappings based on mode
-        if self.mode == 'safe':
-            mappings = {**self.safe_mappings, **self.custom_mappings}
-        elif self.mode == 'regex':
-            mappings = {**self.pattern_mappings, **self.custom_mappings}
-        else:  # hybrid mode
-            mappings = {**self.safe_mappings, **self.pattern_mappings, **self.custom_mappings}
-
-        for american_pattern, british_replacement in mappings.items():
-            pattern = re.compile(american_pattern, re.IGNORECASE)
+        edits, records = self.find_edits(text)
 
-            # Find all matches first
-            matches = list(pattern.finditer(result))
+        # Edits come from one left-to-right scan, so they never overlap
+        result = apply_edits(text, edits)
 
-            # Process matches in reverse order to maintain positions
-            for match in reversed(matches):
-                start, end = match.span()
+        # Report changes rule by rule, as the table is applied
+        records.sort(key=lambda record: record[:2])
+        changes = [f"{original} → {replacement}" for _, _, original, replacement in records]
 
-                # Skip if within preserved context
-                if self.should_preserve_context(result, start, end):
-                    continue
+        return result, changes
 
-                original = match.group(0)
+    def convert_records(self, text: str, regions: Optional[List[Tuple[int, int]]] = None
+                        ) -> Tuple[str, ChangeList]:
+        """Convert text, describing the changes as compact records with positions."""
+        edits, records = self.find_edits(text, regions=regions)
+        return apply_edits(text, edits), _change_list(_numbered(text, records))
+
+    def _batch_executor(self, executor: str, jobs: int) -> Executor:
+        """Create the pool used by convert_many and aconvert_many."""
+        if executor == 'thread':
+            # Threads share this converter, so build its matcher before they start
+            self.get_matcher()
+            if self.engine == 'lookup':
+                self.get_lookup_table()
+            return ThreadPoolExecutor(max_workers=jobs)
+        if executor == 'process':
+            return ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                       initargs=(self.configuration(),))
+        raise ValueError(f"Unknown executor: {executor!r} (use None, 'thread' or 'process')")
+
+    def convert_many(self, documents: Iterable[Tuple[Hashable, str]], executor: Optional[str] = None,
+                     jobs: Optional[int] = None, max_pending: Optional[int] = None
+                     ) -> Iterator[Tuple[Hashable, str, List[str]]]:
+        """Convert (id, text) pairs lazily, yielding (id, converted, changes) in input order.
+
+        With ``executor`` None documents are converted one at a time in this
+        thread; 'thread' or 'process' spreads them over ``jobs`` workers.
+        At most ``max_pending`` documents (default twice ``jobs``) are in
+        flight, so the input is only read as fast as results are consumed.
+        """
+        if executor is None:
+            for doc_id, text in documents:
+                yield (doc_id,) + self.convert_text(text)
+            return
 
-                # Skip if word is in exceptions list (for regex patterns)
-                if self.mode in ['regex', 'hybrid'] and original.lower() in self.exceptions:
-                    continue
+        jobs = jobs or os.cpu_count() or 1
+        max_pending = max_pending or 2 * jobs
+        convert = self.convert_text if executor == 'thread' else _convert_in_worker
+        pool = self._batch_executor(executor, jobs)
+        pending = deque()
+        try:
+            for doc_id, text in documents:
+                if len(pending) >= max_pending:
+                    done_id, future = pending.popleft()
+                    yield (done_id,) + future.result()
+                pending.append((doc_id, pool.submit(convert, text)))
+            while pending:
+                done_id, future = pending.popleft()
+                yield (done_id,) + future.result()
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    async def aconvert_many(self, documents: Union[AsyncIterable[Tuple[Hashable, str]],
+                                                   Iterable[Tuple[Hashable, str]]],
+                            executor: str = 'thread', jobs: Optional[int] = None,
+                            max_pending: Optional[int] = None) -> AsyncIterator[Tuple[Hashable, str, List[str]]]:
+        """Async counterpart of convert_many for async or plain iterables of (id, text) pairs.
+
+        Conversions always run in a 'thread' or 'process' pool so the event
+        loop is never blocked; back-pressure works as in convert_many.
+        """
+        loop = asyncio.get_running_loop()
+        jobs = jobs or os.cpu_count() or 1
+        max_pending = max_pending or 2 * jobs
+        convert = self.convert_text if executor == 'thread' else _convert_in_worker
+        pool = self._batch_executor(executor, jobs)
+        pending = deque()
+        try:
+            async for doc_id, text in _aiterate(documents):
+                if len(pending) >= max_pending:
+                    done_id, future = pending.popleft()
+                    yield (done_id,) + await future
+                pending.append((doc_id, loop.run_in_executor(pool, convert, text)))
+            while pending:
+                done_id, future = pending.popleft()
+                yield (done_id,) + await future
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def safe_cut(self, text: str) -> int:
+        """Return the offset after the last line break where the text can be split.
+
+        A split is safe when no preserved context can span it, so converting
+        the two parts separately gives the same result as converting the
+        whole text. Returns 0 when there is no such point at the last line break.
+        """
+        cut = text.rfind('\n') + 1
+        if not cut:
+            return 0
+
+        for preserve_regex, opener_regex in self.compiled_openers:
+            # Resume where this pattern's last complete match ends, as finditer would
+            last_end = 0
+            for _, last_end in self.preserve_scanners[preserve_regex.pattern](text[:cut]):
+                pass
+            if opener_regex.search(text, last_end, cut):
+                return 0
+        return cut
+
+    def convert_stream(self, source, sink=None) -> Tuple[ChangeList, bool]:
+        """Convert text read from ``source`` in bounded chunks, writing it to ``sink``.
+
+        Chunks are only converted up to a safe cut, so open code fences, tags,
+        front matter and other preserved contexts carry over to the next chunk.
+        Returns (changes, modified), with changes ordered as convert_text would.
+        """
+        records = []
+        modified = False
+        pending = ''
+        offset = 0
+        line = 1
+        retry_at = 0
+
+        while True:
+            chunk = source.read(self.chunk_size)
+            pending += chunk
+
+            # An unfinished context keeps the pending text; only retry once it has doubled
+            cut = len(pending) if not chunk else (self.safe_cut(pending) if len(pending) >= retry_at else 0)
+            if cut:
+                part = pending[:cut]
+                prefilter = self._active_prefilter()
+                regions = prefilter.text_regions(part) if prefilter is not None else None
+                edits, part_records = self.find_edits(part, regions=regions)
+                records.extend(_numbered(part, part_records, offset, line))
+                line += part.count('\n')
+                if any(part[start:end] != replacement for start, end, replacement in edits):
+                    modified = True
+                if sink is not None:
+                    sink.write(apply_edits(part, edits))
+                pending = pending[cut:]
+                offset += cut
+                retry_at = 0
+            elif chunk:
+                retry_at = 2 * len(pending)
+
+            if not chunk:
+                break
+
+        return _change_list(records), modified
+
+    def ruleset_fingerprint(self) -> str:
+        """Fingerprint the mode, rule tables and word list for cache invalidation."""
+        def describe(value):
+            if callable(value):
+                code = value.__code__
+                return [code.co_code.hex(), repr(code.co_consts)]
+            return value
+
+        ruleset = {
+            'source': hashlib.sha256(Path(__file__).read_bytes()).hexdigest(),
+            'lexer': hashlib.sha256(Path(preserve_lexer.__file__).read_bytes()).hexdigest(),
+            'prefilter': hashlib.sha256(Path(byte_prefilter.__file__).read_bytes()).hexdigest(),
+            'rule_table': hashlib.sha256(Path(rule_table.__file__).read_bytes()).hexdigest(),
+            'mode': self.mode,
+            'tables': [[[pattern, describe(value)] for pattern, value in table.items()]
+                       for table in (self.safe_mappings, self.pattern_mappings, self.custom_mappings)],
+            'exceptions': sorted(self.exceptions),
+            'preserve_contexts': self.preserve_contexts,
+        }
+        return hashlib.sha256(json.dumps(ruleset).encode('utf-8')).hexdigest()
 
-                # Handle callable replacements (for complex patterns)
-                if callable(british_replacement):
-                    replacement = british_replacement(match)
-                else:
-                    # Handle regex substitution patterns
-                    if '\\1' in british_replacement:
-                        replacement = re.sub(american_pattern, british_replacement, original, flags=re.IGNORECASE)
-                    else:
-                        # Preserve original case for explicit mappings
-                        if original.isupper():
-                            replacement = british_replacement.upper()
-                        elif original.istitle():
-                            replacement = british_replacement.title()
-                        else:
-                            replacement = british_replacement
+    def process_file(self, file_path: Path, dry_run: bool = False) -> Tuple[bool, ChangeList]:
+        """Process a single file for spelling conversion."""
+        changed, changes, _ = self.process_file_cached(file_path, dry_run)
+        return changed, changes
 
-                result = result[:start] + replacement + result[end:]
-                changes.append(f"{original} → {replacement}")
+    def process_file_cached(self, file_path: Path, dry_run: bool = False, clean_digest: Optional[str] = None,
+                            batch: Optional[WriteBatch] = None) -> Tuple[bool, ChangeList, Optional[str]]:
+        """Process a file unless its content hash matches a known-clean ``clean_digest``.
 
-        return result, changes
+        A written file joins ``batch``, if given, and is synced when it flushes.
+        Returns (changed, changes, digest) where digest is the content hash if
+        the file needs no conversion, or None otherwise.
+        """
+        if self.profile is None:
+            return self._process_file_cached(file_path, dry_run, clean_digest, batch)
 
-    def process_file(self, file_path: Path, dry_run: bool = False) -> Tuple[bool, List[str]]:
-        """Process a single file for spelling conversion."""
+        started = time.perf_counter()
+        try:
+            return self._process_file_cached(file_path, dry_run, clean_digest, batch)
+        finally:
+            try:
+                size = file_path.stat().st_size
+            except OSError:
+                size = 0
+            self.profile.record_file(file_path, started, time.perf_counter() - started, size)
+
+    def _process_file_cached(self, file_path: Path, dry_run: bool, clean_digest: Optional[str],
+                             batch: Optional[WriteBatch]) -> Tuple[bool, ChangeList, Optional[str]]:
         try:
-            # Read file with UTF-8 encoding
-            with open(file_path, 'r', encoding='utf-8') as f:
-                original_content = f.read()
+            if file_path.stat().st_size > self.stream_threshold:
+                return self._process_file_streaming(file_path, dry_run, clean_digest, batch)
+
+            # Read file with UTF-8 encoding, skipping it undecoded if no rule can change it
+            prefilter = self._active_prefilter()
+            regions = None
+            if prefilter is not None:
+                original_content, digest, regions = self._read_prefiltered(file_path, prefilter, clean_digest)
+                if original_content is None:
+                    return False, ChangeList(), digest
+            else:
+                original_content, digest = read_text_with_digest(file_path)
+                if digest == clean_digest:
+                    return False, ChangeList(), digest
 
             # Convert spelling
-            converted_content, changes = self.convert_text(original_content)
+            converted_content, changes = self.convert_records(original_content, regions)
 
-            # Only write if changes were made and not in dry-run mode
+            # Only write if changes were made and not in dry-run mode; files whose
+            # bytes would stay the same keep their mtime
             if changes:
                 if not dry_run:
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(converted_content)
-                return True, changes
+                    write_text(file_path, converted_content, digest, batch)
+                return True, changes, digest if converted_content == original_content else None
 
-            return False, []
+            return False, ChangeList(), digest
 
         except Exception as e:
             print(f"Error processing {file_path}: {e}")
-            return False, []
+            return False, ChangeList(), None
+
+    def _process_file_streaming(self, file_path: Path, dry_run: bool, clean_digest: Optional[str],
+                                batch: Optional[WriteBatch]) -> Tuple[bool, ChangeList, Optional[str]]:
+        """Convert a large file chunk by chunk through an atomically renamed temp file."""
+        # Check the cache and the byte prefilter before converting anything
+        prefilter = self._active_prefilter()
+        if prefilter is not None or clean_digest is not None:
+            with map_file(file_path) as data:
+                digest = hash_bytes(data)
+                if digest == clean_digest or (prefilter is not None
+                                              and self._changing_regions(data, prefilter) is None):
+                    return False, ChangeList(), digest
+
+        source, reader = open_hashed_text(file_path)
+        output = None if dry_run else AtomicTextFile(file_path, batch)
+        try:
+            with source:
+                changes, modified = self.convert_stream(source, output)
+        except BaseException:
+            if output is not None:
+                output.discard()
+            raise
+
+        if output is not None:
+            if changes:
+                output.commit(reader.hexdigest())
+            else:
+                output.discard()
+
+        if changes:
+            return True, changes, None if modified else reader.hexdigest()
+        return False, ChangeList(), reader.hexdigest()
+
+    def process_directory(self, directory: Path, dry_run: bool = False, jobs: int = 1,
+                          use_cache: bool = False, changed: Optional[Dict[Path, Optional[LineRanges]]] = None
+                          ) -> ChangeSummary:
+        """Process all eligible files in directory and subdirectories.
+
+        With ``jobs`` above 1 files are converted in a process pool; results are
+        merged back in sorted path order so reports do not depend on timing.
+        With ``use_cache`` files whose content was already clean under the
+        current ruleset are skipped. Changes are folded into a ChangeSummary
+        file by file, so only counters and a few examples per file are kept.
+        With ``changed`` only its files are converted, each as a whole.
+        """
+        all_changes = ChangeSummary(self.get_matcher().patterns)
+        cache = ContentCache(directory, 'spelling_converter', self.ruleset_fingerprint()) if use_cache else None
+        entries = ((relative_path, file_path, dry_run, clean_digest)
+                   for file_path, relative_path, clean_digest, _ in self._discover(directory, cache, changed))
+        worker = (_process_in_worker, _init_worker, (self.configuration(),)) if jobs > 1 else None
+
+        def report(relative_path, result):
+            file_changed, file_changes, _ = result
+            if file_changed:
+                all_changes.add(relative_path, file_changes)
+                if dry_run:
+                    print(f"Would update: {relative_path} ({len(file_changes)} changes)")
+                else:
+                    print(f"✓ Updated: {relative_path} ({len(file_changes)} changes)")
+            return False
 
-    def process_directory(self, directory: Path, dry_run: bool = False) -> Dict[str, List[str]]:
-        """Process all eligible files in directory and subdirectories."""
-        all_changes = {}
+        run_files(entries, self.process_file_cached, report, jobs, worker, cache,
+                  partial=changed is not None, save=not dry_run)
+        return all_changes
 
-        for file_path in directory.rglob('*'):
-            if file_path.is_file() and file_path.suffix in self.target_extensions:
-                changed, file_changes = self.process_file(file_path, dry_run)
+    def watch(self, path: Path, dry_run: bool = False, interval: float = 0.1, debounce: float = 0.2) -> None:
+        """Convert files under path as they are saved, until interrupted.
 
-                if changed:
-                    relative_path = file_path.relative_to(directory)
-                    all_changes[str(relative_path)] = file_changes
-                    if dry_run:
-                        print(f"Would update: {relative_path} ({len(file_changes)} changes)")
-                    else:
-                        print(f"✓ Updated: {relative_path} ({len(file_changes)} changes)")
+        The matcher and word list stay loaded between saves, so each batch
+        only pays for reading and converting the files that changed.
+        """
+        self.get_matcher()
+        if self.engine == 'lookup':
+            self.get_lookup_table()
+        watcher = PollingWatcher(path, self.find_files, interval, debounce)
+        print(f"Watching {path} for changes (Ctrl+C to stop)")
 
-        return all_changes
+        try:
+            for batch in watcher.batches():
+                for file_path in batch:
+                    name = file_path.relative_to(path) if path.is_dir() else file_path.name
+                    started = time.perf_counter()
+                    changed, changes = self.process_file(file_path, dry_run)
+                    elapsed = (time.perf_counter() - started) * 1000
+
+                    if changed:
+                        # Our own write must not count as the next change
+                        watcher.acknowledge(file_path)
+                        print(f"{'Would update' if dry_run else '✓ Updated'}: {name} "
+                              f"({len(changes)} changes, {elapsed:.1f} ms)")
+                        for change in changes:
+                            print(f"  • {change}")
+                    else:
+                        print(f"No changes needed: {name} ({elapsed:.1f} ms)")
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
 
-    def generate_report(self, changes: Dict[str, List[str]]) -> str:
+    def generate_report(self, changes: Union[ChangeSummary, Dict[str, List[str]]]) -> str:
         """Generate a summary report of all changes made."""
         if not changes:
             return "No spelling changes needed."
+        if isinstance(changes, ChangeSummary):
+            return '\n'.join(changes.iter_text()) + '\n'
 
         report = f"Spelling Conversion Report\n{'='*50}\n\n"
         report += f"Files processed: {len(changes)}\n"
@@ -384,35 +1761,207 @@ class SpellingConverter:
 
         return report
 
+def _intersect_regions(first: List[Tuple[int, int]], second: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Return the overlaps of two ascending lists of (start, end) ranges, in order."""
+    overlaps = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if start < end:
+            overlaps.append((start, end))
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return overlaps
+
+def _numbered(text: str, records: List[Tuple[int, int, str, str]], offset: int = 0,
+              first_line: int = 1) -> List[Tuple[int, int, str, str, int]]:
+    """Add line numbers to find_edits records, shifting them by a chunk's offset and first line."""
+    lines = {}
+    line = first_line
+    last = 0
+    for start in sorted({-position for _, position, _, _ in records}):
+        line += text.count('\n', last, start)
+        last = start
+        lines[start] = line
+    return [(index, position - offset, original, replacement, lines[-position])
+            for index, position, original, replacement in records]
+
+def _change_list(records: List[Tuple[int, int, str, str, int]]) -> ChangeList:
+    """Build a ChangeList ordered rule by rule, as the table is applied."""
+    records.sort(key=lambda record: record[:2])
+    changes = ChangeList()
+    for index, position, original, replacement, line in records:
+        changes.append(-position, line, index, original, replacement)
+    return changes
+
+# Converter owned by each process pool worker, built once from the parent's configuration
+_worker_converter = None
+
+def _init_worker(configuration: Dict[str, object]) -> None:
+    """Build the worker's converter once when the pool starts."""
+    global _worker_converter
+    _worker_converter = SpellingConverter.from_configuration(configuration)
+    _worker_converter.get_matcher()
+
+def _process_in_worker(file_path: Path, dry_run: bool,
+                       clean_digest: Optional[str]) -> Tuple[bool, ChangeList, Optional[str]]:
+    """Process one file with the worker's converter."""
+    return _worker_converter.process_file_cached(file_path, dry_run, clean_digest)
+
+def _check_in_worker(file_path: Path, display_path: str, fail_fast: bool, clean_digest: Optional[str],
+                     lines: Optional[LineRanges] = None) -> Tuple[List[Violation], bool, Optional[str]]:
+    """Check one file with the worker's converter."""
+    return _worker_converter.check_file(file_path, display_path, fail_fast, clean_digest, lines)
+
+def _convert_in_worker(text: str) -> Tuple[str, List[str]]:
+    """Convert one in-memory document with the worker's converter."""
+    return _worker_converter.convert_text(text)
+
+async def _aiterate(items):
+    """Iterate an async or plain iterable asynchronously."""
+    if hasattr(items, '__aiter__'):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+def compile_main(argv: List[str]) -> None:
+    """Compile a text word list for fast loading (``compile-wordlist`` subcommand)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='spelling_converter.py compile-wordlist',
+                                     description='Compile a word list into the fast-loading '
+                                                 f'{COMPILED_SUFFIX} format')
+    parser.add_argument('source', help='Word list file (CSV, JSON, or TXT format)')
+    parser.add_argument('--output', '-o', type=str,
+                       help=f'Compiled file to write (default: source with a {COMPILED_SUFFIX} suffix)')
+    args = parser.parse_args(argv)
+
+    source = Path(args.source)
+    output = Path(args.output) if args.output else source.with_suffix(COMPILED_SUFFIX)
+    if source.suffix.lower() not in WORD_LIST_LOADERS:
+        print(f"Error: {source} is not a text word list (.csv, .json, .txt, .list)")
+        sys.exit(1)
+    if not source.exists():
+        print(f"Error: {source} does not exist")
+        sys.exit(1)
+
+    converter = SpellingConverter()
+    getattr(converter, WORD_LIST_LOADERS[source.suffix.lower()])(source)
+    count = compile_word_list(converter.custom_mappings, source, output)
+    print(f"Compiled {count} word mappings to: {output}")
+
 def main():
     """Main function to run the spelling converter."""
     import argparse
 
+    if sys.argv[1:2] == ['compile-wordlist']:
+        compile_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(description='Convert American spelling to Australian-British spelling')
     parser.add_argument('path', help='Directory or file path to process')
     parser.add_argument('--mode', choices=['safe', 'regex', 'hybrid'], default='hybrid',
                        help='Conversion mode: safe (explicit mappings only), regex (pattern-based), hybrid (both)')
     parser.add_argument('--wordlist', '-w', type=str,
-                       help='Custom word list file (CSV, JSON, or TXT format)')
+                       help='Custom word list file (CSV, JSON, TXT, or compiled .spwl format)')
     parser.add_argument('--dry-run', action='store_true',
                        help='Show what would be changed without making modifications')
+    parser.add_argument('--engine', choices=['regex', 'lookup'], default='regex',
+                       help='Rule engine: regex (combined pattern scan) or lookup (split text into words '
+                            'and look each up; cost independent of word list size)')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                       help='Number of files to convert in parallel (default: CPU count)')
+    parser.add_argument('--stream', action='store_true',
+                       help='Convert files in bounded chunks regardless of size to keep memory use flat')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Re-check every file instead of skipping files known to be clean')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                       help='Skip paths matching this gitignore-style pattern (repeatable; '
+                            'prefix with ! to include a path again)')
+    parser.add_argument('--changed', nargs='?', const='', metavar='REF',
+                       help='Only process files git reports as modified, staged or untracked, or that '
+                            'differ from the merge base with REF; --check then reports only changed lines')
+    parser.add_argument('--profile', action='store_true',
+                       help='Time every rule, preserve pattern and file; print the slowest and save '
+                            'JSON loadable as a Chrome trace. Implies --jobs 1 and --no-cache')
+    parser.add_argument('--profile-output', metavar='FILE',
+                       help='Where --profile saves its JSON (default: spelling_profile.json); implies --profile')
+    parser.add_argument('--check', action='store_true',
+                       help='Only report words that would change, with their line and column; '
+                            'exit with status 1 if there are any (for CI)')
+    parser.add_argument('--format', choices=sorted(FORMATTERS), default='text',
+                       help='With --check, the report format (default: text)')
+    parser.add_argument('--report-format', choices=['json', 'text'], default='text',
+                       help='Format of the saved directory report (default: text)')
+    parser.add_argument('--fail-fast', action='store_true',
+                       help='With --check, stop at the first violation')
+    parser.add_argument('--watch', action='store_true',
+                       help='Keep running and convert files as they are saved (e.g. during quarto preview)')
+    parser.add_argument('--debounce', type=float, default=0.2, metavar='SECONDS',
+                       help='With --watch, wait this long after the last save before converting (default: 0.2)')
 
     args = parser.parse_args()
     path = Path(args.path)
+    if args.watch and args.changed is not None:
+        parser.error('--changed cannot be combined with --watch')
 
     if not path.exists():
         print(f"Error: {path} does not exist")
         sys.exit(1)
 
+    touched = None
+    if args.changed is not None:
+        try:
+            touched = changed_lines(path if path.is_dir() else path.parent, args.changed or None)
+        except GitError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
     converter = SpellingConverter(mode=args.mode)
+    converter.engine = args.engine
+    converter.exclude_patterns = args.exclude
+    if args.stream:
+        converter.stream_threshold = 0
+    if args.profile or args.profile_output:
+        # Profiles are collected in this process, and cached files would go untimed
+        converter.profile = ConversionProfile()
+        args.jobs = 1
+        args.no_cache = True
 
     # Load custom word list if provided
     if args.wordlist:
-        wordlist_path = Path(args.wordlist)
-        print(f"Loading custom word list: {wordlist_path}")
-        converter.load_word_list(wordlist_path)
-        custom_count = len(converter.custom_mappings)
-        print(f"Loaded {custom_count} custom word mappings")
+        # Keep stdout clean for machine-readable check reports
+        with contextlib.redirect_stdout(sys.stderr if args.check else sys.stdout):
+            wordlist_path = Path(args.wordlist)
+            print(f"Loading custom word list: {wordlist_path}")
+            converter.load_word_list(wordlist_path)
+            custom_count = len(converter.custom_mappings)
+            print(f"Loaded {custom_count} custom word mappings")
+            for conflict in converter.get_rule_table().conflicts:
+                print(f"Warning: {conflict}")
+
+    if args.check:
+        if path.is_file():
+            if touched is None or path in touched:
+                violations, failed, _ = converter.check_file(path, str(path), args.fail_fast,
+                                                             lines=touched.get(path) if touched else None)
+            else:
+                violations, failed = [], False
+        else:
+            violations, failed = converter.check_directory(path, args.fail_fast, jobs=max(1, args.jobs),
+                                                           use_cache=not args.no_cache, changed=touched)
+        print(FORMATTERS[args.format](violations))
+        # A file that could not be read was not checked, so the check cannot pass
+        sys.exit(1 if violations or failed else 0)
+
+    if args.watch:
+        converter.watch(path, args.dry_run, debounce=args.debounce)
+        return
 
     if path.is_file():
         # Single file mode
@@ -423,7 +1972,10 @@ def main():
         print(f"Mode: {args.mode}")
         print("=" * 60)
 
-        changed, file_changes = converter.process_file(path, args.dry_run)
+        if touched is None or path in touched:
+            changed, file_changes = converter.process_file(path, args.dry_run)
+        else:
+            changed, file_changes = False, []
 
         if changed:
             if args.dry_run:
@@ -446,7 +1998,8 @@ def main():
         print(f"Mode: {args.mode}")
         print("=" * 60)
 
-        changes = converter.process_directory(path, args.dry_run)
+        changes = converter.process_directory(path, args.dry_run, jobs=max(1, args.jobs),
+                                               use_cache=not args.no_cache, changed=touched)
 
         print("\n" + "=" * 60)
         report = converter.generate_report(changes)
@@ -456,9 +2009,9 @@ def main():
 
         # Save detailed report only if not dry run
         if not args.dry_run and changes:
-            report_file = path / "spelling_conversion_report.txt"
+            report_file = path / f"{REPORT_NAME}.{args.report_format.replace('text', 'txt')}"
             with open(report_file, 'w', encoding='utf-8') as f:
-                f.write(converter.generate_report(changes))
+                changes.write(f, args.report_format)
             print(f"Detailed report saved to: {report_file}")
         elif args.dry_run and changes:
             print("\nDry run complete. No files were modified.")
@@ -466,5 +2019,11 @@ def main():
         print(f"Error: {path} is neither a file nor a directory")
         sys.exit(1)
 
+    if converter.profile is not None:
+        print("\n" + converter.profile.format_table())
+        profile_path = Path(args.profile_output or 'spelling_profile.json')
+        converter.profile.save(profile_path)
+        print(f"\nProfile saved to: {profile_path}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Streaming file helpers shared by the text-processing scripts.
+Reads large files in bounded chunks while hashing their bytes, and writes
+results through a temporary file that atomically replaces the original,
+leaving files whose bytes would not change untouched.
+"""
+
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import List, Optional, TextIO, Tuple
+
+# Files larger than this are streamed instead of read whole
+STREAM_THRESHOLD = 8 * 1024 * 1024
+
+# Characters read per chunk when streaming
+CHUNK_SIZE = 1024 * 1024
+
+
+class HashingReader(io.RawIOBase):
+    """Binary reader that hashes every byte passing through it."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.hash = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self.raw.readinto(buffer)
+        if count:
+            self.hash.update(memoryview(buffer)[:count])
+        return count
+
+    def close(self) -> None:
+        self.raw.close()
+        super().close()
+
+    def hexdigest(self) -> str:
+        """Hash of the bytes read so far (the whole file once exhausted)."""
+        return self.hash.hexdigest()
+
+
+def open_hashed_text(file_path: Path):
+    """Open a UTF-8 file for streaming reads that also hash its bytes.
+
+    Returns (text_stream, reader); newlines are translated as with
+    ``open(file_path, 'r')`` and ``reader.hexdigest()`` gives the content hash.
+    """
+    reader = HashingReader(open(file_path, 'rb'))
+    stream = io.TextIOWrapper(io.BufferedReader(reader), encoding='utf-8')
+    return stream, reader
+
+
+class HashingWriter(io.RawIOBase):
+    """Binary writer that hashes every byte passing through it."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.hash = hashlib.sha256()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        count = self.raw.write(data)
+        if count:
+            self.hash.update(memoryview(data)[:count])
+        return count
+
+    def fileno(self) -> int:
+        return self.raw.fileno()
+
+    def close(self) -> None:
+        self.raw.close()
+        super().close()
+
+    def hexdigest(self) -> str:
+        """Hash of the bytes written so far."""
+        return self.hash.hexdigest()
+
+
+def _fsync(path) -> None:
+    """Flush a file's or directory's data to disk, where the platform allows it."""
+    try:
+        handle = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(handle)
+    except OSError:
+        pass
+    finally:
+        os.close(handle)
+
+
+def _copy_mode(temp_path: str, target: Path) -> None:
+    """Give a temporary file the target's permissions, or the umask default for a new file."""
+    try:
+        shutil.copymode(target, temp_path)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp_path, 0o666 & ~umask)
+    except OSError:
+        pass
+
+
+class WriteBatch:
+    """Atomic writes whose fsyncs are made together when the batch is flushed.
+
+    Committed files stay in their temporary files until ``flush``, which
+    syncs them all, renames each over its target and then syncs every
+    directory renamed into once. Used as a context manager it flushes on
+    exit, so files finished before an error still land.
+    """
+
+    def __init__(self):
+        self.pending: List[Tuple[str, Path]] = []
+
+    def add(self, temp_path: str, target: Path) -> None:
+        self.pending.append((temp_path, target))
+
+    def flush(self) -> None:
+        """Sync and rename every committed file, then sync their directories."""
+        pending, self.pending = self.pending, []
+        for temp_path, _ in pending:
+            _fsync(temp_path)
+        for temp_path, target in pending:
+            os.replace(temp_path, target)
+        for directory in dict.fromkeys(target.parent for _, target in pending):
+            _fsync(directory)
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def __enter__(self) -> 'WriteBatch':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+
+
+class AtomicTextFile:
+    """Text file written beside its target and renamed over it on commit.
+
+    A symlinked target is resolved first, so the file it points to is
+    replaced and the link is kept. Without a ``batch`` the data and the
+    rename are synced to disk on commit; with one both are left to
+    ``WriteBatch.flush``.
+    """
+
+    def __init__(self, file_path: Path, batch: Optional[WriteBatch] = None):
+        self.path = Path(os.path.realpath(file_path))
+        self.batch = batch
+        handle, self.temp_path = tempfile.mkstemp(prefix=f'.{self.path.name}.', suffix='.tmp',
+                                                  dir=self.path.parent)
+        _copy_mode(self.temp_path, self.path)
+        self.writer = HashingWriter(io.FileIO(handle, 'w'))
+        self.file: Optional[TextIO] = io.TextIOWrapper(io.BufferedWriter(self.writer), encoding='utf-8')
+
+    def write(self, text: str) -> None:
+        self.file.write(text)
+
+    def commit(self, unchanged_digest: Optional[str] = None) -> bool:
+        """Replace the target with everything written so far.
+
+        If the bytes written hash to ``unchanged_digest`` (the target's own
+        content hash) the target is left untouched and False is returned.
+        """
+        self.file.close()
+        if unchanged_digest is not None and self.writer.hexdigest() == unchanged_digest:
+            self._unlink()
+            return False
+        if self.batch is not None:
+            self.batch.add(self.temp_path, self.path)
+            return True
+        _fsync(self.temp_path)
+        os.replace(self.temp_path, self.path)
+        _fsync(self.path.parent)
+        return True
+
+    def discard(self) -> None:
+        """Drop the temporary file and leave the target untouched."""
+        self.file.close()
+        self._unlink()
+
+    def _unlink(self) -> None:
+        try:
+            os.unlink(self.temp_path)
+        except FileNotFoundError:
+            pass
+
+
+def encode_text(text: str) -> bytes:
+    """Encode text as ``open(file_path, 'w', encoding='utf-8')`` would write it."""
+    if os.linesep != '\n':
+        text = text.replace('\n', os.linesep)
+    return text.encode('utf-8')
+
+
+def write_text(file_path: Path, text: str, unchanged_digest: Optional[str] = None,
+               batch: Optional[WriteBatch] = None) -> bool:
+    """Atomically replace a file with text, unless that leaves its bytes as they are.
+
+    ``unchanged_digest`` is the file's content hash if the caller already
+    has it; otherwise the file is read back to compare. Returns True if the
+    file was (or, with a batch, will be) replaced.
+    """
+    data = encode_text(text)
+    if unchanged_digest is not None:
+        if hashlib.sha256(data).hexdigest() == unchanged_digest:
+            return False
+    else:
+        try:
+            if os.stat(file_path).st_size == len(data) and Path(file_path).read_bytes() == data:
+                return False
+        except OSError:
+            pass
+
+    output = AtomicTextFile(file_path, batch)
+    try:
+        output.write(text)
+    except BaseException:
+        output.discard()
+        raise
+    return output.commit()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The scripts are run directly rather than installed, so import them by path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
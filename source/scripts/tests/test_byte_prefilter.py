@@ -0,0 +1,77 @@
+import random
+import re
+
+from byte_prefilter import BytePrefilter
+from spelling_converter import SpellingConverter
+
+WORDS = ['color', 'center', 'kitchen', 'sis', 'café', 'straße', 'colour scheme']
+
+# Spellings that re.IGNORECASE str patterns treat as one of WORDS, and near misses
+PIECES = ['color', 'COLOR', 'CoLoR', 'colors', 'xcolor', 'color_', 'Center', 'CENTER',
+          'Kitchen', 'KITCHEN', '\u212aitchen', 'ſiſ', 'SİS', 'café', 'CAFÉ', 'cafe', 'straße', 'STRASSE',
+          'colour scheme', 'COLOUR  SCHEME', 'colour\nscheme', 'naïve', '😀', 'Ünïcödé',
+          ' ', '\u00a0', '\n', '\r\n', '\r', '.', '-', "'", '\t', '`', '#']
+
+
+def _matches(word, text):
+    return [match.span() for match in re.finditer(rf'\b{re.escape(word)}\b', text, re.IGNORECASE)]
+
+
+def _covered(span, regions):
+    return any(start <= span[0] and span[1] <= end for start, end in regions)
+
+
+def test_regions_hold_every_case_insensitive_match():
+    generator = random.Random(18)
+    for block_size in (4, 16, 1024):
+        prefilter = BytePrefilter(WORDS, block_size=block_size)
+        for _ in range(300):
+            text = ''.join(generator.choice(PIECES) for _ in range(generator.randrange(1, 30)))
+            regions = prefilter.text_regions(text)
+            for word in WORDS:
+                for span in _matches(word, text):
+                    assert _covered(span, regions), (word, text, regions)
+
+
+def test_folded_letters_are_searched_too():
+    prefilter = BytePrefilter(['kitchen', 'sis', 'bin'])
+
+    for word, text in (('kitchen', 'The \u212aitchen.'), ('sis', 'A ſiſ.'), ('bin', 'The BİN.'), ('bin', 'A bın.')):
+        spans = _matches(word, text)
+        assert spans, text
+        assert all(_covered(span, prefilter.text_regions(text)) for span in spans), text
+
+
+def test_text_without_any_word_has_no_regions():
+    prefilter = BytePrefilter(WORDS)
+
+    assert prefilter.text_regions('The colour of the centre, naïve Ünïcödé 😀.\r\n') == []
+    assert list(prefilter.regions(b'')) == []
+
+
+def test_prefiltered_files_convert_exactly_as_whole_files(tmp_path):
+    generator = random.Random(1018)
+    converters = {}
+    for prefilter in (False, True):
+        converter = SpellingConverter(mode='hybrid')
+        converter.prefilter = prefilter
+        converter.custom_mappings[r'\bcafé\b'] = 'coffee house'
+        converter.custom_mappings[r'\bStraße\b'] = 'street'
+        converter.custom_mappings[r'\bcolour scheme\b'] = 'palette'
+        converter.custom_mappings[r'\bkitchen\b'] = 'galley'
+        converter.custom_mappings[r'\bsis\b'] = 'sister'
+        converters[prefilter] = converter
+    assert converters[True].get_prefilter() is not None
+
+    for index in range(200):
+        text = ''.join(generator.choice(PIECES) for _ in range(generator.randrange(1, 30)))
+        violations = []
+        outputs = []
+        for prefilter, converter in converters.items():
+            path = tmp_path / f'{prefilter}{index}.md'
+            path.write_bytes(text.encode('utf-8'))
+            violations.append(converter.check_file(path, 'doc.md')[0])
+            converter.process_file(path)
+            outputs.append(path.read_bytes())
+        assert violations[0] == violations[1], text
+        assert outputs[0] == outputs[1], text
@@ -0,0 +1,83 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from check_report import SARIF_RULE_ID, Violation, format_json, format_sarif, format_text
+
+SCRIPT = Path(__file__).resolve().parent.parent / 'spelling_converter.py'
+
+VIOLATIONS = [Violation('a.md', 1, 5, 'color', 'colour'),
+              Violation('a.md', 3, 1, 'Center', 'Centre'),
+              Violation('b.md', 2, 8, 'gray', 'grey')]
+
+
+def _check(*args):
+    return subprocess.run([sys.executable, str(SCRIPT), '--check', '--no-cache', '--jobs', '1', *map(str, args)],
+                          capture_output=True, text=True, encoding='utf-8')
+
+
+def test_text_lists_each_violation_and_a_summary():
+    assert format_text(VIOLATIONS).splitlines() == ['a.md:1:5: color → colour',
+                                                    'a.md:3:1: Center → Centre',
+                                                    'b.md:2:8: gray → grey',
+                                                    '3 spelling violation(s) in 2 file(s)']
+    assert format_text([]) == 'No spelling violations found.'
+
+
+def test_json_round_trips_the_violations():
+    data = json.loads(format_json(VIOLATIONS))
+    assert [Violation(**v) for v in data['violations']] == VIOLATIONS
+    assert json.loads(format_json([])) == {'violations': []}
+
+
+def test_sarif_reports_a_result_and_fix_per_violation():
+    [run] = json.loads(format_sarif(VIOLATIONS))['runs']
+
+    assert run['columnKind'] == 'unicodeCodePoints'
+    assert [rule['id'] for rule in run['tool']['driver']['rules']] == [SARIF_RULE_ID]
+    assert len(run['results']) == 3
+    result = run['results'][0]
+    location = result['locations'][0]['physicalLocation']
+    assert location['artifactLocation']['uri'] == 'a.md'
+    assert location['region'] == {'startLine': 1, 'startColumn': 5, 'endColumn': 10}
+    [change] = result['fixes'][0]['artifactChanges']
+    assert change['replacements'] == [{'deletedRegion': location['region'], 'insertedContent': {'text': 'colour'}}]
+
+
+def test_sarif_columns_count_code_points(tmp_path):
+    # The emoji is two UTF-16 code units but one code point
+    (tmp_path / 'doc.md').write_text('Café 😀 color\n', encoding='utf-8')
+
+    result = _check(tmp_path, '--format', 'sarif')
+
+    [run] = json.loads(result.stdout)['runs']
+    region = run['results'][0]['locations'][0]['physicalLocation']['region']
+    assert region == {'startLine': 1, 'startColumn': 8, 'endColumn': 13}
+    assert 'Café 😀 color'[region['startColumn'] - 1:region['endColumn'] - 1] == 'color'
+
+
+def test_check_exit_status(tmp_path):
+    (tmp_path / 'clean.md').write_text('The colour.\n', encoding='utf-8')
+    assert _check(tmp_path).returncode == 0
+    assert _check(tmp_path / 'clean.md').returncode == 0
+
+    (tmp_path / 'dirty.md').write_text('The color.\n', encoding='utf-8')
+    result = _check(tmp_path, '--format', 'json')
+    assert result.returncode == 1
+    assert [v['path'] for v in json.loads(result.stdout)['violations']] == ['dirty.md']
+
+
+def test_check_fails_on_files_it_cannot_decode(tmp_path):
+    # No word in either file could change, so only decoding them shows they are not UTF-8
+    (tmp_path / 'latin1.md').write_bytes('Café.\n'.encode('latin-1'))
+    (tmp_path / 'clean.md').write_text('The colour.\n', encoding='utf-8')
+
+    for target in (tmp_path, tmp_path / 'latin1.md'):
+        result = _check(target)
+        assert result.returncode == 1
+        assert 'latin1.md' in result.stderr
+        assert result.stdout.strip() == 'No spelling violations found.'
+
+    (tmp_path / 'latin1.md').write_bytes('The color café.\n'.encode('latin-1'))
+    assert _check(tmp_path).returncode == 1
@@ -0,0 +1,71 @@
+from content_cache import ContentCache, hash_file
+from spelling_converter import SpellingConverter
+
+
+def _cached(root):
+    converter = SpellingConverter(mode='hybrid')
+    return ContentCache(root, 'spelling_converter', converter.ruleset_fingerprint()).entries
+
+
+def test_clean_files_are_skipped_on_the_next_run(tmp_path, monkeypatch):
+    (tmp_path / 'clean.md').write_text('The colour.\n', encoding='utf-8')
+    (tmp_path / 'dirty.md').write_text('The color.\n', encoding='utf-8')
+    SpellingConverter(mode='hybrid').process_directory(tmp_path, use_cache=True)
+
+    # A converted file is only recorded once a run has seen it clean
+    assert _cached(tmp_path) == {'clean.md': hash_file(tmp_path / 'clean.md')}
+    SpellingConverter(mode='hybrid').process_directory(tmp_path, use_cache=True)
+    assert _cached(tmp_path) == {'clean.md': hash_file(tmp_path / 'clean.md'),
+                                 'dirty.md': hash_file(tmp_path / 'dirty.md')}
+
+    converter = SpellingConverter(mode='hybrid')
+    # Without the byte prefilter only the cache can skip a file
+    converter.prefilter = False
+    converted = []
+    convert_records = converter.convert_records
+    monkeypatch.setattr(converter, 'convert_records',
+                        lambda text, *args: converted.append(text) or convert_records(text, *args))
+    (tmp_path / 'clean.md').write_text('The color again.\n', encoding='utf-8')
+    converter.process_directory(tmp_path, use_cache=True)
+
+    assert converted == ['The color again.\n']
+
+
+def test_changing_the_ruleset_drops_every_entry(tmp_path):
+    cache = ContentCache(tmp_path, 'spelling_converter', 'old rules')
+    cache.update('doc.md', 'digest')
+    cache.save(['doc.md'])
+
+    assert ContentCache(tmp_path, 'spelling_converter', 'old rules').clean_digest('doc.md') == 'digest'
+    assert ContentCache(tmp_path, 'spelling_converter', 'new rules').clean_digest('doc.md') is None
+
+    # A word list change is a ruleset change, so clean files are converted again
+    (tmp_path / 'doc.md').write_text('The grey cat.\n', encoding='utf-8')
+    SpellingConverter(mode='hybrid').process_directory(tmp_path, use_cache=True)
+    converter = SpellingConverter(mode='hybrid')
+    converter.custom_mappings[r'\bgrey\b'] = 'gray'
+    converter.process_directory(tmp_path, use_cache=True)
+
+    assert (tmp_path / 'doc.md').read_text(encoding='utf-8') == 'The gray cat.\n'
+
+
+def test_only_a_full_walk_evicts_deleted_files(tmp_path):
+    for name in ('kept.md', 'gone.md'):
+        (tmp_path / name).write_text('The colour.\n', encoding='utf-8')
+    SpellingConverter(mode='hybrid').process_directory(tmp_path, use_cache=True)
+    (tmp_path / 'gone.md').unlink()
+
+    # A --changed run only sees its own files, so it cannot tell gone.md was deleted
+    SpellingConverter(mode='hybrid').process_directory(tmp_path, use_cache=True,
+                                                       changed={tmp_path / 'kept.md': None})
+    assert set(_cached(tmp_path)) == {'kept.md', 'gone.md'}
+
+    SpellingConverter(mode='hybrid').process_directory(tmp_path, use_cache=True)
+    assert set(_cached(tmp_path)) == {'kept.md'}
+
+
+def test_dry_runs_leave_the_cache_alone(tmp_path):
+    (tmp_path / 'doc.md').write_text('The colour.\n', encoding='utf-8')
+    SpellingConverter(mode='hybrid').process_directory(tmp_path, dry_run=True, use_cache=True)
+
+    assert not (tmp_path / '.spelling_cache').exists()
@@ -0,0 +1,13 @@
+from differential import explain
+
+
+def test_declared_changes_explain_intended_differences():
+    assert explain('spelling', ('analysis', ['analysis → analysis']), ('analysis', [])) == [
+        'rules that rewrite a word to itself are dropped']
+    assert explain('lists', ('```\nfoo\n\n- a\n```\n', []), ('```\nfoo\n- a\n```\n', [])) == [
+        'lists in fenced code and front matter are left alone']
+
+
+def test_undeclared_differences_are_not_explained():
+    assert explain('lists', ('a\n\n- b\n', []), ('a\n- b\n', [])) is None
+    assert explain('spelling', ('colour', ['color → colour']), ('color', [])) is None
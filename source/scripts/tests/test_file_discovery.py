@@ -0,0 +1,92 @@
+import subprocess
+
+from file_discovery import filter_files, iter_files
+
+GITIGNORE = '''\
+# Comments and blank lines are skipped
+
+*.log
+!keep.log
+build/
+/out
+docs/*.tmp
+**/cache
+logs/
+!logs/important.txt
+\\#hash.md
+file[0-9].txt
+*.bak
+!/nested/**/*.bak
+name
+'''
+
+NESTED_GITIGNORE = '''\
+/local.md
+!*.log
+deep/
+'''
+
+FILES = [
+    'a.md', 'error.log', 'keep.log', 'sub/error.log', 'sub/keep.log',
+    'build/x.md', 'src/build', 'sub/build/y.md',
+    'out/x.md', 'sub/out/x.md',
+    'docs/a.tmp', 'docs/deep/a.tmp', 'docs/a.md',
+    'cache/x.md', 'sub/deep/cache/y.md', 'cached/z.md',
+    'logs/important.txt', 'logs/other.txt',
+    '#hash.md', 'file1.txt', 'filea.txt',
+    'other.bak', 'nested/a.bak', 'nested/sub/b.bak',
+    'name', 'thing/name/x.md', 'thing/names.md',
+    'nested/local.md', 'nested/sub/local.md', 'nested/trace.log', 'nested/deep/z.md', 'nested/sub/deep/z.md',
+]
+
+
+def _git_listing(root, cwd):
+    """The untracked, not ignored files git reports under cwd, relative to root."""
+    result = subprocess.run(['git', '-c', 'core.excludesFile=', 'ls-files', '-z', '-o', '--exclude-standard'],
+                            cwd=cwd, check=True, capture_output=True, text=True)
+    prefix = cwd.relative_to(root).as_posix() + '/' if cwd != root else ''
+    return sorted(prefix + path for path in result.stdout.split('\0') if path)
+
+
+def _tree(tmp_path):
+    subprocess.run(['git', 'init', '-q'], cwd=tmp_path, check=True, capture_output=True)
+    (tmp_path / '.gitignore').write_text(GITIGNORE, encoding='utf-8')
+    for name in FILES:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('text\n', encoding='utf-8')
+    (tmp_path / 'nested' / '.gitignore').write_text(NESTED_GITIGNORE, encoding='utf-8')
+    return tmp_path
+
+
+def _walked(root, start):
+    return sorted(path.relative_to(root).as_posix()
+                  for path in iter_files(start, pruned=('.git',), ignore_files=('.gitignore',)))
+
+
+def test_iter_files_ignores_what_git_ignores(tmp_path):
+    root = _tree(tmp_path)
+    expected = _git_listing(root, root)
+
+    # The fixture exercises every kind of pattern, both ways
+    assert 'keep.log' in expected and 'error.log' not in expected
+    assert 'src/build' in expected and 'build/x.md' not in expected
+    assert 'nested/a.bak' in expected and 'logs/important.txt' not in expected
+    assert 'nested/sub/local.md' in expected and 'nested/local.md' not in expected
+    assert _walked(root, root) == expected
+
+
+def test_iter_files_below_the_top_applies_parent_ignore_files(tmp_path):
+    root = _tree(tmp_path)
+
+    for start in (root / 'nested', root / 'sub', root / 'docs'):
+        assert _walked(root, start) == _git_listing(root, start), start
+
+
+def test_filter_files_agrees_with_the_walk(tmp_path):
+    root = _tree(tmp_path)
+    candidates = [root / name for name in FILES]
+
+    selected = filter_files(root, candidates, pruned=('.git',), ignore_files=('.gitignore',))
+    assert [path.relative_to(root).as_posix() for path in selected] == [
+        path for path in _git_listing(root, root) if not path.endswith('.gitignore')]
@@ -0,0 +1,11 @@
+from fix_markdown_lists import fix_markdown_lists
+
+
+def test_closed_front_matter_is_left_alone():
+    text = '---\ntitle: x\ntags:\n- a\n---\nText\n- item\n'
+    assert fix_markdown_lists(text) == '---\ntitle: x\ntags:\n- a\n---\nText\n\n- item\n'
+
+
+def test_unclosed_leading_rule_is_not_front_matter():
+    text = '---\nText\n- item\nMore\ntext\n* other\n'
+    assert fix_markdown_lists(text) == '---\nText\n\n- item\nMore\ntext\n\n* other\n'
@@ -0,0 +1,21 @@
+import subprocess
+
+from git_changes import changed_lines
+
+
+def git(cwd, *args):
+    subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+                   cwd=cwd, check=True, capture_output=True)
+
+
+def test_changed_lines_handles_names_with_spaces(tmp_path):
+    git(tmp_path, 'init', '-q')
+    spaced = tmp_path / 'my file.md'
+    spaced.write_text('one\ntwo\nthree\n', encoding='utf-8')
+    git(tmp_path, 'add', '.')
+    git(tmp_path, 'commit', '-q', '-m', 'initial')
+
+    spaced.write_text('one\ncolor\nthree\n', encoding='utf-8')
+    (tmp_path / 'new file.md').write_text('color\n', encoding='utf-8')
+
+    assert changed_lines(tmp_path) == {spaced: [(2, 2)], tmp_path / 'new file.md': None}
@@ -0,0 +1,14 @@
+from pathlib import Path
+
+from prerender import project_inputs
+
+
+def test_project_inputs_normalises_paths(tmp_path):
+    listed = 'faq.md\n./chapters/../intro.qmd\n\n../outside.md\nchapters/../../escape.md\n'
+    inputs = project_inputs(tmp_path, {'QUARTO_PROJECT_INPUT_FILES': listed})
+    root = Path(tmp_path).resolve()
+    assert inputs == [root / 'faq.md', root / 'intro.qmd']
+
+
+def test_project_inputs_without_quarto():
+    assert project_inputs(Path('.'), {}) is None
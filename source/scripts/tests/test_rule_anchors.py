@@ -0,0 +1,70 @@
+import random
+import re
+
+from spelling_converter import RuleAnchors, RuleMatcher, SpellingConverter
+
+CUSTOM_RULES = {
+    r'\bkitchen\b': 'galley',
+    r'\bsis\b': 'sister',
+    r'\bcafé\b': 'coffee house',
+    r'\bÉtude\b': 'study',
+    r'\bcolour scheme\b': 'palette',
+    r'\b(gr[ae]y)hound\b': r'\1dog',
+    r'\b(colou?r)ful\b': r'\1some',
+}
+
+PIECES = ['color', 'COLOR', 'colorful', 'ColourFul', 'center', 'CENTRE', 'organize', 'ORGANIZING',
+          'Kitchen', 'KITCHEN', '\u212aitchen', 'ſiſ', 'SİS', 'café', 'CAFÉ', 'cafe', 'étude', 'ÉTUDE',
+          'colour scheme', 'color scheme', 'COLOUR SCHEME', 'greyhound', 'GRAYHOUND', 'naïve', '😀',
+          ' ', '\u00a0', '\n', '.', '-', "'", '`', '#', '_']
+
+
+def _texts(seed, count=300):
+    generator = random.Random(seed)
+    for _ in range(count):
+        yield ''.join(generator.choice(PIECES) for _ in range(generator.randrange(1, 30)))
+
+
+def _converter(anchored):
+    converter = SpellingConverter(mode='hybrid')
+    converter.custom_mappings.update(CUSTOM_RULES)
+    # Subset the rules for every document, or never
+    converter.anchor_min_regex_rules = 0 if anchored else 10 ** 9
+    return converter
+
+
+def test_every_rule_that_matches_has_an_anchor_present():
+    matcher = _converter(True).get_matcher()
+    anchors = RuleAnchors(matcher)
+    regexes = [re.compile(pattern, re.IGNORECASE) for pattern in matcher.patterns]
+
+    for text in _texts(19):
+        present = anchors.present(text)
+        for index, regex in enumerate(regexes):
+            if regex.search(text):
+                assert index in present, (matcher.patterns[index], text)
+
+
+def test_rules_without_an_ascii_anchor_are_always_kept():
+    matcher = RuleMatcher({r'\bÉtude\b': 'study', r'\bcolou?r\b': 'hue', r'\bcolor\b': 'colour'})
+    anchors = RuleAnchors(matcher)
+
+    assert anchors.always == {0, 1}
+    assert anchors.present('Nothing here.') == {0, 1}
+    assert anchors.present('The COLOR.') == {0, 1, 2}
+
+
+def test_anchors_are_searched_only_in_the_regions_given():
+    anchors = RuleAnchors(RuleMatcher({r'\bcolor\b': 'colour', r'\bcenter\b': 'centre'}))
+    text = 'color and center'
+
+    assert anchors.present(text) == {0, 1}
+    assert anchors.present(text, [(10, 16)]) == {1}
+
+
+def test_anchored_conversion_matches_the_full_scan():
+    anchored, full = _converter(True), _converter(False)
+
+    for text in _texts(1019):
+        assert anchored.convert_text(text) == full.convert_text(text), text
+        assert anchored.check_text(text, 'doc.md') == full.check_text(text, 'doc.md'), text
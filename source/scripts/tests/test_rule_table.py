@@ -0,0 +1,69 @@
+from pipeline import load_custom_mappings
+from rule_table import RuleTable
+from spelling_converter import SpellingConverter
+
+
+def test_an_override_keeps_the_first_position_and_the_last_replacement():
+    table = RuleTable([('safe_mappings', {r'\bcolor\b': 'colour', r'\bcenter\b': 'centre'}),
+                       ('custom_mappings', {r'\bgray\b': 'grey', r'\bcolor\b': 'hue'})])
+
+    assert table.mappings == {r'\bcolor\b': 'hue', r'\bcenter\b': 'centre', r'\bgray\b': 'grey'}
+    [conflict] = table.conflicts
+    assert (conflict.kept.source, conflict.shadowed.source, conflict.word) == ('custom_mappings',
+                                                                              'safe_mappings', None)
+    assert str(conflict) == r"custom_mappings rule \bcolor\b overrides safe_mappings → 'colour'"
+
+
+def test_repeating_a_rule_unchanged_is_not_a_conflict():
+    table = RuleTable([('safe_mappings', {r'\bcolor\b': 'colour'}),
+                       ('custom_mappings', {r'\bcolor\b': 'colour'})])
+
+    assert table.mappings == {r'\bcolor\b': 'colour'}
+    assert table.conflicts == []
+
+
+def test_the_earlier_rule_wins_a_word_two_rules_rewrite_differently():
+    table = RuleTable([('pattern_mappings', {r'\b(cent|met)er\b': r'\1re'}),
+                       ('custom_mappings', {r'\bCenter\b': 'middle', r'\bmeter\b': 'metre'})])
+
+    # Words are compared case-insensitively, and rules that agree are not reported
+    [conflict] = table.conflicts
+    assert (conflict.kept.source, conflict.shadowed.source, conflict.word) == ('pattern_mappings',
+                                                                              'custom_mappings', 'center')
+    assert str(conflict) == (r"'center' becomes 'centre' by pattern_mappings rule \b(cent|met)er\b, "
+                             r"so custom_mappings rule \bCenter\b (→ 'middle') never applies to it")
+
+    converter = SpellingConverter(mode='regex')
+    converter.custom_mappings[r'\bcenter\b'] = 'middle'
+    assert converter.convert_text('The center.')[0] == 'The centre.'
+
+
+def test_overlaps_within_one_table_are_not_reported():
+    table = RuleTable([('custom_mappings', {r'\b(colou?r)\b': 'hue', r'\bcolor\b': 'colour'})])
+
+    assert len(table) == 2
+    assert table.conflicts == []
+
+
+def test_rules_that_rewrite_every_word_to_itself_are_dropped():
+    table = RuleTable([('custom_mappings', {r'\bcolour\b': 'colour', r'\bColor\b': 'color',
+                                            r'\b(grey|gray)\b': r'\1', r'\bcolou?r\b': 'colour',
+                                            r'\bgrey\b': 'gray'})])
+
+    assert [rule.pattern for rule in table.dropped] == [r'\bcolour\b', r'\bColor\b', r'\b(grey|gray)\b']
+    # A real regex cannot be listed word by word, so it is always kept
+    assert list(table.mappings) == [r'\bcolou?r\b', r'\bgrey\b']
+    assert table.conflicts == []
+
+
+def test_loading_a_word_list_warns_about_each_conflict(tmp_path, capsys):
+    wordlist = tmp_path / 'words.txt'
+    wordlist.write_text('center=middle\ncolor=colour\n', encoding='utf-8')
+
+    load_custom_mappings(wordlist, mode='hybrid')
+
+    warnings = [line for line in capsys.readouterr().out.splitlines() if line.startswith('Warning: ')]
+    # The override takes the safe rule's place, ahead of the pattern rule for the same word
+    assert warnings == [r"Warning: custom_mappings rule \bcenter\b overrides safe_mappings → 'centre'",
+                        r"Warning: 'center' becomes 'middle' by custom_mappings rule \bcenter\b, "
+                        r"so pattern_mappings rule \b(cen)ter\b (→ 'centre') never applies to it"]
@@ -0,0 +1,147 @@
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from spelling_converter import SpellingConverter
+
+
+def test_rule_table_is_reused_until_the_rules_change():
+    converter = SpellingConverter(mode='hybrid')
+    table = converter.get_rule_table()
+    converter.convert_text('The color.')
+    assert converter.get_rule_table() is table
+
+    converter.custom_mappings[r'\bgray\b'] = 'grey'
+    assert converter.get_rule_table() is not table
+    assert converter.convert_text('gray')[0] == 'grey'
+
+    converter.custom_mappings = {}
+    assert converter.convert_text('gray')[0] == 'gray'
+
+    table = converter.get_rule_table()
+    converter.mode = 'safe'
+    assert converter.get_rule_table() is not table
+
+
+def test_batch_executors_give_identical_results():
+    converter = SpellingConverter(mode='hybrid')
+    converter.exceptions.add('color')
+    converter.custom_mappings[r'\bgray\b'] = 'grey'
+    converter.safe_mappings[r'\bcenter\b'] = 'middle'
+    documents = [(i, f'The color and gray center {i}, we realized the behavior.') for i in range(8)]
+
+    results = [list(converter.convert_many(documents, executor=executor, jobs=2))
+               for executor in (None, 'thread', 'process')]
+
+    assert results[0] == results[1] == results[2]
+    assert results[0][0][1] == 'The color and grey middle 0, we realised the behaviour.'
+
+
+def test_process_directory_workers_use_the_full_configuration(tmp_path):
+    for i in range(4):
+        (tmp_path / f'doc{i}.md').write_text('The color and behavior.\n', encoding='utf-8')
+    converter = SpellingConverter(mode='hybrid')
+    converter.exceptions.add('color')
+
+    converter.process_directory(tmp_path, jobs=2)
+
+    for i in range(4):
+        assert (tmp_path / f'doc{i}.md').read_text(encoding='utf-8') == 'The color and behaviour.\n'
+
+
+def test_lookup_fallback_warning_goes_to_stderr(capsys):
+    converter = SpellingConverter(mode='hybrid')
+    converter.engine = 'lookup'
+    converter.custom_mappings[r'\bgr[ae]y+\b'] = 'grey'
+
+    assert converter.get_lookup_table() is None
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert 'lookup engine unavailable' in captured.err
+
+
+def test_rule_inputs_edited_after_first_use_take_effect():
+    converter = SpellingConverter(mode='hybrid')
+    assert converter.convert_text('center')[0] == 'centre'
+
+    converter.safe_mappings[r'\bcenter\b'] = 'middle'
+    assert converter.convert_text('center')[0] == 'middle'
+
+    del converter.safe_mappings[r'\bcenter\b']
+    converter.pattern_mappings[r'\b(cen)ter\b'] = r'\1tral'
+    assert converter.convert_text('center')[0] == 'central'
+
+    converter.custom_mappings[r'\b(cen)ter\b'] = 'hub'
+    assert converter.convert_text('center')[0] == 'hub'
+
+    converter.exceptions.add('center')
+    assert converter.convert_text('center')[0] == 'center'
+    converter.exceptions = set()
+    assert converter.convert_text('center')[0] == 'hub'
+
+
+def test_lookup_engine_sees_exceptions_added_after_first_use():
+    converter = SpellingConverter(mode='hybrid')
+    converter.engine = 'lookup'
+    assert converter.convert_text('The color.')[0] == 'The colour.'
+
+    converter.exceptions.add('color')
+    assert converter.convert_text('The color.')[0] == 'The color.'
+
+    converter.exceptions = {'behavior'}
+    assert converter.convert_text('The color.')[0] == 'The colour.'
+
+
+def test_multi_word_rules_match_phrases_earlier_rules_rewrote():
+    converter = SpellingConverter(mode='hybrid')
+    converter.custom_mappings[r'\bcolour scheme\b'] = 'colour palette'
+
+    assert converter.convert_text('The color scheme, the colour scheme and `color scheme`.') == (
+        'The colour palette, the colour palette and `color scheme`.',
+        ['color → colour', 'colour scheme → colour palette', 'colour scheme → colour palette'])
+    text, changes = converter.convert_records('A color scheme.')
+    assert text == 'A colour palette.'
+    assert [str(change) for change in changes] == ['color → colour', 'colour scheme → colour palette']
+
+
+def test_streamed_chunks_convert_as_the_whole_text():
+    documents = [
+        'The color of the center.\nA gray behavior.\n',
+        'Code: `color center gray` and the color.\nSee https://example.com/color/center now.\n',
+        '---\ntitle: color\ntags: [center]\n---\nThe color.\n',
+        'Before the color.\n```\ncolor = center\ngray\n```\nAfter the center.\n',
+        '<span class="color">the color</span>\n<!-- color\ncenter -->\nthe gray\n',
+        'Unfinished `color\nfence\n```python\ncolor\n',
+    ]
+    converter = SpellingConverter(mode='hybrid')
+    converter.custom_mappings[r'\bcolour scheme\b'] = 'colour palette'
+    documents.append('A color\nscheme, a color scheme.\n')
+
+    for document in documents:
+        expected, expected_changes = converter.convert_text(document)
+        # Chunks of every size up to the whole document put each match, preserved span and fence across a cut
+        for chunk_size in range(1, len(document) + 1):
+            converter.chunk_size = chunk_size
+            output = io.StringIO()
+            changes, modified = converter.convert_stream(io.StringIO(document), output)
+            assert output.getvalue() == expected, (document, chunk_size)
+            assert [str(change) for change in changes] == expected_changes, (document, chunk_size)
+            assert modified == (expected != document)
+
+
+def test_profile_leaves_the_path_argument_alone(tmp_path):
+    script = Path(__file__).resolve().parent.parent / 'spelling_converter.py'
+    docs = tmp_path / 'docs'
+    docs.mkdir()
+    (docs / 'doc.md').write_text('The color.\n', encoding='utf-8')
+
+    subprocess.run([sys.executable, str(script), '--profile', 'docs'], cwd=tmp_path, check=True,
+                   capture_output=True)
+    assert (docs / 'doc.md').read_text(encoding='utf-8') == 'The colour.\n'
+    assert json.loads((tmp_path / 'spelling_profile.json').read_text(encoding='utf-8'))
+
+    subprocess.run([sys.executable, str(script), 'docs', '--profile-output', 'out.json'], cwd=tmp_path,
+                   check=True, capture_output=True)
+    assert json.loads((tmp_path / 'out.json').read_text(encoding='utf-8'))
@@ -0,0 +1,55 @@
+import hashlib
+import os
+import stat
+
+from fix_markdown_lists import fix_file
+from spelling_converter import SpellingConverter
+from stream_io import open_hashed_text, write_text
+
+
+def test_write_text_replaces_the_target_of_a_symlink(tmp_path):
+    target = tmp_path / 'real.md'
+    target.write_text('The color.\n', encoding='utf-8')
+    target.chmod(0o640)
+    link = tmp_path / 'link.md'
+    link.symlink_to(target)
+
+    assert write_text(link, 'The colour.\n')
+
+    assert link.is_symlink()
+    assert target.read_text(encoding='utf-8') == 'The colour.\n'
+    assert stat.S_IMODE(target.stat().st_mode) == 0o640
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith('.tmp')] == []
+
+
+def test_in_place_engines_keep_symlinks(tmp_path):
+    target = tmp_path / 'real.md'
+    target.write_text('The color.\nText\n- item\n', encoding='utf-8')
+    link = tmp_path / 'link.md'
+    link.symlink_to(target)
+
+    assert SpellingConverter(mode='hybrid').process_file(link)[0]
+    assert fix_file(link)[0]
+    assert fix_file(link, stream=True)[1].startswith('No changes needed')
+
+    assert link.is_symlink()
+    assert target.read_text(encoding='utf-8') == 'The colour.\nText\n\n- item\n'
+
+
+def test_write_text_creates_new_files_with_the_umask_default(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        write_text(tmp_path / 'new.md', 'text\n')
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE((tmp_path / 'new.md').stat().st_mode) == 0o644
+
+
+def test_open_hashed_text_closes_the_file(tmp_path):
+    path = tmp_path / 'doc.md'
+    path.write_text('text\n', encoding='utf-8')
+    stream, reader = open_hashed_text(path)
+    with stream:
+        assert stream.read() == 'text\n'
+    assert reader.raw.closed
+    assert reader.hexdigest() == hashlib.sha256(b'text\n').hexdigest()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Polling file watcher for long-running conversion sessions.
+Detects saved files by comparing stat snapshots, debounces bursts of events
+into batches and ignores the writes made by the converter itself.
+"""
+
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+Signature = Tuple[int, int]
+
+
+class PollingWatcher:
+    """Watch a directory tree (or one file) for modified files by polling.
+
+    Changes are collected until no new change has been seen for ``debounce``
+    seconds, then yielded together, so an editor's save burst is one batch.
+    """
+
+    def __init__(self, root: Path, find_files: Callable[[Path], Iterable[Path]],
+                 interval: float = 0.1, debounce: float = 0.2):
+        self.root = root
+        self.find_files = find_files
+        self.interval = interval
+        self.debounce = debounce
+        self.known: Dict[Path, Signature] = self.snapshot()
+
+    def snapshot(self) -> Dict[Path, Signature]:
+        """Map every file find_files yields to its (mtime_ns, size)."""
+        if self.root.is_file():
+            signature = self._signature(self.root)
+            return {self.root: signature} if signature else {}
+
+        found = {}
+        for file_path in self.find_files(self.root):
+            signature = self._signature(file_path)
+            if signature:
+                found[file_path] = signature
+        return found
+
+    @staticmethod
+    def _signature(file_path: Path) -> Optional[Signature]:
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def acknowledge(self, file_path: Path) -> None:
+        """Record a file's current state so our own write does not trigger it again."""
+        signature = self._signature(file_path)
+        if signature:
+            self.known[file_path] = signature
+
+    def poll(self) -> List[Path]:
+        """Return files created or modified since the last poll."""
+        current = self.snapshot()
+        changed = [file_path for file_path, signature in current.items()
+                   if self.known.get(file_path) != signature]
+        self.known = current
+        return changed
+
+    def batches(self) -> Iterator[List[Path]]:
+        """Yield sorted batches of changed files, forever."""
+        pending = set()
+        last_change = 0.0
+        while True:
+            time.sleep(self.interval)
+            changed = self.poll()
+            if changed:
+                pending.update(changed)
+                last_change = time.monotonic()
+            elif pending and time.monotonic() - last_change >= self.debounce:
+                batch = sorted(pending)
+                pending.clear()
+                yield batch